@@ -1,9 +1,17 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation, FFMpegWriter
 import pandas as pd
-from tqdm import tqdm
-from plotting import plot_stack, plot_line
+from plotting import (
+    plot_stack, plot_line, StackBlitter, COLOURS, play_blitted, resolve_stack_ylims,
+    stack_cube, stack_xaxis, draft_stack,
+)
+from export import (
+    export_frames, export_frames_parallel, export_segments_parallel, export_variants,
+    new_subplots,
+)
+from render_cache import frame_key, source_digest
+from draft import draft_encode, draft_path
+import plotting
 
 
 # ---------------------------------------------------------
@@ -30,9 +38,20 @@ def interpolate_stacks(stack_a, stack_b, n_steps):
 # ---------------------------------------------------------
 # ANIMATION: YEARLY STACK TRANSITION
 # ---------------------------------------------------------
-def animate_smooth_yearly_transition(periods, fps, transition_seconds, pause_seconds):
+SMOOTH_ENCODE = dict(codec="libx264", bitrate=8000, pix_fmt="yuv420p")
 
-    fig, ax = plt.subplots(figsize=(8, 8))
+def animate_smooth_yearly_transition(periods, fps, transition_seconds, pause_seconds,
+                                     ylim=None, blit=False, ylim_mode=None,
+                                     save_path=None):
+    """
+    ylim_mode "fixed" / "eased" picks the y-range for all frames up front
+    (see plotting.stack_ylim_prepass); "fixed" also allows blit=True.
+
+    save_path: export headless on Agg (no window, no plt.show) and return
+    the path; otherwise preview interactively.
+    """
+
+    fig, ax = new_subplots(headless=save_path is not None, figsize=(8, 8))
 
     all_frames = []
     all_titles = []
@@ -55,11 +74,48 @@ def animate_smooth_yearly_transition(periods, fps, transition_seconds, pause_sec
                 all_frames.append(f)
                 all_titles.append(f"{year} → {next_year}")
 
+    # GW arrays + x-axis spec once, so the render loop is pandas-free
+    order = periods[0][1]
+    cube = stack_cube(all_frames, order)
+    xaxis = stack_xaxis(all_frames[0].index)
+
+    ylims, ylim, ytick_step = resolve_stack_ylims(cube, order, ylim, ylim_mode)
+
+    # Blitting: chrome cached once, only stack + title redrawn per frame
+    if blit:
+        if ylim is None:
+            raise ValueError("blit=True requires a fixed ylim")
+
+        blitter = StackBlitter(ax, xaxis, order, COLOURS, ylim,
+                               ytick_step=ytick_step)
+
+        if save_path is not None:
+            return export_frames(
+                fig,
+                lambda i: blitter.update(cube[i], all_titles[i]),
+                len(cube),
+                save_path,
+                **SMOOTH_ENCODE,
+                fps=fps,
+                redraw=False,
+            )
+
+        timer = blitter.play(cube, all_titles, fps, repeat=True)
+
+        plt.show()
+        return timer
+
     # Main animation update
     def update(i):
         # NOTE: colours and fonts handled INSIDE plot_stack()
-        plot_stack(ax, all_frames[i], periods[0][1], all_titles[i])
+        ax.clear()
+        plot_stack(ax, cube[i], order, all_titles[i],
+                   ylim=ylims[i], ytick_step=ytick_step, xaxis=xaxis)
+
+    if save_path is not None:
+        return export_frames(fig, update, len(cube), save_path, **SMOOTH_ENCODE, fps=fps)
 
+    from matplotlib.animation import FuncAnimation  # preview only
     anim = FuncAnimation(
         fig,
         update,
@@ -78,9 +134,10 @@ def animate_smooth_yearly_transition(periods, fps, transition_seconds, pause_sec
 from data_prep import make_trailing_year_stack
 from plotting import plot_stack
 
-def animate_trailing_yearly_stack(df, save_path=None, fps=30, window_days=365):
+def build_trailing_frames(df, window_days=365):
+    from tqdm import tqdm  # progress bar for this slow prep step only
 
-    # one frame per day in the dataset
+    # one frame per week in the dataset
     all_days = pd.date_range(df.index.min() + pd.Timedelta(days=window_days),
                              df.index.max(), freq="W")
 
@@ -92,30 +149,144 @@ def animate_trailing_yearly_stack(df, save_path=None, fps=30, window_days=365):
         frames.append(stack)
         titles.append(f"CAISO trailing year average power mix up to {day.date()}")
 
-    fig, ax = plt.subplots(figsize=(8, 8), dpi=200)
+    return frames, titles, order
 
-    def update(i):
-        ax.clear()
-        plot_stack(ax, frames[i], order, titles[i], ylim=(0, 35))
 
-    anim = FuncAnimation(
-        fig,
-        update,
-        frames=len(frames),
-        interval=1000 / fps,
-        repeat=False
+def trailing_stack_renderer(cube, titles, order, xaxis, ylim=(0, 35), blit=False,
+                            ylim_mode=None, draft=False, headless=False):
+    """
+    Figure + update(i) for the trailing-year stack (cube from stack_cube).
+    Module level so that parallel export workers can rebuild it from
+    pickled arguments. draft: layers drawn without antialiasing.
+    headless: bare Agg figure for exports (no pyplot window).
+    """
+    fig, ax = new_subplots(headless, figsize=(8, 8), dpi=200)
+
+    ylims, ylim, ytick_step = resolve_stack_ylims(cube, order, ylim, ylim_mode)
+
+    if blit:
+        if ylim is None:
+            raise ValueError("blit=True requires a fixed ylim")
+
+        blitter = StackBlitter(ax, xaxis, order, COLOURS, ylim,
+                               ytick_step=ytick_step, antialiased=not draft)
+
+        def update(i):
+            return blitter.update(cube[i], titles[i])
+    else:
+        def update(i):
+            ax.clear()
+            plot_stack(ax, cube[i], order, titles[i],
+                       ylim=ylims[i], ytick_step=ytick_step, xaxis=xaxis,
+                       draft=draft)
+
+    return fig, update
+
+
+def trailing_frame_keys(cube, titles, order, xaxis, ylim=(0, 35), ylim_mode=None,
+                        draft=False):
+    """
+    One render-cache key per frame: the frame's data, title and resolved
+    y-range, plus the shared x spec, colours and plotting source.
+    Blitted and full-redraw frames are identical, so blit is not keyed.
+    """
+    ylims, _, ytick_step = resolve_stack_ylims(cube, order, ylim, ylim_mode)
+    code = source_digest(plotting, trailing_stack_renderer)
+    style = frame_key(order, xaxis, COLOURS, ytick_step, draft, code)
+
+    return [
+        frame_key(style, cube[i], titles[i], tuple(ylims[i]))
+        for i in range(len(cube))
+    ]
+
+
+def animate_trailing_yearly_stack(df, save_path=None, fps=30, window_days=365,
+                                  ylim=(0, 35), blit=False, workers=None,
+                                  segments=False, ylim_mode=None, cache=None,
+                                  draft=False, variants=None):
+    """
+    Pass ylim=None with ylim_mode="fixed" / "eased" to derive the y-range
+    from the data in one pre-pass instead of hard-coding it.
+
+    workers > 1 renders frames in that many processes (save only); the
+    encoder still receives them in order. segments=True also splits the
+    encode: each worker writes its own segment, joined without re-encoding
+    (and a crashed run resumes from the finished segments).
+
+    cache: a render_cache.RenderCache; re-exports only draw frames whose
+    data, title or y-range changed (save only).
+
+    draft: quick preview at DRAFT_DPI on thinned data, no antialiasing,
+    MJPEG to <stem>_draft.avi. Flip to False for the final render.
+
+    variants: {name: {"size": (w, h), ...}} (see export.export_variants);
+    every frame is rendered once and encoded at each size. Serial only.
+    """
+    frames, titles, order = build_trailing_frames(df, window_days)
+
+    # every frame shares the time-of-day axis; the x spec comes from the first
+    cube = stack_cube(frames, order)
+    xaxis = stack_xaxis(frames[0].index)
+
+    encode = dict(
+        fps=fps,
+        codec="libx264",
+        bitrate=8000,
+        pix_fmt="yuv420p",
+        redraw=not blit,
     )
 
-    if save_path is not None:
-        writer = FFMpegWriter(
-            fps=fps,
-            codec="libx264",
-            bitrate=8000,
-            extra_args=["-pix_fmt", "yuv420p"]
+    if draft:
+        xaxis, cube = draft_stack(xaxis, cube)
+        encode = draft_encode(encode)
+        if save_path is not None:
+            save_path = draft_path(save_path)
+
+    if save_path is not None and cache is not None:
+        encode.update(
+            cache=cache,
+            keys=trailing_frame_keys(cube, titles, order, xaxis, ylim, ylim_mode, draft),
+        )
+
+    # Save several sizes from one render pass
+    if save_path is not None and variants:
+        fig, update = trailing_stack_renderer(cube, titles, order, xaxis, ylim, blit,
+                                              ylim_mode, draft, headless=True)
+        return export_variants(fig, update, len(cube), save_path, variants, **encode)
+
+    # Save in parallel: every worker builds its own Agg figure
+    if save_path is not None and workers is not None and workers > 1:
+        exporter = export_segments_parallel if segments else export_frames_parallel
+        return exporter(
+            trailing_stack_renderer,
+            len(cube),
+            save_path,
+            setup_args=(cube, titles, order, xaxis, ylim, blit, ylim_mode, draft, True),
+            workers=workers,
+            **encode,
         )
-        anim.save(save_path, writer=writer)
+
+    headless = save_path is not None
+    fig, update = trailing_stack_renderer(cube, titles, order, xaxis, ylim, blit,
+                                          ylim_mode, draft, headless)
+
+    # Save: draw on the Agg canvas and pipe raw RGBA straight into ffmpeg
+    if headless:
+        return export_frames(fig, update, len(cube), save_path, **encode)
+
+    if blit:
+        anim = play_blitted(fig, update, len(cube), fps, repeat=False)
     else:
-        plt.show()
+        from matplotlib.animation import FuncAnimation  # preview only
+        anim = FuncAnimation(
+            fig,
+            update,
+            frames=len(cube),
+            interval=1000 / fps,
+            repeat=False
+        )
+
+    plt.show()
 
     plt.close(fig)
-    return anim
\ No newline at end of file
+    return anim
@@ -1,33 +1,16 @@
+import sys
+from functools import partial
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-import matplotlib.font_manager as fm
-from matplotlib.animation import FFMpegWriter
 
+from plotting import (
+    StackBlitter, resolve_stack_ylims, stack_xaxis, stack_cube,
+    plot_stack, style_stack_axes, draw_stack_title,
+)
+from export import export_frames, new_subplots
+from fonts import use_font_family
 
-# -------------------------------------------------------------
-# FONT SETUP (Montserrat)
-
-font_dir = r"C:\Users\barna\AppData\Local\Microsoft\Windows\Fonts"
-
-regular_path = fr"{font_dir}\Montserrat-Regular.ttf"
-medium_path  = fr"{font_dir}\Montserrat-Medium.ttf"
-bold_path    = fr"{font_dir}\Montserrat-Bold.ttf"
-italic_path  = fr"{font_dir}\Montserrat-Italic.ttf"
-
-fm.fontManager.addfont(regular_path)
-fm.fontManager.addfont(medium_path)
-fm.fontManager.addfont(bold_path)
-fm.fontManager.addfont(italic_path)
-
-mont_regular = fm.FontProperties(fname=regular_path)
-mont_medium  = fm.FontProperties(fname=medium_path)
-mont_bold    = fm.FontProperties(fname=bold_path)
-mont_italic  = fm.FontProperties(fname=italic_path)
-
-plt.rcParams['font.family'] = mont_regular.get_name()
-plt.rcParams['font.weight'] = 'regular'
 
 # =============================================================
 # 1. DATA PREPARATION
@@ -110,70 +93,10 @@ def build_sequence_of_frames(periods, fps, transition_seconds, pause_seconds):
 # =============================================================
 # 2. CHART DESIGN
 # =============================================================
-def plot_stack(ax, stack, order, colors, title):
-
-    ax.clear()
-
-    axis_line_col = "#CCCCCC"  # lighter grey (spines + tick marks)
-    text_col = "#555555"  # darker grey (numbers + labels + title)
-
-    # Convert MW → GW
-    stack_gw = stack / 1000.0
-
-    # Stackplot
-    ax.stackplot(
-        stack_gw.index,
-        [stack_gw[col] for col in order],
-        colors=[colors[c] for c in order],
-        alpha=0.95,
-    )
-
-    # TITLE — use Montserrat Bold
-    ax.set_title(
-        title,
-        fontproperties=mont_bold,
-        fontsize=20,
-        color=text_col
-    )
-
-    # ---- Y-AXIS ----
-    total = stack_gw.sum(axis=1)
-    ymax = total.max()
-    ax.set_ylim(0, ymax * 1.05)
-
-    ticks = ax.get_yticks()
-    ax.set_yticks(ticks)
-    ax.set_yticklabels([f"{t:g} GW" for t in ticks])
+# plotting.py's stack chart, with this script's look
+STACK_CHROME = {"spine_width": 1}
+STACK_TITLE = {"centered": True, "font_name": "bold"}
 
-    # ---- X-AXIS ----
-    desired = ["06:00", "12:00", "18:00"]
-    tick_positions = [t for t in stack_gw.index if t.strftime("%H:%M") in desired]
-    ax.set_xticks(tick_positions)
-    ax.set_xticklabels(["6 AM", "12 PM", "6 PM"])
-
-    # ---- AXIS + TICK COLOURS ----
-    ax.tick_params(axis="both", colors=axis_line_col)
-
-    for spine in ["left", "bottom"]:
-        ax.spines[spine].set_color(axis_line_col)
-        ax.spines[spine].set_linewidth(1)
-
-    ax.spines["right"].set_visible(False)
-    ax.spines["top"].set_visible(False)
-
-    # ---- FORCE MONTSERRAT MEDIUM ON TICK LABELS ----
-    for label in list(ax.get_xticklabels()) + list(ax.get_yticklabels()):
-        label.set_fontproperties(mont_medium)
-        label.set_fontsize(13)
-        label.set_color(text_col)
-
-    # GRID + BG
-    ax.grid(color="#E5E5E5", linewidth=0.8, alpha=0.25)
-    ax.set_facecolor("#FAFAFA")
-    ax.margins(x=0)
-
-    # Square aspect
-    ax.set_box_aspect(1)
 
 # =============================================================
 # 3. ANIMATION
@@ -181,12 +104,22 @@ def plot_stack(ax, stack, order, colors, title):
 def animate_smooth_yearly_transition(df, start_months, colors,
                                      fps=30,
                                      transition_seconds=1.5,
-                                     pause_seconds=None):
-
+                                     pause_seconds=None,
+                                     ylim=None,
+                                     blit=False,
+                                     ylim_mode=None,
+                                     save_path=None):
+    """
+    save_path: render headless on Agg straight into ffmpeg and return the
+    path, with no window or event loop. Without it, preview with plt.show.
+    """
     if pause_seconds is None:
         pause_seconds = {}
 
-    fig, ax = plt.subplots(figsize=(8, 8))
+    # Montserrat (or the fallback) as the default family, before any text exists
+    use_font_family("regular", weight="regular")
+
+    fig, ax = new_subplots(headless=save_path is not None, figsize=(8, 8))
 
     # Build stacks for each start month
     periods = []
@@ -200,9 +133,51 @@ def animate_smooth_yearly_transition(df, start_months, colors,
         periods, fps, transition_seconds, pause_seconds
     )
 
+    # GW arrays + shared x-axis once; frames are plain array slices from here
+    cube = stack_cube(frames, order)
+    xaxis = stack_xaxis(frames[0].index)
+
+    # y-range for every frame up front ("fixed" / "eased"), not per frame
+    ylims, ylim, ytick_step = resolve_stack_ylims(cube, order, ylim, ylim_mode)
+
+    # Blitting needs fixed y-limits: chrome is rasterised once and reused
+    if blit:
+        if ylim is None:
+            raise ValueError("blit=True requires a fixed ylim")
+
+        blitter = StackBlitter(
+            ax, xaxis, order, colors, ylim,
+            chrome=partial(style_stack_axes, **STACK_CHROME),
+            title=partial(draw_stack_title, **STACK_TITLE),
+            ytick_step=ytick_step,
+        )
+
+        if save_path is not None:
+            return export_frames(
+                fig,
+                lambda i: blitter.update(cube[i], titles[i]),
+                len(cube),
+                save_path,
+                fps=fps,
+                bitrate=8000,
+                redraw=False,
+            )
+
+        timer = blitter.play(cube, titles, fps, repeat=True)
+
+        plt.show()
+        return timer
+
     def update(i):
-        plot_stack(ax, frames[i], order, colors, titles[i])
+        plot_stack(ax, cube[i], order, titles[i],
+                   ylim=ylims[i], ytick_step=ytick_step, xaxis=xaxis,
+                   colors=colors, clear=True,
+                   chrome=STACK_CHROME, title_style=STACK_TITLE)
 
+    if save_path is not None:
+        return export_frames(fig, update, len(cube), save_path, fps=fps, bitrate=8000)
+
+    from matplotlib.animation import FuncAnimation  # preview only
     anim = FuncAnimation(
         fig,
         update,
@@ -219,8 +194,7 @@ def animate_smooth_yearly_transition(df, start_months, colors,
 # =============================================================
 # 4. MAIN
 # =============================================================
-if __name__ == "__main__":
-
+def main(save_path=None):
     path = r"C:\Users\barna\OneDrive\Documents\data\caiso\caiso_fuel_mix_may_range.csv"
     df = pd.read_csv(path)
 
@@ -258,12 +232,16 @@ if __name__ == "__main__":
         2025: 3,
     }
 
-    animate_smooth_yearly_transition(
+    return animate_smooth_yearly_transition(
         df,
         start_months,
         colors,
         fps=fps,
         transition_seconds=transition_seconds,
         pause_seconds=pause_seconds,
+        save_path=save_path,
     )
 
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
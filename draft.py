@@ -0,0 +1,51 @@
+import math
+from pathlib import Path
+
+import numpy as np
+
+# ---------------------------------------------------------------
+# DRAFT / PREVIEW RENDERING
+# ---------------------------------------------------------------
+# Draft mode trades quality for turnaround while iterating: low dpi,
+# every series thinned to ~DRAFT_POINTS samples, antialiasing off and an
+# intra-only MJPEG encode (no motion search). Final renders are
+# unaffected; flip draft=False for the real export.
+
+DRAFT_DPI = 50
+DRAFT_POINTS = 96
+
+DRAFT_ENCODE = {
+    "codec": "mjpeg",
+    "bitrate": None,
+    "pix_fmt": "yuvj420p",
+    "extra_args": ["-q:v", "5"],
+    "metadata": None,
+}
+
+
+def draft_index(n, max_points=DRAFT_POINTS):
+    """
+    Indices thinning n samples to about max_points, keeping both ends
+    so thinned series still span the full x-range. Idempotent: thinning
+    an already thinned series returns every index.
+    """
+    step = max(1, math.ceil((n - 1) / max_points))
+    idx = np.arange(0, n, step)
+    if idx[-1] != n - 1:
+        idx = np.append(idx, n - 1)
+    return idx
+
+
+def draft_path(save_path):
+    """
+    <stem>_draft.avi next to save_path, so drafts never overwrite finals.
+    """
+    save_path = Path(save_path)
+    return save_path.with_name(f"{save_path.stem}_draft.avi")
+
+
+def draft_encode(encode):
+    """
+    Copy of an export_frames keyword dict with the draft codec and dpi.
+    """
+    return {**encode, **DRAFT_ENCODE, "dpi": DRAFT_DPI}
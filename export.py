@@ -0,0 +1,755 @@
+import itertools
+import json
+import math
+import os
+import queue
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from pathlib import Path
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+from render_cache import frame_key
+
+# ---------------------------------------------------------------
+# DIRECT FFMPEG EXPORT
+# ---------------------------------------------------------------
+# Frames are drawn onto the figure's Agg canvas and the renderer's
+# RGBA memory (buffer_rgba) is written straight into ffmpeg's stdin as
+# rawvideo. No FuncAnimation, no MovieWriter, no PNG/savefig round trip.
+
+FFMPEG_BIN = "ffmpeg"
+
+
+def ffmpeg_command(
+    save_path,
+    size,
+    fps,
+    codec="libx264",
+    bitrate=None,
+    pix_fmt="yuv420p",
+    extra_args=None,
+    metadata=None,
+):
+    """
+    ffmpeg argv reading rawvideo RGBA frames of `size` (w, h) from stdin.
+
+    codec / bitrate (kbit/s) / pix_fmt mirror FFMpegWriter's arguments.
+    """
+    w, h = size
+
+    cmd = [
+        FFMPEG_BIN, "-y", "-loglevel", "error",
+        "-f", "rawvideo",
+        "-vcodec", "rawvideo",
+        "-s", f"{w}x{h}",
+        "-pix_fmt", "rgba",
+        "-framerate", str(fps),
+        "-i", "pipe:",
+    ]
+
+    if codec:
+        cmd += ["-vcodec", codec]
+    if bitrate is not None and bitrate > 0:
+        cmd += ["-b:v", f"{bitrate}k"]
+    if pix_fmt:
+        cmd += ["-pix_fmt", pix_fmt]
+
+    for key, value in (metadata or {}).items():
+        cmd += ["-metadata", f"{key}={value}"]
+
+    cmd += list(extra_args or [])
+    cmd.append(str(save_path))
+    return cmd
+
+
+class FFmpegPipe:
+    """
+    ffmpeg subprocess fed with raw RGBA frames on stdin.
+
+    Use as a context manager; write() accepts any buffer (bytes,
+    memoryview, canvas.buffer_rgba()) and hands it to the pipe as-is.
+    transform, if given, maps each frame to the bytes actually written
+    (e.g. a downsample from variant_transform); size is its output size.
+    """
+
+    def __init__(self, save_path, size, fps, transform=None, **encode):
+        self.save_path = save_path
+        self.size = size
+        self.transform = transform
+        self.cmd = ffmpeg_command(save_path, size, fps, **encode)
+        self._proc = None
+
+    def __enter__(self):
+        self._proc = subprocess.Popen(
+            self.cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        return self
+
+    def write(self, frame):
+        if self.transform is not None:
+            frame = self.transform(frame)
+        self._proc.stdin.write(frame)
+
+    def close(self):
+        if self._proc is None:
+            return
+
+        proc, self._proc = self._proc, None
+        proc.stdin.close()
+        stderr = proc.stderr.read()
+        proc.stderr.close()
+
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(
+                proc.returncode, self.cmd, stderr=stderr.decode(errors="replace")
+            )
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self._proc is not None:
+            self._proc.kill()
+            try:
+                self.close()
+            except (subprocess.CalledProcessError, OSError):
+                pass  # keep the original exception
+            return
+
+        self.close()
+
+
+class QueuedFFmpegPipe(FFmpegPipe):
+    """
+    FFmpegPipe drained by a writer thread through a bounded queue.
+
+    The render loop (producer) hands over a copy of each frame and goes
+    straight on to the next draw while the writer thread (consumer)
+    blocks on ffmpeg's stdin. Pipe writes release the GIL, so rendering
+    and encoding overlap. Memory is capped at queue_size frames; write()
+    blocks once the queue is full. A transform runs on the writer thread.
+    """
+
+    def __init__(self, save_path, size, fps, queue_size=4, transform=None, **encode):
+        super().__init__(save_path, size, fps, transform=transform, **encode)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._error = None
+
+    def __enter__(self):
+        super().__enter__()
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+        return self
+
+    def _drain(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                return
+            if self._error is not None:
+                continue  # keep draining so the producer never blocks
+            try:
+                if self.transform is not None:
+                    frame = self.transform(frame)
+                self._proc.stdin.write(frame)
+            except BaseException as e:
+                self._error = e
+
+    def write(self, frame):
+        if self._error is not None:
+            raise self._error
+        # the canvas buffer is reused by the next draw: queue a copy
+        self._queue.put(bytes(frame))
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+        super().close()
+
+        if self._error is not None:
+            raise self._error
+
+
+def open_pipe(save_path, size, fps, queue_size=0, **encode):
+    """
+    queue_size > 0: overlapped writer thread (QueuedFFmpegPipe);
+    0: synchronous, zero-copy writes (FFmpegPipe).
+    """
+    if queue_size:
+        return QueuedFFmpegPipe(save_path, size, fps, queue_size=queue_size, **encode)
+    return FFmpegPipe(save_path, size, fps, **encode)
+
+
+# ---------------------------------------------------------------
+# OUTPUT VARIANTS
+# ---------------------------------------------------------------
+# One render at the largest size feeds several encoders. Each variant
+# crops the master frame to its aspect ratio (centred) and downsamples
+# it with PIL's BOX (area) filter on its pipe's writer thread, so the
+# variants resize and encode concurrently.
+
+STANDARD_VARIANTS = {
+    "1080p": {"size": (1920, 1080)},
+    "720p": {"size": (1280, 720)},
+    "square": {"size": (1080, 1080)},
+}
+
+
+def variant_crop(src_size, size):
+    """
+    Centred (left, top, right, bottom) box of src_size with size's aspect.
+    """
+    sw, sh = src_size
+    w, h = size
+
+    if sw * h > sh * w:
+        cw, ch = round(sh * w / h), sh
+    else:
+        cw, ch = sw, round(sw * h / w)
+
+    left, top = (sw - cw) // 2, (sh - ch) // 2
+    return left, top, left + cw, top + ch
+
+
+def variant_transform(src_size, size, crop=None):
+    """
+    bytes -> bytes: RGBA frame of src_size to `size`, area-averaged.
+
+    crop : (left, top, right, bottom) in source pixels; default is the
+           centred box matching size's aspect ratio
+    """
+    crop = tuple(crop or variant_crop(src_size, size))
+    cw, ch = crop[2] - crop[0], crop[3] - crop[1]
+
+    if cw < size[0] or ch < size[1]:
+        raise ValueError(
+            f"variant {size[0]}x{size[1]} is larger than its {cw}x{ch} source; "
+            "render at a higher dpi"
+        )
+
+    if crop == (0, 0, *src_size) and tuple(size) == tuple(src_size):
+        return None
+
+    def transform(frame):
+        image = Image.frombuffer("RGBA", src_size, frame, "raw", "RGBA", 0, 1)
+        return image.resize(size, Image.Resampling.BOX, box=crop).tobytes()
+
+    return transform
+
+
+def variant_path(save_path, name):
+    save_path = Path(save_path)
+    return save_path.with_name(f"{save_path.stem}_{name}{save_path.suffix or '.mp4'}")
+
+
+# ---------------------------------------------------------------
+# CANVAS HELPERS
+# ---------------------------------------------------------------
+def new_figure(headless=False, **kw):
+    """
+    headless: a bare Figure on an Agg canvas (no pyplot figure manager,
+    GUI backend or event loop) for batch exports. Otherwise plt.figure;
+    pyplot, and with it the GUI backend, is only imported when needed.
+    """
+    if headless:
+        fig = Figure(**kw)
+        FigureCanvasAgg(fig)
+        return fig
+
+    import matplotlib.pyplot as plt
+    return plt.figure(**kw)
+
+
+def new_subplots(headless=False, figsize=None, dpi=None, **subplot_kw):
+    """
+    (fig, ax) like plt.subplots, headless as for new_figure.
+    """
+    fig = new_figure(headless, figsize=figsize, dpi=dpi)
+    return fig, fig.subplots(**subplot_kw)
+
+
+def agg_canvas(fig, dpi=None, even=True):
+    """
+    Make sure fig draws on an Agg canvas at `dpi` and return it.
+
+    yuv420p needs even pixel dimensions, so the figure is shrunk by at
+    most one pixel per side when even=True (as FFMpegWriter does).
+    """
+    if dpi is not None:
+        fig.set_dpi(dpi)
+
+    if even:
+        w, h = fig.get_size_inches() * fig.dpi
+        w_even, h_even = int(w) - int(w) % 2, int(h) - int(h) % 2
+        if (int(w), int(h)) != (w_even, h_even):
+            fig.set_size_inches(w_even / fig.dpi, h_even / fig.dpi)
+
+    if not isinstance(fig.canvas, FigureCanvasAgg):
+        FigureCanvasAgg(fig)
+
+    return fig.canvas
+
+
+def frame_size(canvas):
+    renderer = canvas.get_renderer()
+    return int(renderer.width), int(renderer.height)
+
+
+def render_frame(canvas, update, frame, redraw=True, key=None, cache=None):
+    """
+    RGBA buffer for one frame: from the render cache when `key` (a
+    frame_key of the frame's inputs) is stored at this canvas size,
+    otherwise update() + draw, storing the result.
+    """
+    if cache is not None and key is not None:
+        key = frame_key(key, frame_size(canvas))
+        buffer = cache.get(key)
+        if buffer is not None:
+            return buffer
+
+    update(frame)
+    if redraw:
+        canvas.draw()
+    buffer = canvas.buffer_rgba()
+
+    if cache is not None and key is not None:
+        cache.put(key, buffer)
+
+    return buffer
+
+
+# ---------------------------------------------------------------
+# EXPORT
+# ---------------------------------------------------------------
+def export_frames(
+    fig,
+    update,
+    frames,
+    save_path,
+    *,
+    fps,
+    dpi=None,
+    codec="libx264",
+    bitrate=None,
+    pix_fmt="yuv420p",
+    extra_args=None,
+    metadata=None,
+    redraw=True,
+    queue_size=4,
+    cache=None,
+    keys=None,
+):
+    """
+    Render every frame and stream it to ffmpeg without FuncAnimation.save.
+
+    update : callable(frame), mutates the figure for one frame
+    frames : int or iterable of frame data (as for FuncAnimation)
+    redraw : full canvas.draw() per frame; pass False when update() paints
+             the Agg buffer itself (e.g. StackBlitter.update)
+    queue_size : frames buffered for the writer thread, so drawing and
+                 encoding overlap; 0 writes synchronously without copies
+    cache, keys : RenderCache and one frame_key per frame; frames already
+                  in the cache are not drawn. update(frame) must then
+                  fully determine the image (no state carried over)
+    """
+    if isinstance(frames, int):
+        frames = range(frames)
+    if keys is None:
+        keys = itertools.repeat(None)  # frames may be a generator
+
+    canvas = agg_canvas(fig, dpi)
+
+    # initial full draw: sizes the renderer, lets blitters cache chrome
+    canvas.draw()
+
+    with open_pipe(
+        save_path,
+        frame_size(canvas),
+        fps,
+        queue_size=queue_size,
+        codec=codec,
+        bitrate=bitrate,
+        pix_fmt=pix_fmt,
+        extra_args=extra_args,
+        metadata=metadata,
+    ) as pipe:
+        for frame, key in zip(frames, keys):
+            pipe.write(render_frame(canvas, update, frame, redraw, key, cache))
+
+    return save_path
+
+
+def export_variants(
+    fig,
+    update,
+    frames,
+    save_path,
+    variants,
+    *,
+    fps,
+    dpi=None,
+    codec="libx264",
+    bitrate=None,
+    pix_fmt="yuv420p",
+    extra_args=None,
+    metadata=None,
+    redraw=True,
+    queue_size=4,
+    cache=None,
+    keys=None,
+):
+    """
+    Render every frame once and encode several sizes in the same pass.
+
+    variants : {name: {"size": (w, h), "crop": box or None, **encode}}
+               written to <stem>_<name><suffix>; per-variant keys
+               override the shared encoder settings (e.g. bitrate)
+
+    Render at the largest size needed (dpi); each variant is cropped to
+    its aspect ratio and area-downsampled, never upscaled. Other
+    arguments as for export_frames. Returns {name: path}.
+    """
+    if isinstance(frames, int):
+        frames = range(frames)
+    if keys is None:
+        keys = itertools.repeat(None)  # frames may be a generator
+
+    canvas = agg_canvas(fig, dpi)
+    canvas.draw()
+    src_size = frame_size(canvas)
+
+    encode = dict(
+        codec=codec,
+        bitrate=bitrate,
+        pix_fmt=pix_fmt,
+        extra_args=extra_args,
+        metadata=metadata,
+    )
+
+    paths = {}
+    with ExitStack() as stack:
+        pipes = []
+        for name, spec in variants.items():
+            spec = dict(spec)
+            size = tuple(spec.pop("size"))
+            transform = variant_transform(src_size, size, spec.pop("crop", None))
+
+            paths[name] = variant_path(save_path, name)
+            pipes.append(stack.enter_context(open_pipe(
+                paths[name],
+                size,
+                fps,
+                queue_size=queue_size,
+                transform=transform,
+                **{**encode, **spec},
+            )))
+
+        for frame, key in zip(frames, keys):
+            # one copy, shared by every variant's queue
+            buffer = bytes(render_frame(canvas, update, frame, redraw, key, cache))
+            for pipe in pipes:
+                pipe.write(buffer)
+
+    return paths
+
+
+# ---------------------------------------------------------------
+# PARALLEL EXPORT
+# ---------------------------------------------------------------
+# Each worker process builds its own figure once (setup), renders
+# contiguous chunks of frame indices and ships back raw RGBA bytes.
+# The parent keeps a bounded window of in-flight chunks and writes them
+# to the single ffmpeg encoder strictly in order: chunks that finish
+# early wait in the reorder buffer until their turn.
+
+_worker = None
+
+
+def _init_render_worker(setup, setup_args, dpi, redraw, cache=None):
+    global _worker
+
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+
+    fig, update = setup(*setup_args)
+    canvas = agg_canvas(fig, dpi)
+    canvas.draw()
+
+    _worker = (canvas, update, redraw, cache)
+
+
+def _render_chunk(chunk, keys):
+    canvas, update, redraw, cache = _worker
+
+    buffers = []
+    for frame, key in zip(chunk, keys):
+        buffers.append(bytes(render_frame(canvas, update, frame, redraw, key, cache)))
+
+    return frame_size(canvas), buffers
+
+
+def export_frames_parallel(
+    setup,
+    frames,
+    save_path,
+    *,
+    fps,
+    setup_args=(),
+    workers=None,
+    chunk_size=8,
+    dpi=None,
+    codec="libx264",
+    bitrate=None,
+    pix_fmt="yuv420p",
+    extra_args=None,
+    metadata=None,
+    redraw=True,
+    queue_size=4,
+    cache=None,
+    keys=None,
+):
+    """
+    Render frames in `workers` processes and encode them in order.
+
+    setup : module-level callable(*setup_args) -> (fig, update); called
+            once per worker, so it and setup_args must be picklable
+    frames : int or sequence of frame data passed to update()
+    cache, keys : as for export_frames; workers share the cache directory
+
+    At most 2 * workers chunks are in flight, which caps the memory held
+    by the reorder buffer. On Windows (spawn) the calling script needs
+    an ``if __name__ == "__main__"`` guard.
+    """
+    if isinstance(frames, int):
+        frames = range(frames)
+    frames = list(frames)
+
+    keys = list(keys) if keys is not None else [None] * len(frames)
+
+    workers = workers or os.cpu_count() or 1
+    chunks = [
+        (frames[i:i + chunk_size], keys[i:i + chunk_size])
+        for i in range(0, len(frames), chunk_size)
+    ]
+    window = 2 * workers
+
+    encode = dict(
+        codec=codec,
+        bitrate=bitrate,
+        pix_fmt=pix_fmt,
+        extra_args=extra_args,
+        metadata=metadata,
+    )
+
+    with ExitStack() as stack:
+        pool = stack.enter_context(ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(setup, setup_args, dpi, redraw, cache),
+        ))
+
+        pending = {}
+        submitted = 0
+        pipe = None
+
+        for i in range(len(chunks)):
+            while submitted < len(chunks) and submitted < i + window:
+                pending[submitted] = pool.submit(_render_chunk, *chunks[submitted])
+                submitted += 1
+
+            size, buffers = pending.pop(i).result()
+
+            if pipe is None:
+                pipe = stack.enter_context(
+                    open_pipe(save_path, size, fps, queue_size=queue_size, **encode)
+                )
+
+            for buffer in buffers:
+                pipe.write(buffer)
+
+    return save_path
+
+
+# ---------------------------------------------------------------
+# SEGMENT-PARALLEL EXPORT
+# ---------------------------------------------------------------
+# The timeline is cut into contiguous segments. Each worker renders a
+# segment and encodes it with its own ffmpeg process, so encoding is
+# parallel too. Segments are joined with the concat demuxer (-c copy, no
+# re-encode). A finished segment is renamed into place only once ffmpeg
+# exits cleanly, so a crashed run resumes from the segments on disk.
+# With frame keys, each segment's file name carries the hash of its
+# keys and segments are kept between runs (stale ones pruned), so only
+# segments containing changed frames are re-encoded.
+
+SEGMENT_MANIFEST = "segments.json"
+
+
+def _encode_segment(frames, keys, segment_path, fps, queue_size, encode):
+    canvas, update, redraw, cache = _worker
+
+    part_path = segment_path.with_name(f"{segment_path.stem}.part{segment_path.suffix}")
+
+    with open_pipe(part_path, frame_size(canvas), fps, queue_size=queue_size, **encode) as pipe:
+        for frame, key in zip(frames, keys):
+            pipe.write(render_frame(canvas, update, frame, redraw, key, cache))
+
+    os.replace(part_path, segment_path)
+    return segment_path
+
+
+def _prepare_segment_dir(segment_dir, manifest):
+    """
+    Reuse finished segments only if they were cut and encoded the same
+    way; otherwise start from an empty directory.
+    """
+    manifest_path = segment_dir / SEGMENT_MANIFEST
+
+    if manifest_path.exists():
+        with open(manifest_path) as f:
+            if json.load(f) != manifest:
+                shutil.rmtree(segment_dir)
+
+    segment_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def concat_segments(segment_paths, save_path):
+    """
+    Join encoded segments with ffmpeg's concat demuxer, stream copy only.
+    """
+    list_path = Path(segment_paths[0]).parent / "concat.txt"
+
+    with open(list_path, "w") as f:
+        for path in segment_paths:
+            f.write(f"file '{Path(path).resolve().as_posix()}'\n")
+
+    subprocess.run(
+        [
+            FFMPEG_BIN, "-y", "-loglevel", "error",
+            "-f", "concat", "-safe", "0",
+            "-i", str(list_path),
+            "-c", "copy",
+            str(save_path),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return save_path
+
+
+def export_segments_parallel(
+    setup,
+    frames,
+    save_path,
+    *,
+    fps,
+    setup_args=(),
+    workers=None,
+    segment_frames=None,
+    segment_dir=None,
+    keep_segments=None,
+    dpi=None,
+    codec="libx264",
+    bitrate=None,
+    pix_fmt="yuv420p",
+    extra_args=None,
+    metadata=None,
+    redraw=True,
+    queue_size=4,
+    cache=None,
+    keys=None,
+):
+    """
+    Render and encode contiguous segments in parallel, then concatenate.
+
+    setup / setup_args as for export_frames_parallel.
+    segment_frames : frames per segment (default: ~4 segments per worker)
+    segment_dir    : where segments live (default: <save_path>_segments);
+                     finished segments found there are not re-rendered
+    keep_segments  : leave the segment directory after a successful join
+                     (default: only when keys are given)
+    cache, keys    : as for export_frames; with keys, a segment is reused
+                     only while all of its frame keys are unchanged, and
+                     segments no longer in the timeline are deleted
+    """
+    if isinstance(frames, int):
+        frames = range(frames)
+    frames = list(frames)
+    keyed = keys is not None
+    keys = list(keys) if keyed else [None] * len(frames)
+    if keep_segments is None:
+        keep_segments = keyed
+
+    workers = workers or os.cpu_count() or 1
+    segment_frames = segment_frames or max(1, math.ceil(len(frames) / (4 * workers)))
+
+    save_path = Path(save_path)
+    suffix = save_path.suffix or ".mp4"
+    segment_dir = Path(segment_dir or save_path.with_name(f"{save_path.stem}_segments"))
+
+    encode = dict(
+        codec=codec,
+        bitrate=bitrate,
+        pix_fmt=pix_fmt,
+        extra_args=extra_args,
+        metadata=metadata,
+    )
+
+    _prepare_segment_dir(segment_dir, {
+        "frames": len(frames),
+        "segment_frames": segment_frames,
+        "fps": fps,
+        "dpi": dpi,
+        **encode,
+        "extra_args": list(extra_args or []),
+    })
+
+    segments = []
+    for n, i in enumerate(range(0, len(frames), segment_frames)):
+        chunk_keys = keys[i:i + segment_frames]
+        tag = f"_{frame_key(chunk_keys)[:12]}" if keyed else ""
+        segments.append((
+            frames[i:i + segment_frames],
+            chunk_keys,
+            segment_dir / f"seg_{n:05d}{tag}{suffix}",
+        ))
+    todo = [seg for seg in segments if not seg[2].exists()]
+
+    if todo:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(todo)),
+            initializer=_init_render_worker,
+            initargs=(setup, setup_args, dpi, redraw, cache),
+        ) as pool:
+            futures = [
+                pool.submit(_encode_segment, chunk, chunk_keys, path, fps, queue_size, encode)
+                for chunk, chunk_keys, path in todo
+            ]
+            for future in as_completed(futures):
+                future.result()
+
+    concat_segments([path for _, _, path in segments], save_path)
+
+    if not keep_segments:
+        shutil.rmtree(segment_dir)
+    else:
+        # drop segments of earlier keys, so the directory does not grow
+        current = {path for _, _, path in segments}
+        for path in segment_dir.glob(f"seg_*{suffix}"):
+            if path not in current:
+                path.unlink()
+
+    return save_path
@@ -0,0 +1,114 @@
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from matplotlib import font_manager as fm
+from matplotlib import rcParams
+
+# ---------------------------------------------------------------
+# LAZY FONT REGISTRY
+# ---------------------------------------------------------------
+# Fonts are looked up on first use, not at import, and every
+# FontProperties is built once per process. Montserrat is searched for
+# in FONT_DIR (os.pathsep-separated), ./fonts next to this file and the
+# usual per-user / system font folders. If it is missing (e.g. on a
+# Linux render box) the matching weight of matplotlib's bundled
+# DejaVu Sans is used instead of crashing.
+
+FONT_FILES = {
+    "regular": "Montserrat-Regular.ttf",
+    "medium": "Montserrat-Medium.ttf",
+    "semi": "Montserrat-SemiBold.ttf",
+    "bold": "Montserrat-Bold.ttf",
+    "italic": "Montserrat-Italic.ttf",
+    "variable": "Montserrat-VariableFont_wght.ttf",
+}
+
+FALLBACK_FAMILY = "DejaVu Sans"
+
+FALLBACK_STYLE = {
+    "regular": {"weight": "normal"},
+    "medium": {"weight": "medium"},
+    "semi": {"weight": "semibold"},
+    "bold": {"weight": "bold"},
+    "italic": {"style": "italic"},
+    "variable": {"weight": "normal"},
+}
+
+
+def _font_dirs():
+    dirs = [Path(p) for p in os.environ.get("FONT_DIR", "").split(os.pathsep) if p]
+    dirs.append(Path(__file__).resolve().parent / "fonts")
+
+    for env, sub in (("LOCALAPPDATA", r"Microsoft\Windows\Fonts"), ("WINDIR", "Fonts")):
+        if os.environ.get(env):
+            dirs.append(Path(os.environ[env]) / sub)
+
+    home = Path.home()
+    dirs += [
+        home / "Library" / "Fonts",
+        Path("/Library/Fonts"),
+        home / ".local" / "share" / "fonts",
+        home / ".fonts",
+        Path("/usr/local/share/fonts"),
+        Path("/usr/share/fonts"),
+    ]
+    return [d for d in dirs if d.is_dir()]
+
+
+@lru_cache(maxsize=None)
+def _font_index():
+    """
+    {file name: path} for every font under the search folders, scanned
+    once. Earlier folders win; Linux packages nest fonts in subfolders.
+    """
+    index = {}
+    for d in reversed(_font_dirs()):
+        for path in d.rglob("*"):
+            if path.suffix.lower() in (".ttf", ".otf", ".ttc"):
+                index[path.name] = str(path)
+    return index
+
+
+def font_path(name):
+    """
+    Path of the font file registered as `name`, or None if not installed.
+    """
+    return _font_index().get(FONT_FILES[name])
+
+
+@lru_cache(maxsize=None)
+def font(name):
+    """
+    Shared FontProperties for `name` ("regular", "medium", "semi",
+    "bold", "italic", "variable"), falling back to DejaVu Sans.
+
+    Callers that tweak the result (set_size, ...) should .copy() it.
+    """
+    path = font_path(name)
+    if path is not None:
+        return fm.FontProperties(fname=path)
+    return fm.FontProperties(family=FALLBACK_FAMILY, **FALLBACK_STYLE[name])
+
+
+@lru_cache(maxsize=None)
+def font_family(name="regular"):
+    """
+    Family name for rcParams["font.family"]. Registers the file with the
+    font manager, which only family-name lookups need, once per process.
+    """
+    path = font_path(name)
+    if path is None:
+        return FALLBACK_FAMILY
+
+    fm.fontManager.addfont(path)
+    return fm.FontProperties(fname=path).get_name()
+
+
+def use_font_family(name="regular", weight=None):
+    """
+    Make `name` the default family for artists created from now on.
+    """
+    rcParams["font.family"] = font_family(name)
+    if weight is not None:
+        rcParams["font.weight"] = weight
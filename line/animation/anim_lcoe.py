@@ -1,6 +1,3 @@
-import numpy as np
-import os
-import time
 import matplotlib.pyplot as plt
 import sys
 from pathlib import Path
@@ -15,26 +12,19 @@ if str(ROOT) not in sys.path:
 # -------------------------------------------------
 # Imports
 # -------------------------------------------------
-from line.utils import build_chart_name, mpl_text
+from line.utils import mpl_text
 from line.style.config import TECH_RENDER, TECH_LABEL_MODE
-from line.structure.lcoe_chart import draw_lcoe_chart
+from line.structure.lcoe_chart import LcoeChart
 from line.style.chart_spec import setup_lcoe_figure
 from line.style.styling import (
     BACKGROUND,
-    FONT_SEMI_BOLD,
-    FONT_REGULAR,
-    DARK_GREY,
-    large_font,
-    medium_font,
-    small_font,
     component_colors
 )
-from line.style.content import *
 
+from export import export_frames
 
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation, FFMpegWriter
+# shot-list entry rendered by main()
+ZOOM_TAG = "1.z"
 
 def animate_lcoe_yzoom(
     *,
@@ -57,7 +47,7 @@ def animate_lcoe_yzoom(
     title = mpl_text(f"{country} in {year}: solar and BESS cost breakdown")
 
     # ---- create layout ONCE ----
-    fig, ax = setup_lcoe_figure(title)
+    fig, ax = setup_lcoe_figure(title, headless=save_path is not None)
 
     hold_frames = int(hold_seconds * fps)
     total_frames = frames + hold_frames
@@ -65,6 +55,25 @@ def animate_lcoe_yzoom(
     def ease_out_cubic(t):
         return 1 - (1 - t) ** 3
 
+    # ---- build the chart ONCE; frames only move the y-limits ----
+    ax.clear()
+    ax.set_facecolor(BACKGROUND)
+
+    chart = LcoeChart(
+        ax=ax,
+        df=df_lcoe,
+        line_tech_years=line_tech_years,
+        component_tech_years=component_tech_years,
+        component_df=df_components,
+        component_order=component_order,
+        component_colors=component_colors,
+        default_fossil_lf=default_fossil_lf,
+        tech_render=TECH_RENDER,
+        tech_label_mode=TECH_LABEL_MODE,
+        ylims=y_start,
+        y_tick_step=50,
+    )
+
     def update(frame):
         if frame < frames:
             t = frame / (frames - 1)
@@ -77,26 +86,27 @@ def animate_lcoe_yzoom(
             y_start[1] + t * (y_end[1] - y_start[1]),
         )
 
-        ax.clear()
-        ax.set_facecolor(BACKGROUND)
-
-        draw_lcoe_chart(
-            ax=ax,
-            df=df_lcoe,
-            line_tech_years=line_tech_years,
-            component_tech_years=component_tech_years,
-            component_df=df_components,
-            component_order=component_order,
-            component_colors=component_colors,
-            default_fossil_lf=default_fossil_lf,
-            tech_render=TECH_RENDER,
-            tech_label_mode=TECH_LABEL_MODE,
-            ylims=ylims,
-            y_tick_step=50,
-        )
+        chart.set_ylim(ylims)
 
         return []
 
+    # ---- Save: raw RGBA pipe into ffmpeg ----
+    if save_path is not None:
+        export_frames(
+            fig,
+            update,
+            total_frames,
+            save_path,
+            fps=fps,
+            codec="h264",
+            bitrate=10000,
+            pix_fmt="yuv420p",
+            metadata={"artist": "Barnaby Winser"},
+        )
+        return save_path
+
+    # ---- Preview ----
+    from matplotlib.animation import FuncAnimation  # preview only
     anim = FuncAnimation(
         fig,
         update,
@@ -105,62 +115,25 @@ def animate_lcoe_yzoom(
         blit=False,
     )
 
-    # ---- Save OR preview ----
-    if save_path is not None:
-        writer = FFMpegWriter(
-            fps=fps,
-            metadata={"artist": "Barnaby Winser"},
-            bitrate=10000,
-        )
-
-        anim.save(save_path, writer=writer)
-        plt.close(fig)
-
-    else:
-        plt.show()
+    plt.show()
 
     return anim
 
 
-if __name__ == "__main__":
-    name = build_chart_name(COUNTRY, line_tech_years)
-
-    output_path = (
-        fr"C:\Users\barna\OneDrive\Documents\Solar_BESS\video charts\{tag}_{name}_ANIM.mp4"
-    )
-
-    df_lcoe = pd.read_csv(
-        r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_results_complete.csv"
-    )
+def main(output_path=None, tag=ZOOM_TAG):
+    """
+    Render the lcoe-zoom shot `tag` from line/shot_list.py.
+    """
+    from line.batch import load_shots, shot_output, render_zoom_shot
 
-    df_lcoe = df_lcoe[
-        df_lcoe["Country"] == COUNTRY
-        ]
+    shot = next(s for s in load_shots() if s["tag"] == tag)
 
-    # -------------------------------------------------
-    # Load component breakdown data
-    # -------------------------------------------------
-    df_components = pd.read_csv(
-        r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_breakdowns2.csv"
-    )
+    if output_path is None:
+        output_path = shot_output(shot)
 
-    df_components = df_components[
-        (df_components["Country"] == COUNTRY) &
-        (df_components["Year"] == YEAR)
-        ]
+    render_zoom_shot(shot, output_path)
+    return output_path
 
-    animate_lcoe_yzoom(
-        df_lcoe=df_lcoe,
-        df_components=df_components,
-        country=COUNTRY,
-        year=YEAR,
-        line_tech_years=line_tech_years,
-        component_tech_years=component_tech_years,
-        component_order=component_order,
-        y_start=(0, 400),
-        y_end=(0, 200),
-        frames=45,
-        fps=60,
-        save_path=output_path
-    )
 
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,3 @@
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-
 from pathlib import Path
 import sys
 
@@ -8,46 +5,56 @@ ROOT = Path(__file__).resolve().parents[2]
 sys.path.append(str(ROOT))
 
 from line.plots.double import build_dashboard
+from export import export_frames, new_figure
+from draft import draft_encode, draft_path
+
+# Quick low-dpi MJPEG preview; set False for the final render
+DRAFT = False
+
+# Frames per availability step, blending between levels (None: one
+# frame per level). Each step lasts 1 / STEP_FPS seconds either way.
+TWEEN = 15
+STEP_FPS = 2
+
+OUTPUT = r"C:\Users\barna\OneDrive\Documents\Solar_BESS\Good charts\video\availability_loop2.mp4"
+
+
+def main(output=OUTPUT, draft=DRAFT, tween=TWEEN):
+    # --------------------------------------------------
+    # Build figure + axes (layout only)
+    # --------------------------------------------------
+    fig = new_figure(headless=True, figsize=(19.2, 16.2), dpi=100)
+
+    gs = fig.add_gridspec(
+        3, 1,
+        height_ratios=[1, 1, 1],
+        left=0.08,
+        right=0.80,
+        top=0.94,
+        bottom=0.08,
+        hspace=0.30,
+    )
+
+    ax_top = fig.add_subplot(gs[0, 0])
+    ax_mid = fig.add_subplot(gs[1, 0])
+    ax_bot = fig.add_subplot(gs[2, 0])
+
+    update, availabilities = build_dashboard(fig, (ax_top, ax_mid, ax_bot), draft=draft, tween=tween)
+
+    # --------------------------------------------------
+    # Animate (STEP_FPS levels per second) → raw RGBA pipe into ffmpeg
+    # --------------------------------------------------
+    encode = dict(fps=STEP_FPS * (tween or 1), dpi=200, codec="h264", pix_fmt="yuv420p")
+
+    if draft:
+        encode = draft_encode(encode)
+        output = draft_path(output)
+
+    export_frames(fig, update, availabilities, output, **encode)
+
+    print(f"Saved animation to {output}")
+    return output
+
 
-# --------------------------------------------------
-# Build figure + axes (layout only)
-# --------------------------------------------------
-fig = plt.figure(figsize=(19.2, 16.2), dpi=100)
-
-gs = fig.add_gridspec(
-    3, 1,
-    height_ratios=[1, 1, 1],
-    left=0.08,
-    right=0.80,
-    top=0.94,
-    bottom=0.08,
-    hspace=0.30,
-)
-
-ax_top = fig.add_subplot(gs[0, 0])
-ax_mid = fig.add_subplot(gs[1, 0])
-ax_bot = fig.add_subplot(gs[2, 0])
-
-update, availabilities = build_dashboard(fig, (ax_top, ax_mid, ax_bot))
-
-# --------------------------------------------------
-# Animate (2 per second)
-# --------------------------------------------------
-anim = FuncAnimation(
-    fig,
-    update,
-    frames=availabilities,
-    interval=500,
-    repeat=True,
-)
-
-output = r"C:\Users\barna\OneDrive\Documents\Solar_BESS\Good charts\video\availability_loop2.mp4"
-
-anim.save(
-    output,
-    writer="ffmpeg",
-    fps=2,
-    dpi=200,
-)
-
-print(f"Saved animation to {output}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from line.shot_list import SHOTS
+from line.structure import lcoe_data
+from line.structure.lcoe_data import lcoe_results, lcoe_components
+from line.utils import build_chart_name, mpl_text
+from render_cache import frame_key, source_digest
+
+# -------------------------------------------------
+# Batch runner for the shot list
+# -------------------------------------------------
+# Renders every shot in line/shot_list.py (or a YAML / JSON file of the
+# same dicts). Datasets and their per-country views come from the
+# shared cached loader (line/structure/lcoe_data.py), so they are parsed
+# once and shared by all shots rendered in a process. A shot is skipped
+# when its key (spec + data file stats + renderer source) and its
+# output file both match the manifest from the previous run, so editing
+# one shot only re-renders that shot. Independent shots render in a
+# process pool.
+
+OUTPUT_DIR = r"C:\Users\barna\OneDrive\Documents\Solar_BESS\video charts"
+
+SHOT_MANIFEST = "shots.json"
+
+COMPONENT_ORDER = [
+    "Solar CAPEX",
+    "BESS Energy CAPEX",
+    "BESS Power CAPEX",
+    "Augmentation",
+    "Opex",
+]
+
+SHOT_DEFAULTS = {
+    "tag": None,
+    "kind": "lcoe",
+    "component_tech_years": None,
+    "ylims": (0, 400),
+    "y_tick_step": 50,
+    "default_fossil_lf": [0.7],
+    "frames": 40,
+    "fps": 30,
+    "subtitle": None,
+}
+
+
+def load_shots(path=None):
+    """
+    SHOTS (or the list in a .yaml / .json file) with defaults filled in.
+    """
+    if path is None:
+        shots = SHOTS
+    else:
+        path = Path(path)
+        if path.suffix in (".yaml", ".yml"):
+            import yaml  # optional: only needed for YAML shot files
+            shots = yaml.safe_load(path.read_text())
+        else:
+            shots = json.loads(path.read_text())
+
+    return [{**SHOT_DEFAULTS, **shot} for shot in shots]
+
+
+def shot_output(shot, out_dir=OUTPUT_DIR):
+    """
+    shot["output"] if given, else <out_dir>/<tag>_<chart name>[_ANIM.mp4|.png].
+    """
+    if shot.get("output"):
+        return Path(shot["output"])
+
+    name = build_chart_name(shot["country"], shot["line_tech_years"])
+    prefix = f"{shot['tag']}_" if shot["tag"] else ""
+    suffix = "_ANIM.mp4" if shot["kind"] == "lcoe-zoom" else ".png"
+
+    return Path(out_dir) / f"{prefix}{name}{suffix}"
+
+
+# -------------------------------------------------
+# Renderers
+# -------------------------------------------------
+def render_lcoe_shot(shot, output_path):
+    from line.style.config import TECH_RENDER, TECH_LABEL_MODE
+    from line.style.chart_spec import setup_lcoe_figure
+    from line.style.styling import component_colors
+    from line.structure.lcoe_chart import draw_lcoe_chart
+
+    fig, ax = setup_lcoe_figure(mpl_text(shot["title"]), shot["subtitle"], headless=True)
+
+    draw_lcoe_chart(
+        ax=ax,
+        df=lcoe_results(shot["country"]),
+        line_tech_years=shot["line_tech_years"],
+        component_tech_years=shot["component_tech_years"],
+        component_df=lcoe_components(shot["country"]),
+        component_order=COMPONENT_ORDER,
+        component_colors=component_colors,
+        default_fossil_lf=shot["default_fossil_lf"],
+        tech_render=TECH_RENDER,
+        tech_label_mode=TECH_LABEL_MODE,
+        ylims=tuple(shot["ylims"]),
+        y_tick_step=shot["y_tick_step"],
+    )
+
+    fig.savefig(
+        output_path,
+        dpi=300,
+        facecolor=fig.get_facecolor(),
+    )
+
+
+def render_zoom_shot(shot, output_path):
+    from line.animation.anim_lcoe import animate_lcoe_yzoom
+
+    animate_lcoe_yzoom(
+        df_lcoe=lcoe_results(shot["country"]),
+        df_components=lcoe_components(shot["country"], shot["year"]),
+        country=shot["country"],
+        year=shot["year"],
+        line_tech_years=shot["line_tech_years"],
+        component_tech_years=shot["component_tech_years"],
+        component_order=COMPONENT_ORDER,
+        y_start=tuple(shot["y_start"]),
+        y_end=tuple(shot["y_end"]),
+        frames=shot["frames"],
+        fps=shot["fps"],
+        default_fossil_lf=shot["default_fossil_lf"],
+        save_path=output_path,
+    )
+
+
+RENDERERS = {
+    "lcoe": render_lcoe_shot,
+    "lcoe-zoom": render_zoom_shot,
+}
+
+
+def renderer_digest():
+    """
+    Hash of the drawing code, so restyling re-renders every shot.
+    """
+    import line.structure.lcoe_chart
+    import line.structure.helpers
+    import line.style.chart_spec
+    import line.style.config
+    import line.style.styling
+    import line.animation.anim_lcoe
+
+    return source_digest(
+        line.structure.lcoe_chart,
+        line.structure.helpers,
+        line.style.chart_spec,
+        line.style.config,
+        line.style.styling,
+        line.animation.anim_lcoe,
+        lcoe_data,
+        sys.modules[__name__],
+    )
+
+
+def _render(shot, output_path):
+    RENDERERS[shot["kind"]](shot, output_path)
+    return output_path
+
+
+# -------------------------------------------------
+# Runner
+# -------------------------------------------------
+def _is_current(entry, key, output_path):
+    if entry is None or entry["key"] != key or not output_path.exists():
+        return False
+    st = output_path.stat()
+    return entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns
+
+
+def render_shots(shots=None, out_dir=OUTPUT_DIR, only=None, workers=None, force=False):
+    """
+    Render the shot list; returns {output path: "rendered" | "skipped"}.
+
+    only    : tags to render (default: every shot)
+    workers : process pool size (default: one per core); 1 renders
+              in-process
+    force   : re-render even when inputs and output are unchanged
+    """
+    shots = load_shots() if shots is None else shots
+    if only:
+        shots = [shot for shot in shots if shot["tag"] in only]
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = out_dir / SHOT_MANIFEST
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    # every CSV a renderer can read; None for files that do not exist
+    inputs = (
+        *(
+            lcoe_data.fingerprint(path) if os.path.exists(path) else None
+            for path in lcoe_data.data_paths()
+        ),
+        renderer_digest(),
+    )
+
+    status = {}
+    todo = []
+    for shot in shots:
+        output_path = shot_output(shot, out_dir)
+        key = frame_key(shot, inputs)
+
+        if not force and _is_current(manifest.get(str(output_path)), key, output_path):
+            status[str(output_path)] = "skipped"
+        else:
+            todo.append((shot, output_path, key))
+
+    def done(output_path, key):
+        st = output_path.stat()
+        manifest[str(output_path)] = {"key": key, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+        status[str(output_path)] = "rendered"
+        print(f"Rendered {output_path}")
+
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+
+    if workers <= 1:
+        for shot, output_path, key in todo:
+            done(_render(shot, output_path), key)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = {
+                pool.submit(_render, shot, output_path): key
+                for shot, output_path, key in todo
+            }
+            for future in as_completed(futures):
+                done(future.result(), futures[future])
+
+    return status
+
+
+def main(shot_file=None, out_dir=OUTPUT_DIR, only=None, workers=None, force=False):
+    return render_shots(load_shots(shot_file), out_dir, only, workers, force)
+
+
+if __name__ == "__main__":
+    main()
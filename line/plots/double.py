@@ -1,19 +1,17 @@
-import pandas as pd
-import os
-import time
-import matplotlib.pyplot as plt
+from functools import lru_cache
 from pathlib import Path
 import sys
 
+import numpy as np
+
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.append(str(ROOT))
 
-from line.utils import build_chart_name, draw_dashboard_callout
+from line.utils import build_chart_name, draw_dashboard_callout, open_output
 from line.style.config import TECH_RENDER, TECH_LABEL_MODE, POSITIVE, NEGATIVE
+from fonts import font
 from line.style.styling import (
     BACKGROUND,
-    FONT_SEMI_BOLD,
-    FONT_REGULAR,
     DARK_GREY,
     medium_font,
     small_font,
@@ -25,9 +23,12 @@ from line.structure.lcoe_chart import (
     draw_lcoe_chart,
     draw_generation_stack_chart,
     draw_capacity_cluster_chart,
+    generation_xaxis,
 )
-from line.structure.prep_stack import load_typical_week_by_availability
+from line.structure.prep_stack import load_typical_week_by_availability, typical_week_cube
+from line.structure.lcoe_data import lcoe_results, lcoe_components, lcoe_store, COMPONENTS_COMPLETE_CSV
 from line.variable_map import VARIABLE_MAP
+from export import new_figure
 
 # ===============================================================
 # Configuration
@@ -44,21 +45,7 @@ LCOE_YLIMS = (0, 500)
 line_tech_years = []
 component_tech_years = [{"tech": "Solar+BESS", "year": 2015}] # None
 
-# ===============================================================
-# Load data
-# ===============================================================
-df_lcoe = pd.read_csv(
-    r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_results_complete.csv"
-)
-df_lcoe = df_lcoe[df_lcoe["Country"] == COUNTRY]
-
-df_components = pd.read_csv(
-    r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_breakdowns_complete.csv"
-)
-df_components = df_components[
-    (df_components["Country"] == COUNTRY) &
-    (df_components["Year"] == YEAR)
-]
+TIMESERIES_CSV = r"C:\Users\barna\PycharmProjects\solar_bess\outputs\long_timeseries_Spain.csv"
 
 component_order = [
     "Solar CAPEX",
@@ -68,46 +55,120 @@ component_order = [
     "Opex",
 ]
 
-typical_week_by_avail = load_typical_week_by_availability(
-    country=COUNTRY,
-    path=r"C:\Users\barna\PycharmProjects\solar_bess\outputs\long_timeseries_Spain.csv",
-    variable_map=VARIABLE_MAP,
-    anchor_year=2023,
-)
+stack_order = ["Solar", "Battery Discharge", "Unmet Demand", "Battery Charge", "Curtailment"]
+
+# ===============================================================
+# Load data (on first use, once per process)
+# ===============================================================
+@lru_cache(maxsize=None)
+def load_dashboard_data():
+    """
+    (df_lcoe, df_components, week) for COUNTRY / YEAR; week is the
+    typical-week cube (prep_stack.typical_week_cube, in stack_order)
+    plus its precomputed "xaxis".
+    """
+    df_lcoe = lcoe_results(COUNTRY)
+    df_components = lcoe_components(COUNTRY, YEAR, path=COMPONENTS_COMPLETE_CSV)
+
+    typical_week_by_avail = load_typical_week_by_availability(
+        country=COUNTRY,
+        path=TIMESERIES_CSV,
+        variable_map=VARIABLE_MAP,
+        anchor_year=2023,
+    )
+
+    week = typical_week_cube(typical_week_by_avail, stack_order)
+    week["xaxis"] = generation_xaxis(week["index"])
+
+    return df_lcoe, df_components, week
+
+# ===============================================================
+# Values at any availability (tweened sweeps)
+# ===============================================================
+CALLOUT_COLUMNS = ("Solar_Capacity_MW", "BESS_Power_MW", "BESS_Energy_MWh")
+
+def blend_levels(values, levels, avail):
+    """
+    values[i] for levels[i] == avail, else the linear blend of the two
+    rows either side of avail (values: one row per sorted level).
+    """
+    p = np.interp(avail, levels, np.arange(len(levels)))
+    i = min(int(p), len(levels) - 2)
+    t = p - i
+    if t == 0:
+        return values[i]
+    if t == 1:
+        return values[i + 1]
+    return values[i] + t * (values[i + 1] - values[i])
+
+def week_at(week, avail):
+    """
+    Typical-week dispatch (168 x len(stack_order)) at avail.
+    """
+    row = week["row"].get(avail)
+    if row is not None:
+        return week["values"][row]
+    return blend_levels(week["values"], week["availability"], avail)
+
+def callout_values(df_lcoe, avail, scenario=None):
+    """
+    {column: value} of the Solar+BESS capacities (CALLOUT_COLUMNS) at
+    avail, interpolated between availability levels. scenario None is
+    the baseline curve (see LcoeStore).
+    """
+    group = lcoe_store(df_lcoe).group("Solar+BESS", YEAR, scenario)
+
+    if group is None:
+        raise ValueError(
+            f"No capacity rows for Tech=Solar+BESS, Year={YEAR}"
+            + (f", Scenario={scenario}" if scenario is not None else "")
+        )
+
+    return {
+        c: float(np.interp(avail, group["Availability"], group[c]))
+        for c in CALLOUT_COLUMNS
+    }
 
 # ===============================================================
 # Figure + layout
 # ===============================================================
 DPI = 100
-fig = plt.figure(figsize=(1920 / DPI, 1620 / DPI), dpi=DPI)
-fig.patch.set_facecolor(BACKGROUND)
-
-gs = fig.add_gridspec(
-    nrows=3,
-    ncols=1,
-    height_ratios=[1, 1, 1],
-    left=0.08,
-    right=0.80,
-    top=0.94,
-    bottom=0.08,
-    hspace=0.30,
-)
 
-ax_top = fig.add_subplot(gs[0])
-ax_mid = fig.add_subplot(gs[1])
-ax_bot = fig.add_subplot(gs[2])
+def new_dashboard_figure(headless=True):
+    """
+    1920x1620 figure with the three stacked panels (top, mid, bot).
+    """
+    fig = new_figure(headless=headless, figsize=(1920 / DPI, 1620 / DPI), dpi=DPI)
+    fig.patch.set_facecolor(BACKGROUND)
+
+    gs = fig.add_gridspec(
+        nrows=3,
+        ncols=1,
+        height_ratios=[1, 1, 1],
+        left=0.08,
+        right=0.80,
+        top=0.94,
+        bottom=0.08,
+        hspace=0.30,
+    )
+
+    axes = tuple(fig.add_subplot(gs[i]) for i in range(3))
+
+    for ax in axes:
+        ax.set_facecolor(BACKGROUND)
 
-for ax in (ax_top, ax_mid, ax_bot):
-    ax.set_facecolor(BACKGROUND)
+    return fig, axes
 
 # ===============================================================
-# Capture base positions ONCE
+# Capture base positions ONCE (before any squeeze)
 # ===============================================================
-BASE_POS = {
-    "top": ax_top.get_position().frozen(),
-    "mid": ax_mid.get_position().frozen(),
-    "bot": ax_bot.get_position().frozen(),
-}
+def base_positions(axes):
+    ax_top, ax_mid, ax_bot = axes
+    return {
+        "top": ax_top.get_position().frozen(),
+        "mid": ax_mid.get_position().frozen(),
+        "bot": ax_bot.get_position().frozen(),
+    }
 
 # ===============================================================
 # Deterministic vertical squeeze
@@ -136,185 +197,79 @@ def axis_center_y(ax):
     return 0.5 * (p.y0 + p.y1)
 
 # ===============================================================
-# Static draw
-# ===============================================================
-week_df = typical_week_by_avail[AVAIL]
-
-draw_generation_stack_chart(
-    ax=ax_top,
-    stack_df=week_df,
-    order=["Solar", "Battery Discharge", "Unmet Demand", "Battery Charge", "Curtailment"],
-    unit="MW",
-    ylims=(-0.6, 1),
-    positive=POSITIVE,
-    negative=NEGATIVE,
-    right_axis=True
-)
-
-draw_capacity_cluster_chart(
-    ax=ax_mid,
-    df=df_lcoe,
-    tech_years=TECH_YEARS,
-    max_avail=AVAIL,
-    #highlight_avail=AVAIL,
-    duration_power_ratio=4.0,
-    bar_width=0.02,
-    colors=capacity_colors,
-    ref_xline_label=True
-)
-
-ax_mid.set_xlabel(
-    "Demand met",
-    fontproperties=FONT_REGULAR,
-    fontsize=small_font,
-    color=DARK_GREY,
-    labelpad=10,
-)
-
-draw_lcoe_chart(
-    ax=ax,
-    df=df_lcoe,
-    line_tech_years=line_tech_years,
-    component_tech_years=component_tech_years,
-    component_df=df_components,
-    component_order=component_order,
-    component_colors=component_colors,
-    default_fossil_lf=None,
-    tech_render=TECH_RENDER,
-    tech_label_mode=TECH_LABEL_MODE,
-    ylims=LCOE_YLIMS,
-    y_tick_step=100,
-    right_axis=True
-)
-
-ax_bot.set_xlabel(
-    "Demand met",
-    fontproperties=FONT_REGULAR,
-    fontsize=small_font,
-    color=DARK_GREY,
-    labelpad=12,
-)
-
-# --- apply squeeze BEFORE titles + dashboards ---
-apply_vertical_squeeze(ax_top, ax_mid, ax_bot, BASE_POS)
-
-# ===============================================================
-# Titles
+# Draw (static still and every animation frame)
 # ===============================================================
 pad_y = 0.02
-for ax, title in {
-    ax_top: f"Average dispatch pattern",  # {avail:.0%}
-    ax_mid: "Solar and storage capacities to meet % of annual energy",
-    ax_bot: f"Levelised cost of electricity by component ({COUNTRY}, {YEAR})",
-}.items():
-    pos = ax.get_position()
-    fig.text(
-        0.08,
-        pos.y1 + pad_y,
-        title,
-        ha="left",
-        va="bottom",
-        fontproperties=FONT_REGULAR,
-        fontsize=medium_font,
-        color=DARK_GREY,
-    )
-
-# ===============================================================
-# Dashboards (static)
-# ===============================================================
-row = df_lcoe[
-    (df_lcoe["Tech"] == "Solar+BESS") &
-    (df_lcoe["Year"] == YEAR) &
-    (df_lcoe["Availability"] == AVAIL)
-].iloc[0]
-
-solar_capacity = row["Solar_Capacity_MW"]
-bess_power = row["BESS_Power_MW"]
-duration_h = row["BESS_Energy_MWh"]
-
-draw_dashboard_callout(
-    fig=fig,
-    x=0.93,
-    y_center=axis_center_y(ax_top) + 0.05,
-    rows=[{"label": "Demand met", "value": f"{int(AVAIL * 100)}%"}],
-    label_font=FONT_REGULAR,
-    value_font=FONT_SEMI_BOLD,
-    label_size=small_font,
-    value_size=medium_font + 6,
-    color=DARK_GREY,
-    row_gap=0.05,
-    value_offset=0.02,
-)
-
-draw_dashboard_callout(
-    fig=fig,
-    x=0.93,
-    y_center=0.55,
-    rows=[
-        {"label": "Solar capacity", "value": f"{solar_capacity:.1f} MW", "color": STACK_COLOURS["Solar"]},
-        {"label": "BESS power", "value": f"{bess_power:.1f} MW", "color": capacity_colors["BESS Power"]},
-        {"label": "BESS energy", "value": f"{duration_h:.1f} MWh", "color": STACK_COLOURS["Battery Discharge"]},
-    ],
-    label_font=FONT_REGULAR,
-    value_font=FONT_SEMI_BOLD,
-    label_size=small_font,
-    value_size=medium_font + 7,
-    color=DARK_GREY,
-    row_gap=0.075,
-    value_offset=0.02,
-)
 
-# ===============================================================
-# Animation scaffold
-# ===============================================================
-def build_dashboard(fig, axes):
+def draw_dashboard(fig, axes, base_pos, data, avail, highlight_avail=None,
+                   ref_xline_label=True, draft=False, charts=None):
+    """
+    Draw all three panels, the titles and the callouts for one
+    availability. data: load_dashboard_data().
+    draft: thinned data, no antialiasing (see draft.py).
+    avail may fall between availability levels (tweened sweeps): the
+    dispatch, capacity bars and callouts are then blended.
+    charts: the dict returned by an earlier call on the same axes; its
+    generation and capacity charts are updated in place, not redrawn,
+    and the LCOE panel (independent of avail) is kept as is.
+
+    Returns {"generation": GenerationStackChart, "capacity":
+    CapacityClusterChart, "lcoe": LcoeChart}, for the next frame.
+    """
     ax_top, ax_mid, ax_bot = axes
-    availabilities = sorted(df_lcoe["Availability"].unique())
-    final_avail = availabilities[-1]
-
-    def update(avail):
-        ax_top.cla()
-        ax_mid.cla()
-        ax_bot.cla()
+    df_lcoe, df_components, week = data
 
+    if charts is None:
         for ax in (ax_top, ax_mid, ax_bot):
+            ax.cla()
             ax.set_facecolor(BACKGROUND)
 
-        week_df = typical_week_by_avail[avail]
+    week_values = week_at(week, avail)
 
-        draw_generation_stack_chart(
+    if charts is None:
+        generation = draw_generation_stack_chart(
             ax=ax_top,
-            stack_df=week_df,
-            order=["Solar", "Battery Discharge", "Unmet Demand", "Battery Charge", "Curtailment"],
+            stack_df=week_values,
+            order=stack_order,
             unit="MW",
             ylims=(-0.6, 1),
             positive=POSITIVE,
             negative=NEGATIVE,
-            right_axis=True
+            right_axis=True,
+            xaxis=week["xaxis"],
+            draft=draft,
         )
+    else:
+        generation = charts["generation"]
+        generation.update(week_values)
 
-        draw_capacity_cluster_chart(
+    if charts is None:
+        capacity = draw_capacity_cluster_chart(
             ax=ax_mid,
             df=df_lcoe,
             tech_years=TECH_YEARS,
             max_avail=avail,
-            highlight_avail=avail,
+            highlight_avail=highlight_avail,
             duration_power_ratio=4.0,
             bar_width=0.02,
             colors=capacity_colors,
-            ref_xline_label=True if avail > 0.15 else False
+            ref_xline_label=ref_xline_label
         )
 
         ax_mid.set_xlabel(
             "Demand met",
-            fontproperties=FONT_REGULAR,
+            fontproperties=font("regular"),
             fontsize=small_font,
             color=DARK_GREY,
             labelpad=10,
         )
+    else:
+        capacity = charts["capacity"]
+        capacity.update(avail, highlight_avail, ref_xline_label)
 
-        draw_lcoe_chart(
-            ax=ax,
+    if charts is None:
+        lcoe = draw_lcoe_chart(
+            ax=ax_bot,
             df=df_lcoe,
             line_tech_years=line_tech_years,
             component_tech_years=component_tech_years,
@@ -326,75 +281,112 @@ def build_dashboard(fig, axes):
             tech_label_mode=TECH_LABEL_MODE,
             ylims=LCOE_YLIMS,
             y_tick_step=100,
-            right_axis=True
+            right_axis=True,
+            draft=draft,
         )
 
         ax_bot.set_xlabel(
             "Demand met",
-            fontproperties=FONT_REGULAR,
+            fontproperties=font("regular"),
             fontsize=small_font,
             color=DARK_GREY,
             labelpad=12,
         )
-
-        apply_vertical_squeeze(ax_top, ax_mid, ax_bot, BASE_POS)
-
-        # --- clear and redraw titles + dashboards ---
-        fig.texts.clear()
-
-        for ax, title in {
-            ax_top: f"Average dispatch pattern", # {avail:.0%}
-            ax_mid: "Solar and storage capacities to meet % of annual energy",
-            ax_bot: f"Levelised cost of electricity by component ({COUNTRY}, {YEAR})",
-        }.items():
-            pos = ax.get_position()
-            fig.text(
-                0.08,
-                pos.y1 + pad_y,
-                title,
-                ha="left",
-                va="bottom",
-                fontproperties=FONT_REGULAR,
-                fontsize=medium_font,
-                color=DARK_GREY,
-            )
-
-        row = df_lcoe[
-            (df_lcoe["Tech"] == "Solar+BESS") &
-            (df_lcoe["Year"] == YEAR) &
-            (df_lcoe["Availability"] == avail)
-        ].iloc[0]
-
-        draw_dashboard_callout(
-            fig=fig,
-            x=0.93,
-            y_center=axis_center_y(ax_top) + 0.05,
-            rows=[{"label": "Demand met", "value": f"{int(avail * 100)}%"}],
-            label_font=FONT_REGULAR,
-            value_font=FONT_SEMI_BOLD,
-            label_size=small_font,
-            value_size=medium_font + 6,
+    else:
+        lcoe = charts["lcoe"]
+
+    # --- apply squeeze BEFORE titles + dashboards ---
+    apply_vertical_squeeze(ax_top, ax_mid, ax_bot, base_pos)
+
+    # --- clear and redraw titles + dashboards ---
+    fig.texts.clear()
+
+    for ax, title in {
+        ax_top: f"Average dispatch pattern", # {avail:.0%}
+        ax_mid: "Solar and storage capacities to meet % of annual energy",
+        ax_bot: f"Levelised cost of electricity by component ({COUNTRY}, {YEAR})",
+    }.items():
+        pos = ax.get_position()
+        fig.text(
+            0.08,
+            pos.y1 + pad_y,
+            title,
+            ha="left",
+            va="bottom",
+            fontproperties=font("regular"),
+            fontsize=medium_font,
             color=DARK_GREY,
-            row_gap=0.05,
-            value_offset=0.02,
         )
 
-        draw_dashboard_callout(
-            fig=fig,
-            x=0.93,
-            y_center=0.55,
-            rows=[
-                {"label": "Solar capacity", "value": f"{row['Solar_Capacity_MW']:.1f} MW", "color": STACK_COLOURS["Solar"]},
-                {"label": "BESS power", "value": f"{row['BESS_Power_MW']:.1f} MW", "color": capacity_colors["BESS Power"]},
-                {"label": "BESS energy", "value": f"{row['BESS_Energy_MWh']:.1f} MWh", "color": STACK_COLOURS["Battery Discharge"]},
-            ],
-            label_font=FONT_REGULAR,
-            value_font=FONT_SEMI_BOLD,
-            label_size=small_font,
-            value_size=medium_font + 7,
-            color=DARK_GREY,
-            row_gap=0.075,
-            value_offset=0.02,
+    row = callout_values(df_lcoe, avail, TECH_YEARS[0].get("scenario"))
+
+    draw_dashboard_callout(
+        fig=fig,
+        x=0.93,
+        y_center=axis_center_y(ax_top) + 0.05,
+        rows=[{"label": "Demand met", "value": f"{int(avail * 100)}%"}],
+        label_font=font("regular"),
+        value_font=font("semi"),
+        label_size=small_font,
+        value_size=medium_font + 6,
+        color=DARK_GREY,
+        row_gap=0.05,
+        value_offset=0.02,
+    )
+
+    draw_dashboard_callout(
+        fig=fig,
+        x=0.93,
+        y_center=0.55,
+        rows=[
+            {"label": "Solar capacity", "value": f"{row['Solar_Capacity_MW']:.1f} MW", "color": STACK_COLOURS["Solar"]},
+            {"label": "BESS power", "value": f"{row['BESS_Power_MW']:.1f} MW", "color": capacity_colors["BESS Power"]},
+            {"label": "BESS energy", "value": f"{row['BESS_Energy_MWh']:.1f} MWh", "color": STACK_COLOURS["Battery Discharge"]},
+        ],
+        label_font=font("regular"),
+        value_font=font("semi"),
+        label_size=small_font,
+        value_size=medium_font + 7,
+        color=DARK_GREY,
+        row_gap=0.075,
+        value_offset=0.02,
+    )
+
+    return {"generation": generation, "capacity": capacity, "lcoe": lcoe}
+
+# ===============================================================
+# Animation scaffold
+# ===============================================================
+def build_dashboard(fig, axes, draft=False, tween=None):
+    """
+    (update, availabilities): update(avail) draws one frame, to be
+    called with each availability in turn.
+    draft: thinned data, no antialiasing (see draft.py).
+    tween: frames per step between neighbouring availability levels
+    (levels included); in-between frames blend the dispatch, capacity
+    bars and callouts. None: one frame per level.
+    """
+    data = load_dashboard_data()
+    base_pos = base_positions(axes)
+    availabilities = sorted(data[0]["Availability"].unique())
+
+    if tween and len(availabilities) > 1:
+        levels = np.asarray(availabilities)
+        t = np.arange(tween) / tween
+        between = levels[:-1, None] + t * np.diff(levels)[:, None]
+        availabilities = [*between.ravel().tolist(), availabilities[-1]]
+
+    # panels persist across frames
+    charts = None
+
+    def update(avail):
+        nonlocal charts
+        charts = draw_dashboard(
+            fig, axes, base_pos, data, avail,
+            highlight_avail=avail,
+            ref_xline_label=True if avail > 0.15 else False,
+            draft=draft,
+            charts=charts,
         )
 
     return update, availabilities
@@ -402,9 +394,16 @@ def build_dashboard(fig, axes):
 # ===============================================================
 # Save
 # ===============================================================
-if __name__ == "__main__":
-    name = build_chart_name(COUNTRY, TECH_YEARS)
-    output_path = rf"C:\Users\barna\OneDrive\Documents\Solar_BESS\video charts\{tag}_{name}_triple.png"
+def main(output_path=None):
+    """
+    Render the static dashboard at AVAIL and open it.
+    """
+    fig, axes = new_dashboard_figure()
+    draw_dashboard(fig, axes, base_positions(axes), load_dashboard_data(), AVAIL)
+
+    if output_path is None:
+        name = build_chart_name(COUNTRY, TECH_YEARS)
+        output_path = rf"C:\Users\barna\OneDrive\Documents\Solar_BESS\video charts\{tag}_{name}_triple.png"
 
     fig.savefig(
         output_path,
@@ -412,5 +411,9 @@ if __name__ == "__main__":
         facecolor=BACKGROUND,
     )
 
-    time.sleep(0.3)
-    os.startfile(output_path)
+    open_output(output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    main()
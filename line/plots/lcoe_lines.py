@@ -1,7 +1,3 @@
-import pandas as pd
-import os
-import time
-import matplotlib.pyplot as plt
 import sys
 from pathlib import Path
 
@@ -9,11 +5,14 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
-from line.utils import build_chart_name, mpl_text
+from line.utils import build_chart_name, mpl_text, open_output
 from line.style.config import TECH_RENDER, TECH_LABEL_MODE
 from line.structure.lcoe_chart import draw_lcoe_chart
+from line.structure.lcoe_data import lcoe_results
+from export import new_figure
+from fonts import font
 from line.style.styling import (
-    BACKGROUND, FONT_SEMI_BOLD, FONT_REGULAR,
+    BACKGROUND,
     DARK_GREY, large_font, medium_font, small_font
 )
 
@@ -31,85 +30,90 @@ TECH_YEARS = [
 
 ylims = (0, 100)
 
-# -------------------------------------------------
-# Load data
-# -------------------------------------------------
-df = pd.read_csv(
-    r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_results_complete.csv"
-)
-df = df[df["Country"] == COUNTRY]
-
-TITLE = mpl_text(TITLE_RAW)
-
-# -------------------------------------------------
-# Figure
-# -------------------------------------------------
 DPI = 100
-fig = plt.figure(figsize=(1920 / DPI, 1080 / DPI), dpi=DPI)
-fig.patch.set_facecolor(BACKGROUND)
-
-ax = fig.add_subplot(1, 1, 1)
-ax.set_facecolor(BACKGROUND)
-
-fig.subplots_adjust(
-    left=0.08,
-    right=0.8,
-    top=0.80,
-    bottom=0.14,
-)
-
-# -------------------------------------------------
-# Draw chart
-# -------------------------------------------------
-draw_lcoe_chart(
-    ax=ax,
-    df=df,
-    tech_years=TECH_YEARS,
-    default_fossil_lf=DEFAULT_FOSSIL_LF,
-    tech_render=TECH_RENDER,
-    tech_label_mode=TECH_LABEL_MODE,
-    ylims=ylims,
-    y_tick_step=50,
-)
 
-# -------------------------------------------------
-# Titles
-# -------------------------------------------------
-fig.text(
-    0.05, 0.91,
-    TITLE,
-    fontproperties=FONT_SEMI_BOLD,
-    fontsize=large_font,
-    ha="left"
-)
-
-fig.text(
-    0.05, 0.87,
-    "Levelised cost of electricity ($/MWh)",
-    fontproperties=FONT_REGULAR,
-    fontsize=medium_font,
-    color=DARK_GREY
-)
-
-ax.set_xlabel(
-    "Load factor",
-    fontproperties=FONT_REGULAR,
-    fontsize=small_font,
-    color=DARK_GREY,
-    labelpad=14,
-)
-
-# -------------------------------------------------
-# Save
-# -------------------------------------------------
-name = build_chart_name(COUNTRY, TECH_YEARS)
-output_path = fr"C:\Users\barna\OneDrive\Documents\Solar_BESS\Good charts\video\{name}.png"
-
-fig.savefig(
-    output_path,
-    dpi=300,
-    facecolor=fig.get_facecolor(),
-)
 
-time.sleep(0.3)
-os.startfile(output_path)
+def main(output_path=None):
+    # -------------------------------------------------
+    # Load data
+    # -------------------------------------------------
+    df = lcoe_results(COUNTRY)
+
+    title = mpl_text(TITLE_RAW)
+
+    # -------------------------------------------------
+    # Figure
+    # -------------------------------------------------
+    fig = new_figure(headless=True, figsize=(1920 / DPI, 1080 / DPI), dpi=DPI)
+    fig.patch.set_facecolor(BACKGROUND)
+
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set_facecolor(BACKGROUND)
+
+    fig.subplots_adjust(
+        left=0.08,
+        right=0.8,
+        top=0.80,
+        bottom=0.14,
+    )
+
+    # -------------------------------------------------
+    # Draw chart
+    # -------------------------------------------------
+    draw_lcoe_chart(
+        ax=ax,
+        df=df,
+        line_tech_years=TECH_YEARS,
+        default_fossil_lf=DEFAULT_FOSSIL_LF,
+        tech_render=TECH_RENDER,
+        tech_label_mode=TECH_LABEL_MODE,
+        ylims=ylims,
+        y_tick_step=50,
+    )
+
+    # -------------------------------------------------
+    # Titles
+    # -------------------------------------------------
+    fig.text(
+        0.05, 0.91,
+        title,
+        fontproperties=font("semi"),
+        fontsize=large_font,
+        ha="left"
+    )
+
+    fig.text(
+        0.05, 0.87,
+        "Levelised cost of electricity ($/MWh)",
+        fontproperties=font("regular"),
+        fontsize=medium_font,
+        color=DARK_GREY
+    )
+
+    ax.set_xlabel(
+        "Load factor",
+        fontproperties=font("regular"),
+        fontsize=small_font,
+        color=DARK_GREY,
+        labelpad=14,
+    )
+
+    # -------------------------------------------------
+    # Save
+    # -------------------------------------------------
+    if output_path is None:
+        name = build_chart_name(COUNTRY, TECH_YEARS)
+        output_path = fr"C:\Users\barna\OneDrive\Documents\Solar_BESS\Good charts\video\{name}.png"
+
+    fig.savefig(
+        output_path,
+        dpi=300,
+        facecolor=fig.get_facecolor(),
+    )
+
+    open_output(output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,7 @@ component_tech_years = None #[{"tech": "Solar+BESS", "year": 2015}] # None
 
 LCOE_YLIMS = (0, 125)
 
-output_path = (
+output_prefix = (
     fr"C:\Users\barna\OneDrive\Documents\Solar_BESS\video charts\raw\{tag}"
 )
 
@@ -37,10 +37,6 @@ component_order = [
     "Opex",
 ]
 
-import pandas as pd
-import os
-import time
-import matplotlib.pyplot as plt
 import sys
 from pathlib import Path
 
@@ -54,14 +50,13 @@ if str(ROOT) not in sys.path:
 # -------------------------------------------------
 # Imports
 # -------------------------------------------------
-from line.utils import build_chart_name, mpl_text
+from line.utils import build_chart_name, mpl_text, open_output
 from line.style.config import TECH_RENDER, TECH_LABEL_MODE
 from line.structure.lcoe_chart import draw_lcoe_chart
+from line.structure.lcoe_data import lcoe_results, lcoe_components
 from line.style.chart_spec import setup_lcoe_figure
 from line.style.styling import (
     BACKGROUND,
-    FONT_SEMI_BOLD,
-    FONT_REGULAR,
     DARK_GREY,
     large_font,
     medium_font,
@@ -72,24 +67,13 @@ from line.style.styling import (
 TITLE = mpl_text(TITLE_RAW)
 
 # -------------------------------------------------
-# Load LCOE data
+# Load LCOE + component breakdown data (on first use, cached)
 # -------------------------------------------------
-df_lcoe = pd.read_csv(
-    r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_results_complete.csv"
-)
-
-df_lcoe = df_lcoe[
-    df_lcoe["Country"] == COUNTRY
-]
-
-# -------------------------------------------------
-# Load component breakdown data
-# -------------------------------------------------
-df_components = pd.read_csv(
-    r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_breakdowns2.csv"
-)
-
-df_components = df_components[(df_components["Country"] == COUNTRY)] #&(df_components["Year"] == YEAR)]
+def load_data():
+    """
+    (df_lcoe, df_components) for COUNTRY, via the shared cached loader.
+    """
+    return lcoe_results(COUNTRY), lcoe_components(COUNTRY)
 
 # -------------------------------------------------
 # Draw chart (components enabled)
@@ -105,17 +89,19 @@ def render_lcoe(
     ylims,
     y_tick_step=50,
     default_fossil_lf=(0.7,),
+    headless=True,
 ):
     """
     Render a single LCOE chart (static frame).
     Safe for PNG export or animation driver.
+    headless: bare Agg figure (no pyplot window); False for plt.show.
     """
 
     title_raw = TITLE_RAW
     title = mpl_text(title_raw)
     subtitle = COUNTRY
 
-    fig, ax = setup_lcoe_figure(title, subtitle)
+    fig, ax = setup_lcoe_figure(title, subtitle, headless=headless)
 
     draw_lcoe_chart(
         ax=ax,
@@ -134,10 +120,11 @@ def render_lcoe(
 
     return fig, ax
 
-if __name__ == "__main__":
-
+def main(output_path=None):
     print(component_tech_years)
 
+    df_lcoe, df_components = load_data()
+
     fig, ax = render_lcoe(
         df_lcoe=df_lcoe,
         df_components=df_components,
@@ -152,15 +139,19 @@ if __name__ == "__main__":
     # Save
     # -------------------------------------------------
 
-    name = build_chart_name(COUNTRY, line_tech_years)
-
-    full_path = output_path + f"_{name}.png"
+    if output_path is None:
+        name = build_chart_name(COUNTRY, line_tech_years)
+        output_path = output_prefix + f"_{name}.png"
 
     fig.savefig(
-        full_path,
+        output_path,
         dpi=300,
         facecolor=fig.get_facecolor(),
     )
 
-    time.sleep(0.3)
-    os.startfile(full_path)
+    open_output(output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    main()
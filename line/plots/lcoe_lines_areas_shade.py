@@ -34,10 +34,6 @@ component_order = [
     "Opex",
 ]
 
-import pandas as pd
-import os
-import time
-import matplotlib.pyplot as plt
 import sys
 from pathlib import Path
 
@@ -51,14 +47,13 @@ if str(ROOT) not in sys.path:
 # -------------------------------------------------
 # Imports
 # -------------------------------------------------
-from line.utils import build_chart_name, mpl_text
+from line.utils import build_chart_name, mpl_text, open_output
 from line.style.config import TECH_RENDER, TECH_LABEL_MODE
 from line.structure.lcoe_chart import draw_lcoe_chart
+from line.structure.lcoe_data import lcoe_results, lcoe_components, lcoe_store
 from line.style.chart_spec import setup_lcoe_figure
 from line.style.styling import (
     BACKGROUND,
-    FONT_SEMI_BOLD,
-    FONT_REGULAR,
     DARK_GREY,
     large_font,
     medium_font,
@@ -66,29 +61,17 @@ from line.style.styling import (
     component_colors,
     build_color_lookup
 )
-from line.structure.helpers import fossil_lcoe_at_lf
 
 TITLE = mpl_text(TITLE_RAW)
 
 # -------------------------------------------------
-# Load LCOE data
+# Load LCOE + component breakdown data (on first use, cached)
 # -------------------------------------------------
-df_lcoe = pd.read_csv(
-    r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_results_complete.csv"
-)
-
-df_lcoe = df_lcoe[
-    df_lcoe["Country"] == COUNTRY
-]
-
-# -------------------------------------------------
-# Load component breakdown data
-# -------------------------------------------------
-df_components = pd.read_csv(
-    r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_breakdowns2.csv"
-)
-
-df_components = df_components[(df_components["Country"] == COUNTRY)] #&(df_components["Year"] == YEAR)]
+def load_data():
+    """
+    (df_lcoe, df_components) for COUNTRY, via the shared cached loader.
+    """
+    return lcoe_results(COUNTRY), lcoe_components(COUNTRY)
 
 def shade_solar_bess_envelope(
     ax,
@@ -103,35 +86,25 @@ def shade_solar_bess_envelope(
     zorder=0,
 ):
     """
-    Shade envelope (min–max) across multiple Solar+BESS curves.
+    Shade envelope (min–max) across multiple Solar+BESS curves
+    (precomputed per grouping by the cached LcoeStore).
     """
 
-    mask = (df["Tech"] == tech) & (df["Year"].isin(years))
-
-    if scenarios is not None:
-        mask &= df["Scenario"].isin(scenarios)
-    else:
-        mask &= df["Scenario"].isin(baseline_scenario)
-
-    sub = df[mask]
+    envelope = lcoe_store(df).envelope(
+        tech,
+        years,
+        scenarios if scenarios is not None else baseline_scenario,
+    )
 
-    if sub.empty:
+    if envelope is None:
         return
 
-    pivot = (
-        sub
-        .pivot_table(
-            index="Availability",
-            values="LCOE",
-            aggfunc=["min", "max"]
-        )
-        .sort_index()
-    )
+    x, y_min, y_max = envelope
 
     ax.fill_between(
-        pivot.index,
-        pivot[("min", "LCOE")],
-        pivot[("max", "LCOE")],
+        x,
+        y_min,
+        y_max,
         color=color,
         alpha=alpha,
         zorder=zorder,
@@ -153,18 +126,7 @@ def shade_fossil_lf_band(
     Shade between fossil LCOEs at multiple load factors.
     """
 
-    ys = []
-    for lf in lfs:
-        y = fossil_lcoe_at_lf(
-            df,
-            tech,
-            year,
-            lf,
-            scenario=scenario,
-        )
-        ys.append(y)
-
-    y_min, y_max = min(ys), max(ys)
+    y_min, y_max = lcoe_store(df).fossil_band(tech, year, lfs, scenario=scenario)
 
     ax.fill_between(
         ax.get_xlim(),
@@ -190,17 +152,19 @@ def render_lcoe(
     ylims,
     y_tick_step=50,
     default_fossil_lf=(0.7,),
+    headless=True,
 ):
     """
     Render a single LCOE chart (static frame).
     Safe for PNG export or animation driver.
+    headless: bare Agg figure (no pyplot window); False for plt.show.
     """
 
     title_raw = TITLE_RAW
     title = mpl_text(title_raw)
     subtitle = COUNTRY
 
-    fig, ax = setup_lcoe_figure(title, subtitle)
+    fig, ax = setup_lcoe_figure(title, subtitle, headless=headless)
 
     draw_lcoe_chart(
         ax=ax,
@@ -219,10 +183,11 @@ def render_lcoe(
 
     return fig, ax
 
-if __name__ == "__main__":
-
+def main(output_path=None):
     print(component_tech_years)
 
+    df_lcoe, df_components = load_data()
+
     fig, ax = render_lcoe(
         df_lcoe=df_lcoe,
         df_components=df_components,
@@ -256,11 +221,11 @@ if __name__ == "__main__":
     # Save
     # -------------------------------------------------
 
-    name = build_chart_name(COUNTRY, line_tech_years)
-
-    output_path = (
-        fr"C:\Users\barna\OneDrive\Documents\Solar_BESS\video charts\{tag}_{name}.png"
-    )
+    if output_path is None:
+        name = build_chart_name(COUNTRY, line_tech_years)
+        output_path = (
+            fr"C:\Users\barna\OneDrive\Documents\Solar_BESS\video charts\{tag}_{name}.png"
+        )
 
     fig.savefig(
         output_path,
@@ -268,5 +233,9 @@ if __name__ == "__main__":
         facecolor=fig.get_facecolor(),
     )
 
-    time.sleep(0.3)
-    os.startfile(output_path)
\ No newline at end of file
+    open_output(output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,73 @@
-COUNTRY = "Spain"
-TITLE_RAW = f"{COUNTRY} in 2015: 70% load factor solar and bess would've been financial madness"
-
-DEFAULT_FOSSIL_LF = [0.7]
-
-TECH_YEARS = [
-    {"tech": "Solar+BESS", "year": 2015},
-    {"tech": "Gas",        "year": 2015},
-]
-
-#==
-COUNTRY = "Spain"
-TITLE_RAW = f"{COUNTRY} in 2025: solar and bess costs have declined fast"
-
-DEFAULT_FOSSIL_LF = [0.7]
-
-TECH_YEARS = [
-    {"tech": "Solar+BESS", "year": 2015},
-    {"tech": "Solar+BESS", "year": 2025},
-    {"tech": "Gas",        "year": 2015},
-]
-
-ylims = (0,400)
-
 # -------------------------------------------------
-# 1 spain
+# Shot list
 # -------------------------------------------------
-COUNTRY = "Spain"
-
-TITLE_RAW = f"Solar and BESS costs have declined 80% in 10 years"
-
-tag = "1.g"
+# One dict per rendered chart; line/batch.py renders them all (or a
+# chosen few by tag), skipping shots whose inputs and output are
+# unchanged since the last run. The same list can live in a YAML file
+# with identical keys (python viz.py shots --file shots.yaml).
+#
+#   tag                   output file prefix (optional)
+#   kind                  "lcoe" (still, default) or "lcoe-zoom" (video)
+#   country, title        title is used as-is (mathtext escaped on render)
+#   subtitle              lcoe: appended to the "Levelised cost ..." line (optional)
+#   line_tech_years       as for draw_lcoe_chart
+#   component_tech_years  stacked component areas (optional)
+#   ylims, y_tick_step    y-axis
+#   default_fossil_lf     load factors for fossil lines without "lf"
+#   year                  cost-breakdown year (lcoe-zoom title / data)
+#   y_start, y_end        lcoe-zoom: y-limits tweened from / to
+#   frames, fps           lcoe-zoom timing
 
-line_tech_years = [
-    #{"tech": "Solar+BESS", "year": 2025, "highlight": True},
-    #{"tech": "Solar+BESS", "year": 2020},
-    {"tech": "Solar+BESS", "year": 2015, "highlight": True},
-    {"tech": "Solar+BESS", "year": 2025, "highlight": True},
-    {"tech": "Gas", "year": 2015, "highlight": True},
-    {"tech": "Gas", "year": 2025, "highlight": True},
-    #{"tech": "Gas", "year": 2015, "highlight": True} #, "label_pos": "above", "label_anchor": "end"}
+SHOTS = [
+    {
+        "country": "Spain",
+        "title": "Spain in 2015: 70% load factor solar and bess would've been financial madness",
+        "subtitle": "Spain",
+        "line_tech_years": [
+            {"tech": "Solar+BESS", "year": 2015},
+            {"tech": "Gas",        "year": 2015},
+        ],
+        "default_fossil_lf": [0.7],
+    },
+    {
+        "country": "Spain",
+        "title": "Spain in 2025: solar and bess costs have declined fast",
+        "subtitle": "Spain",
+        "line_tech_years": [
+            {"tech": "Solar+BESS", "year": 2015},
+            {"tech": "Solar+BESS", "year": 2025},
+            {"tech": "Gas",        "year": 2015},
+        ],
+        "default_fossil_lf": [0.7],
+        "ylims": (0, 400),
+    },
+    {
+        "tag": "1.g",
+        "country": "Spain",
+        "title": "Solar and BESS costs have declined 80% in 10 years",
+        "subtitle": "Spain",
+        "line_tech_years": [
+            #{"tech": "Solar+BESS", "year": 2025, "highlight": True},
+            #{"tech": "Solar+BESS", "year": 2020},
+            {"tech": "Solar+BESS", "year": 2015, "highlight": True},
+            {"tech": "Solar+BESS", "year": 2025, "highlight": True},
+            {"tech": "Gas", "year": 2015, "highlight": True},
+            {"tech": "Gas", "year": 2025, "highlight": True},
+            #{"tech": "Gas", "year": 2015, "highlight": True} #, "label_pos": "above", "label_anchor": "end"}
+        ],
+        "component_tech_years": None,  #[{"tech": "Solar+BESS", "year": 2015}]
+        "ylims": (0, 350),
+    },
+    {
+        "tag": "1.z",
+        "kind": "lcoe-zoom",
+        "country": "Spain",
+        "year": 2015,
+        "line_tech_years": [],
+        "component_tech_years": [{"tech": "Solar+BESS", "year": 2015}],
+        "y_start": (0, 400),
+        "y_end": (0, 200),
+        "frames": 45,
+        "fps": 60,
+    },
 ]
-
-component_tech_years = None #[{"tech": "Solar+BESS", "year": 2015}] # None
-
-LCOE_YLIMS = (0, 350)
-
@@ -1,13 +1,14 @@
-import pandas as pd
-import os
-import time
-import matplotlib.pyplot as plt
+import sys
+from pathlib import Path
 
-from utils import mpl_text
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from line.utils import mpl_text, open_output
+from fonts import font
 from line.style.styling import (
     BACKGROUND,
-    FONT_SEMI_BOLD,
-    FONT_REGULAR,
     DARK_GREY,
     large_font,
     medium_font,
@@ -15,6 +16,8 @@ from line.style.styling import (
 )
 
 from line.structure.lcoe_chart import draw_capacity_cluster_chart
+from line.structure.lcoe_data import lcoe_results
+from export import new_figure
 
 
 # ======================================================
@@ -30,90 +33,91 @@ TECH_YEARS = [
 ylims = (0,100)  # or e.g. (0, 25)
 
 
-# ======================================================
-# Load data
-# ======================================================
-df = pd.read_csv(
-    r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_results.csv"
-)
-df = df[df["Country"] == COUNTRY]
-
-TITLE = mpl_text(TITLE_RAW)
-
+LCOE_CSV = r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_results.csv"
 
-# ======================================================
-# Figure
-# ======================================================
 DPI = 100
-fig = plt.figure(figsize=(1920 / DPI, 1080 / DPI), dpi=DPI)
-fig.patch.set_facecolor(BACKGROUND)
-
-ax = fig.add_subplot(1, 1, 1)
-ax.set_facecolor(BACKGROUND)
-
-fig.subplots_adjust(
-    left=0.08,
-    right=0.92,
-    top=0.82,
-    bottom=0.16,
-)
-
-# ======================================================
-# Draw chart
-# ======================================================
-draw_capacity_cluster_chart(
-    ax=ax,
-    df=df,
-    tech_years=TECH_YEARS,
-    ylims_power=(0, 20),
-    y_tick_step_power=10,
-    ylims_duration=(0, 90),
-    y_tick_step_duration=30,
-    bar_width=0.02,
-    highlight_avail=0.75
-)
 
-# ======================================================
-# Titles & labels
-# ======================================================
-fig.text(
-    0.05, 0.92,
-    TITLE,
-    fontproperties=FONT_SEMI_BOLD,
-    fontsize=large_font,
-    ha="left",
-)
-
-fig.text(
-    0.05, 0.88,
-    "Stacked installed capacities (Solar + BESS)",
-    fontproperties=FONT_REGULAR,
-    fontsize=medium_font,
-    color=DARK_GREY,
-)
-
-ax.set_xlabel(
-    "Load factor",
-    fontproperties=FONT_REGULAR,
-    fontsize=small_font,
-    color=DARK_GREY,
-    labelpad=14,
-)
-
-
-# ======================================================
-# Save & show
-# ======================================================
-output_path = (
-    r"C:\Users\barna\OneDrive\Documents\Solar_BESS\Good charts"
-    r"\capacity_stack_debug.png"
-)
-
-fig.savefig(
-    output_path,
-    dpi=300,
-    facecolor=fig.get_facecolor(),
-)
 
-time.sleep(0.3)
-os.startfile(output_path)
+def main(output_path=None):
+    # ======================================================
+    # Load data
+    # ======================================================
+    df = lcoe_results(COUNTRY, path=LCOE_CSV)
+
+    title = mpl_text(TITLE_RAW)
+
+    # ======================================================
+    # Figure
+    # ======================================================
+    fig = new_figure(headless=True, figsize=(1920 / DPI, 1080 / DPI), dpi=DPI)
+    fig.patch.set_facecolor(BACKGROUND)
+
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set_facecolor(BACKGROUND)
+
+    fig.subplots_adjust(
+        left=0.08,
+        right=0.92,
+        top=0.82,
+        bottom=0.16,
+    )
+
+    # ======================================================
+    # Draw chart
+    # ======================================================
+    draw_capacity_cluster_chart(
+        ax=ax,
+        df=df,
+        tech_years=TECH_YEARS,
+        bar_width=0.02,
+        highlight_avail=0.75
+    )
+
+    # ======================================================
+    # Titles & labels
+    # ======================================================
+    fig.text(
+        0.05, 0.92,
+        title,
+        fontproperties=font("semi"),
+        fontsize=large_font,
+        ha="left",
+    )
+
+    fig.text(
+        0.05, 0.88,
+        "Stacked installed capacities (Solar + BESS)",
+        fontproperties=font("regular"),
+        fontsize=medium_font,
+        color=DARK_GREY,
+    )
+
+    ax.set_xlabel(
+        "Load factor",
+        fontproperties=font("regular"),
+        fontsize=small_font,
+        color=DARK_GREY,
+        labelpad=14,
+    )
+
+    # ======================================================
+    # Save & show
+    # ======================================================
+    if output_path is None:
+        output_path = (
+            r"C:\Users\barna\OneDrive\Documents\Solar_BESS\Good charts"
+            r"\capacity_stack_debug.png"
+        )
+
+    fig.savefig(
+        output_path,
+        dpi=300,
+        facecolor=fig.get_facecolor(),
+    )
+
+    open_output(output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    main()
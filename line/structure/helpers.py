@@ -1,11 +1,14 @@
 import numpy as np
 import pandas as pd
 
+from fonts import font
 from line.style.styling import (
-    FONT_REGULAR, FONT_MEDIUM, FONT_SEMI_BOLD,
     DARK_GREY, CLOUD, BACKGROUND, build_color_lookup, small_font, medium_font, large_font, STACK_COLOURS
 )
-from line.style.config import TECH_RENDER, LABEL_OFFSET_PX, LABEL_HORZ_OFF_PX
+from line.style.config import (
+    TECH_RENDER, LABEL_OFFSET_PX, LABEL_HORZ_OFF_PX, LABEL_X_ANCHORS, LABEL_PAD_PX
+)
+from line.structure.lcoe_data import lcoe_store
 
 def fossil_lcoe_at_lf(
     df,
@@ -13,33 +16,13 @@ def fossil_lcoe_at_lf(
     year,
     lf,
     scenario=None,
+    interpolate=False,
 ):
-    mask = (
-        (df["Tech"] == tech) &
-        (df["Year"] == year) &
-        (df["Availability"] == lf)
-    )
-
-    if scenario is not None:
-        mask &= df["Scenario"] == scenario
-
-    subset = df[mask]
-
-    if subset.empty:
-        raise ValueError(
-            f"No LCOE found for Tech={tech}, Year={year}, "
-            f"Availability={lf}"
-            + (f", Scenario={scenario}" if scenario is not None else "")
-        )
-
-    if len(subset) > 1:
-        raise ValueError(
-            f"Multiple LCOE rows found for Tech={tech}, Year={year}, "
-            f"Availability={lf}"
-            + (f", Scenario={scenario}" if scenario is not None else "")
-        )
-
-    return subset.iloc[0]["LCOE"]
+    """
+    LCOE at load factor lf via the table's LcoeStore (hashed, quantized
+    lf; see LcoeStore.fossil_lcoe). df: DataFrame or LcoeStore.
+    """
+    return lcoe_store(df).fossil_lcoe(tech, year, lf, scenario, interpolate)
 
 def style_y_axis(
     ax,
@@ -48,18 +31,17 @@ def style_y_axis(
     side="left"
 ):
     """
-    Apply standard y-axis styling used across charts.
+    Apply standard y-axis styling used across charts. Returns the
+    gridline collection (see set_y_view).
     """
 
     y_min, y_max = ylims
     ax.set_ylim(y_min, y_max)
 
-    # Generate ticks, then clip strictly to limits
-    y_ticks = np.arange(y_min, y_max + 1e-9, y_tick_step)
-    y_ticks = y_ticks[y_ticks <= y_max]
+    y_ticks = y_axis_ticks(ylims, y_tick_step)
 
     # Gridlines
-    ax.hlines(
+    grid = ax.hlines(
         y_ticks,
         xmin=ax.get_xlim()[0],
         xmax=ax.get_xlim()[1],
@@ -69,18 +51,7 @@ def style_y_axis(
         alpha=0.65
     )
 
-    # Tick labels
-    # Optional: remove zero tick on right axis
-    if side == "right":
-        y_ticks = y_ticks[y_ticks != 0]
-
-    ax.set_yticks(y_ticks)
-    ax.set_yticklabels(
-        [f"{y:g}" for y in y_ticks],
-        fontproperties=FONT_REGULAR,
-        fontsize=small_font,
-        color=DARK_GREY,
-    )
+    _set_y_ticklabels(ax, y_ticks, side)
 
     # Spine + ticks
     ax.spines["top"].set_visible(False)
@@ -107,157 +78,348 @@ def style_y_axis(
 
     ax.tick_params(axis="y", length=0, pad=6)
 
-def curve_label_properties_display(
+    return grid
+
+def y_axis_ticks(ylims, y_tick_step):
+    """
+    Ticks every y_tick_step from ylims[0], clipped strictly to ylims.
+    """
+    y_min, y_max = ylims
+    y_ticks = np.arange(y_min, y_max + 1e-9, y_tick_step)
+    return y_ticks[y_ticks <= y_max]
+
+def _set_y_ticklabels(ax, y_ticks, side):
+    # Optional: remove zero tick on right axis
+    if side == "right":
+        y_ticks = y_ticks[y_ticks != 0]
+
+    ax.set_yticks(y_ticks)
+    ax.set_yticklabels(
+        [f"{y:g}" for y in y_ticks],
+        fontproperties=font("regular"),
+        fontsize=small_font,
+        color=DARK_GREY,
+    )
+
+def set_y_view(
     ax,
-    x,
-    y,
-    x_anchor=0.62,
-    dx=0.05,
-    offset_px=LABEL_OFFSET_PX,
-    label_pos="above"
+    grid,
+    ylims,
+    y_tick_step,
+    side="left"
 ):
+    """
+    Move the y-limits of an axis styled by style_y_axis: its gridline
+    segments and tick labels follow, nothing is re-created.
+    """
+    ax.set_ylim(*ylims)
 
-    x = np.asarray(x)
-    y = np.asarray(y)
+    y_ticks = y_axis_ticks(ylims, y_tick_step)
+    x_min, x_max = ax.get_xlim()
 
-    x1, x2 = x_anchor - dx, x_anchor + dx
-    y1 = np.interp(x1, x, y)
-    y2 = np.interp(x2, x, y)
+    grid.set_segments([[(x_min, y), (x_max, y)] for y in y_ticks])
+    _set_y_ticklabels(ax, y_ticks, side)
 
-    p1 = ax.transData.transform((x1, y1))
-    p2 = ax.transData.transform((x2, y2))
+def draw_component_stack(
+    ax,
+    x,
+    cumulative,
+    colors,
+    **kwargs
+):
+    """
+    Stacked areas from precomputed cumulative tops (as ax.stackplot with
+    a zero baseline, without re-summing). Returns the PolyCollections.
+    """
+    below = 0.0
+    polys = []
 
-    angle = np.degrees(np.arctan2(p2[1] - p1[1], p2[0] - p1[0]))
+    for top, color in zip(cumulative, colors):
+        polys.append(ax.fill_between(x, below, top, facecolor=color, **kwargs))
+        below = top
 
-    y_curve = np.interp(x_anchor, x, y)
-    p_curve = ax.transData.transform((x_anchor, y_curve))
+    if polys:
+        polys[0].sticky_edges.y[:] = [0]
 
-    sign = 1 if label_pos == "above" else -1
-    p_label = p_curve + np.array([0, sign * offset_px])
+    return polys
 
-    return *ax.transData.inverted().transform(p_label), angle
+def lcoe_label_text(tech, year, lf, tech_render, scenario=None):
+    if tech_render[tech] == "curve":
+        label = f"{tech} {year}"
+    else:
+        label = f"{tech} {year} – {int(lf * 100)}% LF"
 
-def draw_lcoe_label(
+    if scenario is not None:
+        label += f" ({scenario})"
+
+    return label
+
+def lcoe_label_layout(
     ax,
     tech,
     year,
     lf,
     df,
-    color,
-    ylims,
     tech_render,
-    label_pos=None,        # allow None
-    label_anchor=None,     # allow None
-    alpha=1,
+    label_pos=None,
+    label_anchor=None,
     scenario=None,
 ):
+    """
+    (x, y, rotation, ha, va) of one line label for the current view, or
+    None if the curve is missing (no collision avoidance).
+    """
+    label = {
+        "tech": tech,
+        "year": year,
+        "lf": lf,
+        "scenario": scenario,
+        "label_pos": label_pos,
+        "label_anchor": label_anchor,
+    }
+    return layout_lcoe_labels(ax, [label], df, tech_render)[0]
+
+def _label_box(px, py, angle, ha, va, width, height, pad):
+    # Corners (4, 2) of a rotated label in display space, padded on every
+    # side. matplotlib rotates about the centre, then aligns the rotated
+    # bounding box by ha / va.
+    rad = np.radians(angle)
+    c, s = np.cos(rad), np.sin(rad)
+    bw, bh = width * abs(c) + height * abs(s), width * abs(s) + height * abs(c)
+
+    cx = {"center": px, "left": px + bw / 2, "right": px - bw / 2}[ha]
+    cy = {"center": py, "bottom": py + bh / 2, "top": py - bh / 2}[va]
+
+    half = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]]) * [width / 2 + pad, height / 2 + pad]
+    return half @ np.array([[c, s], [-s, c]]) + [cx, cy]
+
+def _overlaps(corners, placed):
+    # Separating-axis test of one rotated box against (m, 4, 2) others
+    if not len(placed):
+        return False
+
+    def normals(boxes):
+        edges = boxes[..., [1, 3], :] - boxes[..., [0, 0], :]
+        return edges / np.linalg.norm(edges, axis=-1, keepdims=True)
+
+    axes = np.concatenate(
+        [np.broadcast_to(normals(corners), (len(placed), 2, 2)), normals(placed)],
+        axis=1,
+    )
+    own = np.einsum("mid,kd->mik", axes, corners)
+    other = np.einsum("mid,mkd->mik", axes, placed)
+
+    separated = (own.max(-1) < other.min(-1)) | (other.max(-1) < own.min(-1))
+    return bool(np.any(~separated.any(axis=1)))
+
+def layout_lcoe_labels(
+    ax,
+    labels,
+    df,
+    tech_render,
+    sizes=None,
+    pad_px=LABEL_PAD_PX,
+):
+    """
+    Place a batch of LCOE line labels for the current view.
+
+    labels : dicts with tech, year, lf and optional scenario, label_pos,
+             label_anchor (as normalised line_tech_years entries)
+    sizes  : unrotated (width, height) of each label in pixels; turns on
+             collision avoidance. Labels with label_pos / label_anchor
+             stay where asked; the rest take the first candidate that
+             clears the labels placed before them (curves: each of
+             LABEL_X_ANCHORS above, then below; flat lines: stepped up /
+             down a label height at a time), else their default.
+
+    Returns (x, y, rotation, ha, va) per label in data space, None for a
+    missing curve. Every anchor goes through transData in one call.
+    """
+    store = lcoe_store(df)
+    solve = sizes is not None
+
     # -------------------------
-    # CURVE TECHS
+    # Candidate anchors (data space)
     # -------------------------
-    if tech_render[tech] == "curve":
+    points = []
+    specs = []    # per label: None or (kind, first point, n anchors, options)
+    n_points = 0
+
+    for i, s in enumerate(labels):
+        tech = s["tech"]
+        label_pos, label_anchor = s.get("label_pos"), s.get("label_anchor")
+        pinned = not solve or label_pos is not None or label_anchor is not None
+
+        if tech_render[tech] == "curve":
+            # No scenario → baseline only (see LcoeStore)
+            curve = store.curve(tech, s["year"], s.get("scenario"))
+
+            if curve is None:
+                specs.append(None)
+                continue
 
-        mask = (df["Tech"] == tech) & (df["Year"] == year)
+            x_vals, y_vals = curve
+
+            anchors = np.asarray(LABEL_X_ANCHORS[:1] if pinned else LABEL_X_ANCHORS)
+            sides = (label_pos or "above",) if pinned else ("above", "below")
+
+            # per anchor: slope points either side, then the anchor itself
+            qx = np.concatenate([anchors - 0.05, anchors + 0.05, anchors])
+            points.append(np.column_stack([qx, np.interp(qx, x_vals, y_vals)]))
+
+            specs.append(("curve", n_points, len(anchors), sides))
+            n_points += len(qx)
 
-        if scenario is not None:
-            # Explicit scenario requested
-            mask &= df["Scenario"] == scenario
         else:
-            # No scenario → baseline only
-            mask &= (
-                    df["Scenario"].isna() |
-                    (df["Scenario"] == "") |
-                    (df["Scenario"] == "Base")
+            y = fossil_lcoe_at_lf(
+                store,
+                s["tech"],
+                s["year"],
+                s["lf"],
+                scenario=s.get("scenario"),
             )
 
-        data = df[mask].sort_values("Availability")
+            # ---- defaults for flat lines ----
+            if label_anchor == "start":
+                x, ha, dx = ax.get_xlim()[0], "right", -LABEL_HORZ_OFF_PX
+            else:  # "end"
+                x, ha, dx = ax.get_xlim()[1], "left", LABEL_HORZ_OFF_PX
 
-        if data.empty:
-            return
+            if label_pos == "above":
+                offsets = [(LABEL_OFFSET_PX, "bottom")]
+            elif label_pos == "below":
+                offsets = [(-LABEL_OFFSET_PX, "top")]
+            elif pinned:
+                offsets = [(0, "center")]
+            else:
+                step = sizes[i][1] + pad_px
+                offsets = [(k * step, "center") for k in (0, 1, -1, 2, -2)]
 
-        x_vals = data["Availability"].values
-        y_vals = data["LCOE"].values
+            points.append(np.array([[x, y]]))
+            specs.append(("flat", n_points, 1, (dx, ha, offsets)))
+            n_points += 1
 
-        x, y, angle = curve_label_properties_display(
-            ax,
-            x_vals,
-            y_vals,
-            label_pos=label_pos or "above",
-        )
+    display = ax.transData.transform(np.concatenate(points)) if points else None
 
-        label = f"{tech} {year}"
-        if scenario is not None:
-            label += f" ({scenario})"
-
-        ax.text(
-            x,
-            y,
-            label,
-            fontproperties=FONT_SEMI_BOLD,
-            fontsize=medium_font,
-            color=color,
-            rotation=angle,
-            va="center",
-            ha="center",
-            zorder=4,
-            alpha=alpha,
+    # -------------------------
+    # Candidates (display space), in order of preference
+    # -------------------------
+    candidates = []
+    for spec in specs:
+        if spec is None:
+            candidates.append(None)
+            continue
+
+        kind, start, n, options = spec
+
+        if kind == "curve":
+            p1 = display[start:start + n]
+            p2 = display[start + n:start + 2 * n]
+            p_curve = display[start + 2 * n:start + 3 * n]
+            angles = np.degrees(np.arctan2(p2[:, 1] - p1[:, 1], p2[:, 0] - p1[:, 0]))
+
+            candidates.append([
+                (p_curve[j, 0], p_curve[j, 1] + (1 if side == "above" else -1) * LABEL_OFFSET_PX,
+                 angles[j], "center", "center")
+                for j in range(n)
+                for side in options
+            ])
+
+        else:
+            dx, ha, offsets = options
+            p_line = display[start]
+            candidates.append([
+                (p_line[0] + dx, p_line[1] + dy, 0, ha, va)
+                for dy, va in offsets
+            ])
+
+    # -------------------------
+    # Greedy placement: pinned labels first, then in line order
+    # -------------------------
+    chosen = [c[0] if c else None for c in candidates]
+
+    if solve:
+        fig_w, fig_h = ax.figure.bbox.size
+        placed = np.empty((0, 4, 2))
+
+        pinned_first = sorted(
+            range(len(labels)),
+            key=lambda i: labels[i].get("label_pos") is None and labels[i].get("label_anchor") is None,
         )
 
+        for i in pinned_first:
+            if candidates[i] is None:
+                continue
+
+            boxes = [_label_box(*c, *sizes[i], pad_px) for c in candidates[i]]
+            pick = 0
+
+            for j, corners in enumerate(boxes):
+                inside = np.all((corners >= 0) & (corners <= (fig_w, fig_h)))
+                if inside and not _overlaps(corners, placed):
+                    pick = j
+                    break
+
+            chosen[i] = candidates[i][pick]
+            placed = np.concatenate([placed, boxes[pick][None]])
+
     # -------------------------
-    # FLAT / FOSSIL TECHS
+    # Back to data space, in one call
     # -------------------------
-    else:
-        y = fossil_lcoe_at_lf(
-            df,
-            tech,
-            year,
-            lf,
-            scenario=scenario,
+    placed_idx = [i for i, c in enumerate(chosen) if c is not None]
+    layout = [None] * len(labels)
+
+    if placed_idx:
+        xy = ax.transData.inverted().transform(
+            np.array([chosen[i][:2] for i in placed_idx], dtype=float)
         )
+        for (x, y), i in zip(xy, placed_idx):
+            layout[i] = (x, y, *chosen[i][2:])
 
-        # ---- defaults for flat lines ----
-        label_anchor = label_anchor or "end"
-        label_pos = label_pos or "center"
-
-        # Base x position (data space)
-        if label_anchor == "start":
-            x = ax.get_xlim()[0]
-            ha = "right"
-            dx = -LABEL_HORZ_OFF_PX
-        else:  # "end"
-            x = ax.get_xlim()[1]
-            ha = "left"
-            dx = LABEL_HORZ_OFF_PX
-
-        # Vertical alignment
-        if label_pos == "above":
-            dy = LABEL_OFFSET_PX
-            va = "bottom"
-        elif label_pos == "below":
-            dy = -LABEL_OFFSET_PX
-            va = "top"
-        else:  # "center"
-            dy = 0
-            va = "center"
-
-        # Transform using display space
-        p_line = ax.transData.transform((x, y))
-        p_label = p_line + np.array([dx, dy])
-        x_lab, y_lab = ax.transData.inverted().transform(p_label)
+    return layout
 
-        label = f"{tech} {year} – {int(lf * 100)}% LF"
-        if scenario is not None:
-            label += f" ({scenario})"
-
-        ax.text(
-            x_lab,
-            y_lab,
-            label,
-            fontproperties=FONT_SEMI_BOLD,
-            fontsize=medium_font,
-            color=color,
-            rotation=0,
-            va=va,
-            ha=ha,
-            zorder=4,
-            alpha=alpha,
-        )
\ No newline at end of file
+def draw_lcoe_label(
+    ax,
+    tech,
+    year,
+    lf,
+    df,
+    color,
+    ylims,
+    tech_render,
+    label_pos=None,        # allow None
+    label_anchor=None,     # allow None
+    alpha=1,
+    scenario=None,
+    place=True,
+):
+    """
+    Label one LCOE line; returns the Text (None if the curve is missing).
+    place=False skips the layout and leaves the Text for the caller to
+    position (LcoeChart lays all its labels out together).
+    """
+    if place:
+        layout = lcoe_label_layout(
+            ax, tech, year, lf, df, tech_render, label_pos, label_anchor, scenario
+        )
+
+        if layout is None:
+            return None
+    else:
+        layout = (0, 0, 0, "center", "center")
+
+    x, y, rotation, ha, va = layout
+
+    return ax.text(
+        x,
+        y,
+        lcoe_label_text(tech, year, lf, tech_render, scenario),
+        fontproperties=font("semi"),
+        fontsize=medium_font,
+        color=color,
+        rotation=rotation,
+        va=va,
+        ha=ha,
+        zorder=4,
+        alpha=alpha,
+    )
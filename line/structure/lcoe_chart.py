@@ -9,6 +9,17 @@ if str(ROOT) not in sys.path:
 
 from line.structure.helpers import *
 
+import matplotlib.colors as mcolors
+from matplotlib.collections import PolyCollection
+import matplotlib.dates as mdates
+
+from draft import draft_index
+from fonts import font
+from line.structure.lcoe_data import lcoe_store, component_store
+
+# Label layouts kept per LcoeChart (one per distinct view)
+LAYOUT_CACHE_SIZE = 64
+
 # ===============================================================
 # Main chart function
 # ===============================================================
@@ -27,6 +38,7 @@ def draw_lcoe_chart(
     component_colors=None,
     area_alpha=0.9,
     right_axis=False,
+    draft=False,
 ):
     """
     Draw LCOE vs load factor chart.
@@ -34,170 +46,315 @@ def draw_lcoe_chart(
     Lines and component areas are driven independently:
     - line_tech_years: which tech-years get curves / lines + labels
     - component_tech_years: which tech-years get stacked component areas
+    - draft: thinned curves / areas, no antialiasing (see draft.py)
+    - df: LCOE DataFrame or LcoeStore; curves come from its store
+
+    Returns the LcoeChart, for cheap view changes after the first draw.
     """
+    return LcoeChart(
+        ax,
+        df,
+        line_tech_years,
+        default_fossil_lf,
+        tech_render,
+        tech_label_mode,
+        ylims=ylims,
+        y_tick_step=y_tick_step,
+        component_df=component_df,
+        component_tech_years=component_tech_years,
+        component_order=component_order,
+        component_colors=component_colors,
+        area_alpha=area_alpha,
+        right_axis=right_axis,
+        draft=draft,
+    )
 
-    # -------------------------------------------------
-    # Axis setup
-    # -------------------------------------------------
-    ax.set_facecolor(BACKGROUND)
-    ax.set_xlim(0.05, 1.0)
-    ax.margins(x=0)
 
-    style_y_axis(ax, ylims, y_tick_step, "right" if right_axis else "left")
+class LcoeChart:
+    """
+    LCOE vs load factor chart (see draw_lcoe_chart) whose artists are
+    built once. set_ylim, set_visible_tech_years and set_highlight then
+    only move gridlines, tick labels and line labels or restyle existing
+    artists, so zoom / highlight animations never clear the axes.
+
+    Line labels are laid out together (helpers.layout_lcoe_labels) so
+    they avoid each other; layouts are cached per view (ylims, figure
+    and axes size, visible lines), so repeated frames reuse them.
+    """
 
-    # -------------------------------------------------
-    # Draw COMPONENT AREAS (independent of lines)
-    # -------------------------------------------------
-    if component_df is not None and component_tech_years:
-        for s in component_tech_years:
-            tech, year = s["tech"], s["year"]
-
-            comp = component_df[
-                (component_df["Tech"] == tech) &
-                (component_df["Year"] == year) &
-                (component_df["Component"] != "Total")
-            ]
-
-            if comp.empty:
-                continue
-
-            pivot = (
-                comp
-                .pivot(
-                    index="Availability",
-                    columns="Component",
-                    values="Value"
+    def __init__(
+        self,
+        ax,
+        df,
+        line_tech_years,
+        default_fossil_lf,
+        tech_render,
+        tech_label_mode,
+        ylims=(0, 160),
+        y_tick_step=20,
+        component_df=None,
+        component_tech_years=None,
+        component_order=None,
+        component_colors=None,
+        area_alpha=0.9,
+        right_axis=False,
+        draft=False,
+    ):
+        store = lcoe_store(df)
+
+        self.ax = ax
+        self.store = store
+        self.tech_render = tech_render
+        self.ylims = tuple(ylims)
+        self.y_tick_step = y_tick_step
+        self.side = "right" if right_axis else "left"
+        self._layouts = {}
+
+        # -------------------------------------------------
+        # Axis setup
+        # -------------------------------------------------
+        ax.set_facecolor(BACKGROUND)
+        ax.set_xlim(0.05, 1.0)
+        ax.margins(x=0)
+
+        self.grid = style_y_axis(ax, ylims, y_tick_step, self.side)
+
+        # -------------------------------------------------
+        # Draw COMPONENT AREAS (independent of lines)
+        # -------------------------------------------------
+        # (tech, year): PolyCollections
+        self.areas = {}
+
+        if component_df is not None and component_tech_years:
+            components = component_store(component_df)
+
+            for s in component_tech_years:
+                stack = components.stack(s["tech"], s["year"], component_order)
+
+                if stack is None:
+                    continue
+
+                x, order, cumulative = stack
+
+                if draft:
+                    idx = draft_index(len(x))
+                    x, cumulative = x[idx], cumulative[:, idx]
+
+                if component_colors is None:
+                    raise ValueError(
+                        "component_colors must be provided when component_df is used"
+                    )
+
+                self.areas[(s["tech"], s["year"])] = draw_component_stack(
+                    ax,
+                    x,
+                    cumulative,
+                    [component_colors[c] for c in order],
+                    alpha=area_alpha,
+                    zorder=1,
+                    antialiased=not draft,
                 )
-                .sort_index()
-            )
 
-            order = component_order or pivot.columns.tolist()
+        # -------------------------------------------------
+        # Normalise LINE tech-years
+        # -------------------------------------------------
+        normalised = []
+        for s in line_tech_years:
+            tech, year, scenario = s["tech"], s["year"], s.get("scenario")
+
+            if tech in ["Gas", "Coal"]:
+                lfs = s.get("lf", default_fossil_lf)
+                for lf in lfs:
+                    entry = s.copy()
+                    entry["lf"] = lf
+                    entry["scenario"] = scenario
+                    normalised.append(entry)
+            else:
+                entry = s.copy()
+                entry["lf"] = None
+                entry["scenario"] = scenario
+                normalised.append(entry)
 
-            if component_colors is None:
-                raise ValueError(
-                    "component_colors must be provided when component_df is used"
-                )
+        color_lookup = build_color_lookup(line_tech_years)
 
-            ax.stackplot(
-                pivot.index,
-                [pivot[c] for c in order],
-                colors=[component_colors[c] for c in order],
-                alpha=area_alpha,
-                zorder=1,
-            )
+        # -------------------------------------------------
+        # Draw LINES + LABELS
+        # -------------------------------------------------
+        # one entry per drawn line: its spec plus "line" / "label" artists
+        self.lines = []
 
-    # -------------------------------------------------
-    # Normalise LINE tech-years
-    # -------------------------------------------------
-    normalised = []
-    for s in line_tech_years:
-        tech, year, scenario = s["tech"], s["year"], s.get("scenario")
+        highlight_mode = any(s.get("highlight", False) for s in line_tech_years)
+        for s in normalised:
+            tech, year, lf = s["tech"], s["year"], s["lf"]
+            color = color_lookup[(tech, year)]
 
-        if tech in ["Gas", "Coal"]:
-            lfs = s.get("lf", default_fossil_lf)
-            for lf in lfs:
-                entry = s.copy()
-                entry["lf"] = lf
-                entry["scenario"] = scenario
-                normalised.append(entry)
-        else:
-            entry = s.copy()
-            entry["lf"] = None
-            entry["scenario"] = scenario
-            normalised.append(entry)
+            is_highlight = s.get("highlight", False)
+            alpha = 1.0 if (not highlight_mode or is_highlight) else OTHER_LINE_ALPHA
 
-    color_lookup = build_color_lookup(line_tech_years)
+            # -------- curve techs --------
+            if tech_render.get(tech) == "curve":
+                # No scenario → baseline only (see LcoeStore)
+                curve = store.curve(tech, year, s.get("scenario"))
 
-    # -------------------------------------------------
-    # Draw LINES + LABELS
-    # -------------------------------------------------
-    highlight_mode = any(s.get("highlight", False) for s in line_tech_years)
-    for s in normalised:
-        label_pos = s.get("label_pos")  # None if not provided
-        label_anchor = s.get("label_anchor")  # None if not provided
+                if curve is None:
+                    continue
 
-        tech, year, lf = s["tech"], s["year"], s["lf"]
-        color = color_lookup[(tech, year)]
+                x_vals, y_vals = curve
 
-        is_highlight = s.get("highlight", False)
-        alpha = 1.0 if (not highlight_mode or is_highlight) else OTHER_LINE_ALPHA
+                if draft:
+                    idx = draft_index(len(x_vals))
+                    x_vals, y_vals = x_vals[idx], y_vals[idx]
 
-        # -------- curve techs --------
-        if tech_render.get(tech) == "curve":
-            mask = (df["Tech"] == tech) & (df["Year"] == year)
+                (line,) = ax.plot(
+                    x_vals,
+                    y_vals,
+                    lw=LINE_WEIGHT,
+                    color=color,
+                    zorder=3,
+                    alpha=alpha,
+                    antialiased=not draft,
+                )
 
-            if s.get("scenario") is not None:
-                # Explicit scenario requested
-                mask &= df["Scenario"] == s["scenario"]
+            # -------- fossil techs --------
             else:
-                # No scenario → baseline only
-                mask &= (
-                        df["Scenario"].isna() |
-                        (df["Scenario"] == "") |
-                        (df["Scenario"] == "Base")
+                y = fossil_lcoe_at_lf(
+                    store,
+                    tech,
+                    year,
+                    lf,
+                    scenario=s.get("scenario"),
                 )
 
-            data = df[mask].sort_values("Availability")
-
-            if data.empty:
-                continue
+                line = ax.hlines(
+                    y,
+                    *ax.get_xlim(),
+                    lw=LINE_WEIGHT,
+                    color=color,
+                    linestyles=(0, (1.2, 1.5)),
+                    zorder=2,
+                    alpha=alpha,
+                    antialiased=not draft,
+                )
 
-            ax.plot(
-                data["Availability"].values,
-                data["LCOE"].values,
-                lw=LINE_WEIGHT,
+            label = draw_lcoe_label(
+                ax=ax,
+                tech=tech,
+                year=year,
+                lf=lf,
+                df=store,
                 color=color,
-                zorder=3,
+                ylims=ylims,
+                tech_render=tech_render,
+                label_pos=s.get("label_pos"),  # None if not provided
+                label_anchor=s.get("label_anchor"),  # None if not provided
                 alpha=alpha,
+                scenario=s.get("scenario"),  # ← ADD THIS
+                place=False,
             )
 
-        # -------- fossil techs --------
-        else:
-            y = fossil_lcoe_at_lf(
-                df,
-                tech,
-                year,
-                lf,
-                scenario=s.get("scenario"),
-            )
+            self.lines.append({**s, "line": line, "label": label})
 
-            ax.hlines(
-                y,
-                *ax.get_xlim(),
-                lw=LINE_WEIGHT,
-                color=color,
-                linestyles=(0, (1.2, 1.5)),
-                zorder=2,
-                alpha=alpha,
-            )
-
-        draw_lcoe_label(
-            ax=ax,
-            tech=tech,
-            year=year,
-            lf=lf,
-            df=df,
-            color=color,
-            ylims=ylims,
-            tech_render=tech_render,
-            label_pos=label_pos,
-            label_anchor=label_anchor,
-            alpha=alpha,
-            scenario=s.get("scenario"),  # ← ADD THIS
+        # -------------------------------------------------
+        # X-axis styling
+        # -------------------------------------------------
+        ax.set_xticks(np.arange(0.1, 1.01, 0.1))
+        ax.set_xticklabels(
+            [f"{int(t * 100)}%" for t in ax.get_xticks()],
+            fontproperties=font("regular"),
+            fontsize=small_font,
+            color=DARK_GREY,
         )
 
+        ax.spines["left"].set_visible(False)
+
+        # dpi: label sizes in pixels (unrotated), for collision avoidance
+        self._sizes = {}
+        self._place_labels()
+
     # -------------------------------------------------
-    # X-axis styling
+    # View-state updates
     # -------------------------------------------------
-    ax.set_xticks(np.arange(0.1, 1.01, 0.1))
-    ax.set_xticklabels(
-        [f"{int(t * 100)}%" for t in ax.get_xticks()],
-        fontproperties=FONT_REGULAR,
-        fontsize=small_font,
-        color=DARK_GREY,
-    )
+    def set_ylim(self, ylims):
+        """
+        Move the y-limits: gridlines, tick labels and line labels follow.
+        """
+        self.ylims = tuple(ylims)
+        set_y_view(self.ax, self.grid, self.ylims, self.y_tick_step, self.side)
+        self._place_labels()
+
+    def set_visible_tech_years(self, tech_years=None):
+        """
+        Show only the lines (and labels) of these tech-years; None shows
+        every line. Component areas are unaffected.
+        """
+        keys = None if tech_years is None else {(s["tech"], s["year"]) for s in tech_years}
+
+        for s in self.lines:
+            visible = keys is None or (s["tech"], s["year"]) in keys
+            s["line"].set_visible(visible)
+            s["label"].set_visible(visible)
+
+        self._place_labels()
+
+    def set_highlight(self, tech_years=None):
+        """
+        Highlight these tech-years and fade the other lines to
+        OTHER_LINE_ALPHA; None or [] shows every line at full alpha.
+        """
+        keys = {(s["tech"], s["year"]) for s in tech_years or []}
+
+        for s in self.lines:
+            alpha = 1.0 if not keys or (s["tech"], s["year"]) in keys else OTHER_LINE_ALPHA
+            s["line"].set_alpha(alpha)
+            s["label"].set_alpha(alpha)
+
+    def _place_labels(self):
+        # Label offsets are in pixels, so data positions move with the view
+        visible = [i for i, s in enumerate(self.lines) if s["label"].get_visible()]
+
+        dpi = self.ax.figure.dpi
+
+        key = (
+            self.ylims,
+            dpi,
+            tuple(self.ax.figure.bbox.size),
+            self.ax.get_position().bounds,
+            tuple(visible),
+        )
 
-    ax.spines["left"].set_visible(False)
+        if key not in self._layouts:
+            if len(self._layouts) >= LAYOUT_CACHE_SIZE:
+                self._layouts.pop(next(iter(self._layouts)))
+
+            # text extents scale with dpi: measured once per dpi
+            if dpi not in self._sizes:
+                self._sizes[dpi] = [_text_size(s["label"]) for s in self.lines]
+
+            self._layouts[key] = layout_lcoe_labels(
+                self.ax,
+                [self.lines[i] for i in visible],
+                self.store,
+                self.tech_render,
+                sizes=[self._sizes[dpi][i] for i in visible],
+            )
+
+        for i, (x, y, rotation, ha, va) in zip(visible, self._layouts[key]):
+            label = self.lines[i]["label"]
+            label.set_position((x, y))
+            label.set_rotation(rotation)
+            label.set_horizontalalignment(ha)
+            label.set_verticalalignment(va)
+
+
+def _text_size(text):
+    """
+    Unrotated (width, height) of a Text in display pixels.
+    """
+    rotation = text.get_rotation()
+    text.set_rotation(0)
+    bbox = text.get_window_extent()
+    text.set_rotation(rotation)
+    return bbox.width, bbox.height
 
 def draw_capacity_stack_chart(
     ax,
@@ -286,11 +443,43 @@ def draw_capacity_stack_chart(
     ax.set_xticks(np.arange(0.1, 1.01, 0.1))
     ax.set_xticklabels(
         [f"{int(t * 100)}%" for t in ax.get_xticks()],
-        fontproperties=FONT_REGULAR,
+        fontproperties=font("regular"),
         fontsize=small_font,
         color=DARK_GREY,
     )
 
+def bar_verts(x, height, width, bottom=0.0):
+    """
+    (n, 4, 2) corners of centred bars, for a PolyCollection.
+    """
+    x0 = np.asarray(x) - width / 2
+    x1 = x0 + width
+    y0 = np.broadcast_to(bottom, np.shape(x))
+    y1 = y0 + height
+
+    return np.stack([
+        np.column_stack([x0, y0]),
+        np.column_stack([x0, y1]),
+        np.column_stack([x1, y1]),
+        np.column_stack([x1, y0]),
+    ], axis=1)
+
+def _bar_collection(ax, zorder=3):
+    # One PolyCollection per bar series (not a Rectangle per bar); verts
+    # and colours are set by the owner
+    bars = PolyCollection([], edgecolors="none", zorder=zorder)
+    bars.sticky_edges.y.append(0)
+    ax.add_collection(bars, autolim=False)
+    return bars
+
+def _rgba(color, alpha):
+    """
+    (n, 4) RGBA array of one colour with per-element alpha.
+    """
+    rgba = np.tile(mcolors.to_rgba(color), (len(alpha), 1))
+    rgba[:, 3] = alpha
+    return rgba
+
 def draw_capacity_cluster_chart(
     ax,
     df,
@@ -310,41 +499,43 @@ def draw_capacity_cluster_chart(
     - Left axis: stacked Solar + BESS power (MW) [axis hidden]
     - Right axis: duration proxy (h) via fixed ratio [axis hidden]
     - X-axis unchanged
-    """
+    - tech_years: one bar series each; an optional "scenario" picks the
+      curve (baseline when omitted), ValueError if there is none
 
-    ax.cla()
+    Returns the CapacityClusterChart, for cheap per-frame updates.
+    """
+    return CapacityClusterChart(
+        ax,
+        df,
+        tech_years,
+        max_avail=max_avail,
+        duration_power_ratio=duration_power_ratio,
+        bar_width=bar_width,
+        highlight_avail=highlight_avail,
+        colors=colors,
+        ref_xline_label=ref_xline_label,
+    )
 
-    # Remove any existing twin axes
-    for other_ax in ax.figure.axes:
-        if other_ax is not ax and other_ax.get_shared_x_axes().joined(ax, other_ax):
-            other_ax.remove()
 
-    # -------------------------------------------------
-    # Base styling
-    # -------------------------------------------------
-    ax.set_facecolor(BACKGROUND)
-    ax.margins(x=0)
-
-    ax_power = ax
-    ax_duration = ax.twinx()
-    ax_duration.patch.set_alpha(0)
+class CapacityClusterChart:
+    """
+    Clustered capacity chart (see draw_capacity_cluster_chart) built
+    once: both axes, one bar collection per series and tech-year, the
+    reference line and the highlight marker. update() only re-sets bar
+    heights and alphas (reveal + highlight), the y-scale and the
+    highlight line / label, so availability sweeps never clear the axes
+    or re-create the twin.
+    """
 
-    # Hide vertical + top spines, keep bottom (x-axis line)
-    for spine in ["top", "right", "left"]:
-        ax_power.spines[spine].set_visible(False)
-        ax_duration.spines[spine].set_visible(False)
+    FADE_ALPHA = 0.25
+    FULL_ALPHA = 1.0
 
-    # Explicitly keep bottom spine visible
-    ax_power.spines["bottom"].set_visible(True)
-    ax_power.spines["bottom"].set_color(DARK_GREY)
-    ax_power.spines["bottom"].set_linewidth(0.8)
+    # Dimmed duration bars used to be drawn twice at FADE_ALPHA * 0.6;
+    # one bar at the composited alpha keeps that look
+    DURATION_FADE_ALPHA = 1 - (1 - FADE_ALPHA * 0.6) ** 2
 
-    # Kill y ticks explicitly (belt + braces)
-    ax_power.set_yticks([])
-    ax_duration.set_yticks([])
-    # -------------------------------------------------
-    # Colours
-    # -------------------------------------------------
+    REF_POWER_MW = 1.0
+    LABEL_PAD = 0.9
 
     DEFAULT_COLORS = {
         "Solar": "#FDB813",
@@ -352,127 +543,108 @@ def draw_capacity_cluster_chart(
         "BESS Energy": "#4C72B0",
     }
 
-    if colors is None:
-        colors = DEFAULT_COLORS
-
-    COLOR_SOLAR = colors["Solar"]
-    COLOR_BESS_P = colors["BESS Power"]
-    COLOR_DURATION = colors["BESS Energy"]
-
-    FADE_ALPHA = 0.25
-    FULL_ALPHA = 1.0
-
-    # -------------------------------------------------
-    # Normalise tech-years
-    # -------------------------------------------------
-    normalised = [{"tech": s["tech"], "year": s["year"]} for s in tech_years]
-
-    highlight_x = None
-    max_power_seen = 0.0
-
-    # -------------------------------------------------
-    # Plot bars
-    # -------------------------------------------------
-    for s in normalised:
-        tech, year = s["tech"], s["year"]
-
-        data = df[(df["Tech"] == tech) & (df["Year"] == year)].copy()
-
-        if max_avail is not None:
-            data = data[data["Availability"] <= max_avail]
-
-        data = data.sort_values("Availability")
-
-        x = data["Availability"].values
-        offset = bar_width / 2
-
-        solar_mw = data["Solar_Capacity_MW"].values
-        bess_power_mw = data["BESS_Power_MW"].values
-        duration_h = data["BESS_Energy_MWh"].values
-
-        for xi, smw, bpmw, dh in zip(x, solar_mw, bess_power_mw, duration_h):
-
-            is_highlight = highlight_avail is not None and np.isclose(xi, highlight_avail)
-            is_dimmed = highlight_avail is not None and not is_highlight
-
-            power_alpha = FULL_ALPHA if not is_dimmed else FADE_ALPHA
-            duration_alpha = FULL_ALPHA if not is_dimmed else FADE_ALPHA * 0.6
-
-            if is_highlight:
-                highlight_x = xi
-
-            total_power = smw + bpmw
-            max_power_seen = max(max_power_seen, total_power)
-
-            # --- Power (stacked) ---
-            # --- Power (stacked) ---
-            ax_power.bar(
-                xi - offset,
-                smw,
-                width=bar_width,
-                color=COLOR_SOLAR,
-                alpha=power_alpha,
-                zorder=3,
-            )
-
-            ax_power.bar(
-                xi - offset,
-                bpmw,
-                bottom=smw,
-                width=bar_width,
-                color=COLOR_BESS_P,
-                alpha=power_alpha,
-                zorder=3,
-            )
-
-            # --- Duration ---
-            ax_duration.bar(
-                xi + offset,
-                dh,
-                width=bar_width,
-                color=COLOR_DURATION,
-                alpha=duration_alpha,
-                zorder=3,
-            )
-
-            # --- Duration ---
-            ax_duration.bar(
-                xi + offset,
-                dh,
-                width=bar_width,
-                color=COLOR_DURATION,
-                alpha=duration_alpha,
-                zorder=3,
-            )
-
-    # -------------------------------------------------
-    # Axis scaling (invisible)
-    # -------------------------------------------------
-    ax_power.set_ylim(0, max_power_seen * 1.75)
-    ax_duration.set_ylim(0, max_power_seen * 1.75 * duration_power_ratio)
-
-    REF_POWER_MW = 1.0
-
-    # --- Reference system lines ---
-    ax_power.axhline(
-        REF_POWER_MW,
-        color=DARK_GREY,
-        lw=1.2,
-        linestyle=(0, (2, 2)),
-        alpha=0.8,
-        zorder=2,
-    )
+    def __init__(
+        self,
+        ax,
+        df,
+        tech_years,
+        max_avail=None,
+        duration_power_ratio=4.0,
+        bar_width=0.025,
+        highlight_avail=None,
+        colors=None,
+        ref_xline_label=False,
+    ):
+        ax.cla()
+
+        # Remove any existing twin axes
+        for other_ax in ax.figure.axes:
+            if other_ax is not ax and other_ax.get_shared_x_axes().joined(ax, other_ax):
+                other_ax.remove()
+
+        self.duration_power_ratio = duration_power_ratio
+        self.bar_width = bar_width
+
+        # -------------------------------------------------
+        # Base styling
+        # -------------------------------------------------
+        ax.set_facecolor(BACKGROUND)
+        ax.margins(x=0)
+
+        ax_power = ax
+        ax_duration = ax.twinx()
+        ax_duration.patch.set_alpha(0)
+
+        self.ax_power, self.ax_duration = ax_power, ax_duration
+
+        # Hide vertical + top spines, keep bottom (x-axis line)
+        for spine in ["top", "right", "left"]:
+            ax_power.spines[spine].set_visible(False)
+            ax_duration.spines[spine].set_visible(False)
+
+        # Explicitly keep bottom spine visible
+        ax_power.spines["bottom"].set_visible(True)
+        ax_power.spines["bottom"].set_color(DARK_GREY)
+        ax_power.spines["bottom"].set_linewidth(0.8)
+
+        # Kill y ticks explicitly (belt + braces)
+        ax_power.set_yticks([])
+        ax_duration.set_yticks([])
+
+        # -------------------------------------------------
+        # Colours
+        # -------------------------------------------------
+        colors = colors or self.DEFAULT_COLORS
+
+        self.color_solar = colors["Solar"]
+        self.color_bess_p = colors["BESS Power"]
+        self.color_duration = colors["BESS Energy"]
+
+        # -------------------------------------------------
+        # Bar series (filled in by update)
+        # -------------------------------------------------
+        store = lcoe_store(df)
+        self.series = []
+
+        for s in tech_years:
+            # No scenario → baseline only (see LcoeStore)
+            group = store.group(s["tech"], s["year"], s.get("scenario"))
+
+            if group is None:
+                raise ValueError(
+                    f"No capacity rows for Tech={s['tech']}, Year={s['year']}"
+                    + (f", Scenario={s['scenario']}" if s.get("scenario") is not None else "")
+                )
 
-    x_left = ax_power.get_xlim()[0]
+            self.series.append({
+                "x": group["Availability"],
+                "solar": group["Solar_Capacity_MW"],
+                "bess_power": group["BESS_Power_MW"],
+                "duration": group["BESS_Energy_MWh"],
+                "bars": (
+                    _bar_collection(ax_power),
+                    _bar_collection(ax_power),
+                    _bar_collection(ax_duration),
+                ),
+            })
+
+        # --- Reference system line ---
+        ax_power.axhline(
+            self.REF_POWER_MW,
+            color=DARK_GREY,
+            lw=1.2,
+            linestyle=(0, (2, 2)),
+            alpha=0.8,
+            zorder=2,
+        )
 
-    if ref_xline_label:
-        ax_power.text(
-            x_left,
-            REF_POWER_MW,
-            f"{REF_POWER_MW} MW/{REF_POWER_MW*duration_power_ratio} MWh",
+        self.ref_label = ax_power.text(
+            0,
+            self.REF_POWER_MW,
+            f"{self.REF_POWER_MW} MW/{self.REF_POWER_MW*duration_power_ratio} MWh",
             ha="left",
             va="bottom",
-            fontproperties=FONT_SEMI_BOLD,
+            fontproperties=font("semi"),
             fontsize=small_font,
             color=DARK_GREY,
             zorder=5,
@@ -485,45 +657,175 @@ def draw_capacity_cluster_chart(
             ),
         )
 
-    # -------------------------------------------------
-    # X-axis (unchanged)
-    # -------------------------------------------------
-    ax_power.set_xticks(np.arange(0.1, 1.01, 0.1))
-    ax_power.set_xticklabels(
-        [f"{int(t * 100)}%" for t in ax_power.get_xticks()],
-        fontproperties=FONT_REGULAR,
-        fontsize=small_font,
-        color=DARK_GREY,
-    )
+        # -------------------------------------------------
+        # X-axis (unchanged)
+        # -------------------------------------------------
+        self.xticks = np.arange(0.1, 1.01, 0.1)
 
-    label_pad = 0.9
+        ax_power.set_xticks(self.xticks)
+        ax_power.set_xticklabels(
+            [f"{int(t * 100)}%" for t in ax_power.get_xticks()],
+            fontproperties=font("regular"),
+            fontsize=small_font,
+            color=DARK_GREY,
+        )
 
-    # -------------------------------------------------
-    # Highlight annotation (optional)
-    # -------------------------------------------------
-    if highlight_x is not None:
-        ax_power.axvline(
-            highlight_x,
+        # -------------------------------------------------
+        # Highlight annotation (shown when highlighting)
+        # -------------------------------------------------
+        self.highlight_line = ax_power.axvline(
+            0,
             ymin=0.0,
-            ymax=label_pad,
+            ymax=self.LABEL_PAD,
             color=DARK_GREY,
             linestyle=(0, (1.5, 2.5)),
             linewidth=1.2,
             zorder=4,
         )
 
-        ax_power.text(
-            highlight_x,
-            ax_power.get_ylim()[1]*label_pad-0.05,
-            f"{int(highlight_x * 100)}%",
+        self.highlight_label = ax_power.text(
+            0,
+            0,
+            "",
             ha="center",
             va="bottom",
-            fontproperties=FONT_SEMI_BOLD,
+            fontproperties=font("semi"),
             fontsize=small_font,
             color=DARK_GREY,
             zorder=5,
         )
 
+        self.update(max_avail, highlight_avail, ref_xline_label)
+
+    def update(self, max_avail=None, highlight_avail=None, ref_xline_label=False):
+        """
+        Show availabilities <= max_avail (all if None), highlighting
+        highlight_avail and fading the rest.
+
+        Between availability levels (tweened sweeps) the next bar grows
+        with the share of its step covered, and the highlight blends
+        across the two neighbouring bars.
+        """
+        offset = self.bar_width / 2
+
+        highlight_x = None
+        max_power_seen = 0.0
+        x_lo, x_hi = np.inf, -np.inf
+
+        for s in self.series:
+            keep = np.ones(len(s["x"]), dtype=bool) if max_avail is None else s["x"] <= max_avail
+            grow = np.ones(keep.sum())
+
+            # partly swept-in next level
+            n_full = len(grow)
+            if 0 < n_full < len(keep):
+                x_prev, x_next = s["x"][n_full - 1], s["x"][n_full]
+                frac = (max_avail - x_prev) / (x_next - x_prev)
+                if frac > 1e-9:
+                    keep[n_full] = True
+                    grow = np.append(grow, frac)
+
+            x = s["x"][keep]
+            solar_mw = s["solar"][keep] * grow
+            bess_power_mw = s["bess_power"][keep] * grow
+            duration_h = s["duration"][keep] * grow
+
+            weight, series_highlight_x = self._highlight_weights(x, highlight_avail)
+            if series_highlight_x is not None:
+                highlight_x = series_highlight_x
+
+            power_alpha = np.where(
+                weight == 1,
+                self.FULL_ALPHA,
+                self.FADE_ALPHA + (self.FULL_ALPHA - self.FADE_ALPHA) * weight,
+            )
+            duration_alpha = np.where(
+                weight == 1,
+                self.FULL_ALPHA,
+                self.DURATION_FADE_ALPHA + (self.FULL_ALPHA - self.DURATION_FADE_ALPHA) * weight,
+            )
+
+            solar_bars, bess_bars, duration_bars = s["bars"]
+
+            # --- Power (stacked) ---
+            solar_bars.set_verts(bar_verts(x - offset, solar_mw, self.bar_width))
+            solar_bars.set_facecolor(_rgba(self.color_solar, power_alpha))
+
+            bess_bars.set_verts(bar_verts(x - offset, bess_power_mw, self.bar_width, bottom=solar_mw))
+            bess_bars.set_facecolor(_rgba(self.color_bess_p, power_alpha))
+
+            # --- Duration ---
+            duration_bars.set_verts(bar_verts(x + offset, duration_h, self.bar_width))
+            duration_bars.set_facecolor(_rgba(self.color_duration, duration_alpha))
+
+            if len(x):
+                max_power_seen = max(max_power_seen, (solar_mw + bess_power_mw).max())
+                x_lo = min(x_lo, x[0] - self.bar_width)
+                x_hi = max(x_hi, x[-1] + self.bar_width)
+
+        # -------------------------------------------------
+        # Axis scaling (invisible)
+        # -------------------------------------------------
+        self.ax_power.set_ylim(0, max_power_seen * 1.75)
+        self.ax_duration.set_ylim(0, max_power_seen * 1.75 * self.duration_power_ratio)
+
+        # x fits the visible bars, widened to the fixed ticks; the
+        # reference label sits at the bars' left edge
+        if x_lo > x_hi:
+            x_lo, x_hi = self.xticks[0], self.xticks[-1]
+
+        self.ax_power.set_xlim(min(x_lo, self.xticks[0]), max(x_hi, self.xticks[-1]))
+
+        self.ref_label.set_x(x_lo)
+        self.ref_label.set_visible(bool(ref_xline_label))
+
+        # -------------------------------------------------
+        # Highlight annotation
+        # -------------------------------------------------
+        self.highlight_line.set_visible(highlight_x is not None)
+        self.highlight_label.set_visible(highlight_x is not None)
+
+        if highlight_x is not None:
+            self.highlight_line.set_xdata([highlight_x, highlight_x])
+
+            self.highlight_label.set_position(
+                (highlight_x, self.ax_power.get_ylim()[1]*self.LABEL_PAD-0.05)
+            )
+            self.highlight_label.set_text(f"{int(highlight_x * 100)}%")
+
+    @staticmethod
+    def _highlight_weights(x, highlight_avail):
+        """
+        (per-bar weight, marker x): weight 1 is full alpha, 0 faded. On
+        a level that bar alone is highlighted; between two levels the
+        weight is shared by distance; outside the bars all fade and
+        there is no marker.
+        """
+        if highlight_avail is None:
+            return np.ones(len(x)), None
+
+        hit = np.isclose(x, highlight_avail)
+        if hit.any():
+            return hit.astype(float), x[hit][-1]
+
+        if len(x) > 1 and x[0] < highlight_avail < x[-1]:
+            p = np.interp(highlight_avail, x, np.arange(len(x)))
+            return np.clip(1 - np.abs(np.arange(len(x)) - p), 0, 1), highlight_avail
+
+        return np.zeros(len(x)), None
+
+def generation_xaxis(index):
+    """
+    Precomputed x-axis for draw_generation_stack_chart: numeric x
+    positions plus the 12 PM anchors, built once per index.
+    """
+    index = pd.DatetimeIndex(index)
+    x = mdates.date2num(index)
+    ticks = x[index.hour == 12]
+
+    return {"x": x, "ticks": ticks, "labels": ["12 PM"] * len(ticks)}
+
+
 def draw_generation_stack_chart(
     ax,
     stack_df,
@@ -532,142 +834,216 @@ def draw_generation_stack_chart(
     unit="GW",
     positive=None,
     negative=None,
-    right_axis=False
+    right_axis=False,
+    xaxis=None,
+    draft=False,
 ):
 
 
     """
     Stacked generation chart.
 
-    - Data expected in MW
+    - Data expected in MW: a DataFrame, or an (n_times, len(order))
+      ndarray with columns in `order` plus a generation_xaxis() spec
     - unit="GW" or "MW" controls display scaling
     - X-axis always shows 12 AM and 12 PM anchors
-    """
-
-    ax.cla()
-
-    # ---------------------------
-    # Base axis styling
-    # ---------------------------
-    ax.set_facecolor(BACKGROUND)
-    ax.margins(x=0)
-    ax.spines["right"].set_visible(False)
-    ax.spines["top"].set_visible(False)
-    ax.spines["left"].set_visible(False)
+    - draft: thinned time series, no antialiasing (see draft.py)
 
-    if right_axis:
-        ax.spines["right"].set_visible(True)
-
-    # ---------------------------
-    # Ensure all ordered techs exist
-    # ---------------------------
-    stack_df = stack_df.copy()
-    for tech in order:
-        if tech not in stack_df.columns:
-            stack_df[tech] = 0.0
-
-    # ---------------------------
-    # Data prep
-    # ---------------------------
-    if unit == "GW":
-        scale = 1_000.0
-        unit_label = "GW"
-    elif unit == "MW":
-        scale = 1.0
-        unit_label = "MW"
+    Returns the GenerationStackChart; its update() swaps in another
+    frame of the same shape.
+    """
+    if isinstance(stack_df, pd.DataFrame):
+        xaxis = xaxis or generation_xaxis(stack_df.index)
+        values = stack_df.reindex(columns=order, fill_value=0.0).to_numpy(dtype=float)
     else:
-        raise ValueError("unit must be 'GW' or 'MW'")
+        values = stack_df
+
+    chart = GenerationStackChart(
+        ax,
+        xaxis,
+        order,
+        ylims=ylims,
+        unit=unit,
+        positive=positive,
+        negative=negative,
+        right_axis=right_axis,
+        draft=draft,
+    )
+    chart.update(values)
 
-    stack_scaled = stack_df[order] / scale
+    return chart
 
-    # ---------------------------
-    # Stackplot
-    # ---------------------------
-    # ---------------------------
-    # Positive stack (above zero)
-    # ---------------------------
-    ax.stackplot(
-        stack_scaled.index,
-        [stack_scaled[c] for c in positive if c in stack_scaled.columns],
-        colors=[STACK_COLOURS[c] for c in positive if c in stack_scaled.columns],
-        alpha=0.95,
-        zorder=2,
-    )
 
-    # ---------------------------
-    # Negative stack (below zero)
-    # ---------------------------
-    if negative:
-        ax.stackplot(
-            stack_scaled.index,
-            [stack_scaled[c] for c in negative if c in stack_scaled.columns],
-            colors=[STACK_COLOURS[c] for c in negative if c in stack_scaled.columns],
+class GenerationStackChart:
+    """
+    Stacked generation chart (see draw_generation_stack_chart) with its
+    axis styling and stack polygons built once. update(values) stacks one
+    (n_times, len(order)) MW frame, e.g. a row of the typical-week cube
+    (prep_stack.typical_week_cube): positive layers up from zero,
+    negative layers down, cumulated into preallocated buffers and
+    written into the existing polygons.
+    """
+
+    def __init__(
+        self,
+        ax,
+        xaxis,
+        order,
+        ylims=(0,1.2),
+        unit="GW",
+        positive=None,
+        negative=None,
+        right_axis=False,
+        draft=False,
+    ):
+        ax.cla()
+
+        # ---------------------------
+        # Base axis styling
+        # ---------------------------
+        ax.set_facecolor(BACKGROUND)
+        ax.margins(x=0)
+        ax.spines["right"].set_visible(False)
+        ax.spines["top"].set_visible(False)
+        ax.spines["left"].set_visible(False)
+
+        if right_axis:
+            ax.spines["right"].set_visible(True)
+
+        if unit == "GW":
+            self.scale = 1_000.0
+            unit_label = "GW"
+        elif unit == "MW":
+            self.scale = 1.0
+            unit_label = "MW"
+        else:
+            raise ValueError("unit must be 'GW' or 'MW'")
+
+        # ---------------------------
+        # Layers: positive stack (above zero), then negative (below)
+        # ---------------------------
+        col = {c: i for i, c in enumerate(order)}
+        pos = [c for c in positive or [] if c in col]
+        neg = [c for c in negative or [] if c in col]
+
+        self.columns = [col[c] for c in pos + neg]
+        self.n_pos = len(pos)
+
+        x = xaxis["x"]
+        self.idx = None
+
+        if draft:
+            self.idx = draft_index(len(x))
+            x = x[self.idx]
+
+        n = len(x)
+
+        # Preallocated per-frame buffers: layer tops, and the polygon
+        # verts in fill_between's order (x0 top, bottom edge forward,
+        # top edge back), whose x never changes
+        self._tops = np.empty((len(self.columns), n))
+        self._verts = np.empty((len(self.columns), 2 * n + 2, 2))
+        self._verts[:, 0, 0] = x[0]
+        self._verts[:, 1:n + 1, 0] = x
+        self._verts[:, n + 1, 0] = x[-1]
+        self._verts[:, n + 2:, 0] = x[::-1]
+
+        self.stacks = PolyCollection(
+            [],
+            facecolors=[STACK_COLOURS[c] for c in pos + neg],
+            edgecolors="none",
             alpha=0.95,
             zorder=2,
+            antialiased=not draft,
         )
+        ax.add_collection(self.stacks, autolim=False)
+        ax.set_xlim(x[0], x[-1])
 
-    # Ensure x-axis elements render above stacks
-    ax.spines["bottom"].set_zorder(5)
-    ax.xaxis.set_zorder(5)
-
-    # ---------------------------
-    # Y-axis (only 0 and 1)
-    # ---------------------------
-    ax.set_ylim(*ylims)
-
-    y_min, y_max = ax.get_ylim()  # or ylims
-
-    ax.set_yticks([y_min, 0, y_max])
-    ax.set_yticklabels(
-        [f"{y_min:g} {unit_label}", "0", f"{y_max:g} {unit_label}"],
-        fontproperties=FONT_REGULAR,
-        fontsize=small_font,
-        color=DARK_GREY,
-    )
+        # Ensure x-axis elements render above stacks
+        ax.spines["bottom"].set_zorder(5)
+        ax.xaxis.set_zorder(5)
 
-    if right_axis:
-        ax.yaxis.tick_right()
-        ax.yaxis.set_label_position("right")
-        ax.spines["right"].set_color(DARK_GREY)
-        ax.spines["right"].set_linewidth(0.8)
+        # ---------------------------
+        # Y-axis (only 0 and 1)
+        # ---------------------------
+        ax.set_ylim(*ylims)
 
-    # ---------------------------
-    # X-axis: 12 AM / 12 PM only
-    # ---------------------------
-    hours = stack_scaled.index.hour
-    tick_mask = hours.isin([12])
-    xticks = stack_scaled.index[tick_mask]
-
-
-    labels = []
-    for t in xticks:
-        labels.append("12 PM")
+        y_min, y_max = ax.get_ylim()  # or ylims
 
-    # ---------------------------
-    # Move x-axis to y = 0
-    # ---------------------------
-    ax.spines["bottom"].set_position(("data", 0))
-    ax.spines["bottom"].set_color(DARK_GREY)
-    ax.spines["bottom"].set_linewidth(0.8)
+        ax.set_yticks([y_min, 0, y_max])
+        ax.set_yticklabels(
+            [f"{y_min:g} {unit_label}", "0", f"{y_max:g} {unit_label}"],
+            fontproperties=font("regular"),
+            fontsize=small_font,
+            color=DARK_GREY,
+        )
 
-    ax.xaxis.set_ticks_position("bottom")
-    ax.xaxis.set_label_position("bottom")
+        if right_axis:
+            ax.yaxis.tick_right()
+            ax.yaxis.set_label_position("right")
+            ax.spines["right"].set_color(DARK_GREY)
+            ax.spines["right"].set_linewidth(0.8)
+
+        # ---------------------------
+        # X-axis: 12 AM / 12 PM only
+        # ---------------------------
+        xticks = xaxis["ticks"]
+        labels = xaxis["labels"]
+
+        # ---------------------------
+        # Move x-axis to y = 0
+        # ---------------------------
+        ax.spines["bottom"].set_position(("data", 0))
+        ax.spines["bottom"].set_color(DARK_GREY)
+        ax.spines["bottom"].set_linewidth(0.8)
+
+        ax.xaxis.set_ticks_position("bottom")
+        ax.xaxis.set_label_position("bottom")
+
+        ax.set_xticks(xticks)
+        ax.set_xticklabels(
+            labels,
+            fontproperties=font("regular"),
+            fontsize=small_font,
+            color=DARK_GREY,
+        )
 
-    ax.set_xticks(xticks)
-    ax.set_xticklabels(
-        labels,
-        fontproperties=FONT_REGULAR,
-        fontsize=small_font,
-        color=DARK_GREY,
-    )
+        # ---------------------------
+        # Grid (y only)
+        # ---------------------------
+        ax.grid(
+            axis="y",
+            color=CLOUD,
+            linewidth=0.8,
+            alpha=0.35,
+            zorder=1,
+        )
 
-    # ---------------------------
-    # Grid (y only)
-    # ---------------------------
-    ax.grid(
-        axis="y",
-        color=CLOUD,
-        linewidth=0.8,
-        alpha=0.35,
-        zorder=1,
-    )
+    def update(self, values):
+        """
+        Stack one (n_times, len(order)) frame, in MW.
+        """
+        values = np.asarray(values, dtype=float)
+        if self.idx is not None:
+            values = values[self.idx]
+
+        layers = values[:, self.columns].T
+        tops, verts = self._tops, self._verts
+        n = tops.shape[1]
+
+        # Cumulative tops: positive layers from zero up, negative down
+        np.cumsum(layers[:self.n_pos], axis=0, out=tops[:self.n_pos])
+        np.cumsum(layers[self.n_pos:], axis=0, out=tops[self.n_pos:])
+        tops /= self.scale
+
+        # Bottom edge: zero for the first layer of each stack, else the
+        # top of the layer below
+        verts[:, 1:n + 1, 1] = 0.0
+        verts[1:self.n_pos, 1:n + 1, 1] = tops[:max(self.n_pos - 1, 0)]
+        verts[self.n_pos + 1:, 1:n + 1, 1] = tops[self.n_pos:-1]
+
+        verts[:, 0, 1] = tops[:, 0]
+        verts[:, n + 1, 1] = tops[:, -1]
+        verts[:, n + 2:, 1] = tops[:, ::-1]
+
+        self.stacks.set_verts(verts)
@@ -0,0 +1,475 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# Shared LCOE / component dataset loader
+# -------------------------------------------------
+# Each CSV is parsed once into a typed table (categorical labels, int
+# years, float values) and pickled under DATA_CACHE_DIR, named by the
+# file's resolved path and a hash of its content. The content hash is
+# recorded with the file's size + mtime and only recomputed when those
+# change, so later runs, from any script, load the pickle in
+# milliseconds until the CSV changes. Within a process, tables and
+# their country / year views are cached as well.
+#
+# Views are shared: treat them as read-only (.copy() before editing).
+
+LCOE_CSV = r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_results_complete.csv"
+COMPONENTS_CSV = r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_breakdowns2.csv"
+COMPONENTS_COMPLETE_CSV = r"C:\Users\barna\PycharmProjects\solar_bess\outputs\lcoe_breakdowns_complete.csv"
+
+DATA_CACHE_DIR = Path(
+    os.environ.get("LCOE_CACHE_DIR", Path.home() / ".cache" / "lcoe_data")
+)
+
+LABEL_COLUMNS = ["Country", "Tech", "Scenario", "Component"]
+
+
+def fingerprint(path):
+    """
+    (file name, size, mtime_ns): changes whenever the file is rewritten.
+    """
+    st = os.stat(path)
+    return Path(path).name, st.st_size, st.st_mtime_ns
+
+
+def data_paths():
+    """
+    Every CSV the loaders default to (read at call time, so reassigned
+    module paths count).
+    """
+    return LCOE_CSV, COMPONENTS_CSV, COMPONENTS_COMPLETE_CSV
+
+
+def _typed(df):
+    df = df.copy()
+
+    for col in LABEL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    if "Year" in df.columns:
+        df["Year"] = df["Year"].astype(int)
+
+    if "Availability" in df.columns:
+        df["Availability"] = df["Availability"].astype(float)
+
+    return df
+
+
+def _path_key(path):
+    # <stem>-<hash of the resolved path>: same-named CSVs in different
+    # folders get their own pickles
+    resolved = str(Path(path).resolve())
+    return f"{Path(path).stem}-{hashlib.blake2b(resolved.encode(), digest_size=8).hexdigest()}"
+
+
+def _write_atomic(path, data):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def content_digest(path):
+    """
+    blake2b of the file's bytes. Recorded under DATA_CACHE_DIR with the
+    file's size and mtime, and only rehashed when those change.
+    """
+    _, size, mtime_ns = fingerprint(path)
+    index_path = DATA_CACHE_DIR / f"{_path_key(path)}.json"
+
+    try:
+        entry = json.loads(index_path.read_text())
+        if entry["size"] == size and entry["mtime_ns"] == mtime_ns:
+            return entry["digest"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+
+    DATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _write_atomic(
+        index_path,
+        json.dumps({"size": size, "mtime_ns": mtime_ns, "digest": digest}).encode(),
+    )
+    return digest
+
+
+def _cache_path(path):
+    return DATA_CACHE_DIR / f"{_path_key(path)}-{content_digest(path)}.pkl"
+
+
+@lru_cache(maxsize=None)
+def load_table(path):
+    """
+    Whole typed table for a CSV, from the pickle cache when current.
+    """
+    cache_path = _cache_path(path)
+
+    if cache_path.exists():
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+
+    df = _typed(pd.read_csv(path))
+
+    # Replace this file's stale pickles (not those of same-named files
+    # elsewhere), then write atomically
+    DATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for old in DATA_CACHE_DIR.glob(f"{glob.escape(_path_key(path))}-*.pkl"):
+        old.unlink(missing_ok=True)
+
+    _write_atomic(cache_path, pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+
+    return df
+
+
+@lru_cache(maxsize=None)
+def table_view(path, country=None, year=None):
+    """
+    Rows of load_table(path) for one country and / or year.
+    """
+    df = load_table(path)
+
+    if country is not None:
+        df = df[df["Country"] == country]
+    if year is not None:
+        df = df[df["Year"] == year]
+
+    return df
+
+
+def lcoe_results(country=None, year=None, path=None):
+    """
+    LCOE results (lcoe_results_complete.csv by default).
+    """
+    return table_view(path or LCOE_CSV, country, year)
+
+
+def lcoe_components(country=None, year=None, path=None):
+    """
+    LCOE component breakdowns (lcoe_breakdowns2.csv by default).
+    """
+    return table_view(path or COMPONENTS_CSV, country, year)
+
+
+# -------------------------------------------------
+# Indexed curve store
+# -------------------------------------------------
+# Charts look curves up by (tech, year, scenario). Scanning the whole
+# table with a boolean mask per line (and again per label) is O(N) each
+# time; LcoeStore groups the table once into Availability-sorted arrays
+# so every lookup is a dict hit.
+
+BASELINE_SCENARIOS = ("", "Base")
+
+# Load factors are matched after rounding to this many decimals, so
+# 0.7 and 0.7000000001 (CSV round trips, np.arange grids) are the same
+LF_DECIMALS = 6
+
+STORE_CACHE_SIZE = 8
+
+
+def normalise_scenario(scenario):
+    """
+    None for the baseline (None, NaN, "" or "Base"), else the name.
+    """
+    if scenario is None or pd.isna(scenario) or scenario in BASELINE_SCENARIOS:
+        return None
+    return str(scenario)
+
+
+class LcoeStore:
+    """
+    Rows of an LCOE table grouped by (tech, year, scenario), each group
+    held as contiguous Availability-sorted numeric arrays. Scenario None
+    is the baseline, merging "", "Base" and missing scenarios (except in
+    fossil_lcoe, where it matches any scenario).
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.curves = {}
+        self._scenarios = {}
+        self._lf_index = {}
+        self._envelopes = {}
+
+        if df.empty:
+            return
+
+        if "Scenario" in df.columns:
+            scenario = df["Scenario"].astype(object)
+            scenario = scenario.where(scenario.notna(), "").replace(dict.fromkeys(BASELINE_SCENARIOS, ""))
+        else:
+            scenario = pd.Series("", index=df.index)
+
+        numeric = [
+            c for c in df.columns
+            if c not in ("Year", *LABEL_COLUMNS) and pd.api.types.is_numeric_dtype(df[c])
+        ]
+
+        order = np.argsort(df["Availability"].to_numpy(), kind="stable")
+        arrays = {c: df[c].to_numpy()[order] for c in numeric}
+
+        groups = pd.DataFrame({
+            "Tech": df["Tech"].astype(object).to_numpy()[order],
+            "Year": df["Year"].to_numpy()[order],
+            "Scenario": scenario.to_numpy()[order],
+        }).groupby(["Tech", "Year", "Scenario"], sort=False).indices
+
+        for (tech, year, scen), idx in groups.items():
+            self.curves[(tech, int(year), scen or None)] = {
+                c: np.ascontiguousarray(a[idx]) for c, a in arrays.items()
+            }
+            self._scenarios.setdefault((tech, int(year)), []).append(scen or None)
+
+    def group(self, tech, year, scenario=None):
+        """
+        {column: array} for one tech-year-scenario, or None.
+        """
+        return self.curves.get((tech, year, normalise_scenario(scenario)))
+
+    def curve(self, tech, year, scenario=None, column="LCOE"):
+        """
+        (availability, values) arrays, or None if there is no such curve.
+        """
+        group = self.group(tech, year, scenario)
+        if group is None:
+            return None
+        return group["Availability"], group[column]
+
+    def _lf_lookup(self, key):
+        """
+        {quantized lf: value} for one group (None values for lfs that
+        occur more than once), built on first use.
+        """
+        if key not in self._lf_index:
+            group = self.curves.get(key)
+            lookup = None
+
+            if group is not None:
+                q = np.round(group["Availability"] * 10**LF_DECIMALS).astype(np.int64)
+                lookup = dict(zip(q.tolist(), group["LCOE"].tolist()))
+                if len(lookup) < len(q):
+                    uniq, counts = np.unique(q, return_counts=True)
+                    lookup.update(dict.fromkeys(uniq[counts > 1].tolist()))
+
+            self._lf_index[key] = lookup
+
+        return self._lf_index[key]
+
+    def fossil_lcoe(self, tech, year, lf, scenario=None, interpolate=False):
+        """
+        LCOE of tech-year at load factor lf: an O(1) hit on the quantized
+        lf grid. scenario None matches the row of any scenario (an error
+        if several match). interpolate=True falls back to linear
+        interpolation between grid points (within the grid's range).
+        """
+        if scenario is None:
+            keys = [(tech, year, scen) for scen in self._scenarios.get((tech, year), ())]
+        else:
+            keys = [(tech, year, normalise_scenario(scenario))]
+
+        where = (
+            f"Tech={tech}, Year={year}, Availability={lf}"
+            + (f", Scenario={scenario}" if scenario is not None else "")
+        )
+
+        lookups = {key: self._lf_lookup(key) for key in keys if key in self.curves}
+
+        if not lookups:
+            raise ValueError(f"No LCOE found for {where}")
+
+        q = int(round(lf * 10**LF_DECIMALS))
+        hits = [lookup[q] for lookup in lookups.values() if q in lookup]
+
+        if len(hits) > 1 or None in hits:
+            raise ValueError(f"Multiple LCOE rows found for {where}")
+        if hits:
+            return hits[0]
+
+        if not interpolate:
+            raise ValueError(f"No LCOE found for {where}")
+        if len(lookups) > 1:
+            raise ValueError(f"Multiple LCOE rows found for {where}")
+
+        (key,) = lookups
+        x, y = self.curves[key]["Availability"], self.curves[key]["LCOE"]
+        if not x[0] <= lf <= x[-1]:
+            raise ValueError(f"No LCOE found for {where}")
+
+        return float(np.interp(lf, x, y))
+
+    def envelope(self, tech, years, scenarios=None, column="LCOE"):
+        """
+        (availability, lo, hi): min / max of column at each availability
+        over the tech's curves for every year x scenario (scenarios None:
+        the baseline), or None if there are no such curves. Computed
+        once per grouping.
+        """
+        keys = tuple(dict.fromkeys(
+            (tech, int(year), normalise_scenario(scenario))
+            for year in years
+            for scenario in (scenarios if scenarios is not None else (None,))
+        ))
+        cache_key = ("envelope", keys, column)
+
+        if cache_key not in self._envelopes:
+            groups = [self.curves[k] for k in keys if k in self.curves]
+            result = None
+
+            if groups:
+                x = np.concatenate([g["Availability"] for g in groups])
+                y = np.concatenate([g[column] for g in groups]).astype(float)
+
+                order = np.argsort(x, kind="stable")
+                x, y = x[order], y[order]
+
+                # one segment per distinct availability, reduced in one pass
+                starts = np.flatnonzero(np.r_[True, x[1:] != x[:-1]])
+                lo = np.fmin.reduceat(y, starts)
+                hi = np.fmax.reduceat(y, starts)
+
+                keep = ~np.isnan(lo)
+                result = (x[starts][keep], lo[keep], hi[keep])
+
+            self._envelopes[cache_key] = result
+
+        return self._envelopes[cache_key]
+
+    def fossil_band(self, tech, year, lfs, scenario=None):
+        """
+        (lo, hi): min / max LCOE of tech-year over load factors lfs,
+        each matched as in fossil_lcoe (same errors). Computed once per
+        set of load factors.
+        """
+        # None (any scenario) and the baseline are different lookups
+        cache_key = ("band", tech, year, scenario, tuple(lfs))
+
+        if cache_key not in self._envelopes:
+            ys = np.array([self.fossil_lcoe(tech, year, lf, scenario) for lf in lfs])
+            self._envelopes[cache_key] = (float(ys.min()), float(ys.max()))
+
+        return self._envelopes[cache_key]
+
+
+# -------------------------------------------------
+# Component stack store
+# -------------------------------------------------
+# Breakdown charts stack each tech-year's components over availability.
+# The availability x component pivot never changes between draws (or
+# animation frames), so ComponentStore pivots each tech-year once and
+# keeps the cumulative stack per component order.
+
+class ComponentStore:
+    """
+    Component breakdown rows ("Total" excluded) pivoted per (tech, year)
+    to availability x component, on first use of each tech-year.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.pivots = {}
+        self._stacks = {}
+        self._groups = {}
+
+        if df.empty:
+            return
+
+        self._rows = df[df["Component"] != "Total"]
+        self._groups = pd.DataFrame({
+            "Tech": self._rows["Tech"].astype(object).to_numpy(),
+            "Year": self._rows["Year"].to_numpy(),
+        }).groupby(["Tech", "Year"], sort=False).indices
+
+    def pivot(self, tech, year):
+        """
+        Availability-sorted availability x component DataFrame, or None.
+        """
+        key = (tech, year)
+
+        if key not in self.pivots:
+            idx = self._groups.get(key)
+            self.pivots[key] = None if idx is None else (
+                self._rows.iloc[idx]
+                .pivot(index="Availability", columns="Component", values="Value")
+                .sort_index()
+            )
+
+        return self.pivots[key]
+
+    def stack(self, tech, year, order=None):
+        """
+        (availability, order, cumulative) for tech-year, or None:
+        cumulative[i] is the top edge of component order[i]. order
+        defaults to the pivot's columns.
+        """
+        pivot = self.pivot(tech, year)
+        if pivot is None:
+            return None
+
+        order = tuple(order or pivot.columns.tolist())
+        key = (tech, year, order)
+
+        if key not in self._stacks:
+            values = np.vstack([pivot[c].to_numpy(dtype=float) for c in order])
+            self._stacks[key] = (
+                pivot.index.to_numpy(),
+                order,
+                np.cumsum(values, axis=0),
+            )
+
+        return self._stacks[key]
+
+
+_STORES = OrderedDict()
+
+
+def _cached_store(cls, df):
+    """
+    cls(df), built once per (cls, DataFrame object) and kept for the
+    last STORE_CACHE_SIZE tables (assumes df is not edited in place).
+    """
+    if isinstance(df, cls):
+        return df
+
+    key = (cls, id(df))
+    entry = _STORES.get(key)
+    if entry is not None and entry[0] is df:
+        _STORES.move_to_end(key)
+        return entry[1]
+
+    store = cls(df)
+    _STORES[key] = (df, store)
+
+    if len(_STORES) > STORE_CACHE_SIZE:
+        _STORES.popitem(last=False)
+
+    return store
+
+
+def lcoe_store(df):
+    """
+    Cached LcoeStore for an LCOE table (an LcoeStore passes through).
+    """
+    return _cached_store(LcoeStore, df)
+
+
+def component_store(df):
+    """
+    Cached ComponentStore for a breakdown table (a store passes through).
+    """
+    return _cached_store(ComponentStore, df)
@@ -1,5 +1,6 @@
 # data/stack_views.py
 
+import numpy as np
 import pandas as pd
 
 def _clean_long_df(df: pd.DataFrame) -> pd.DataFrame:
@@ -95,3 +96,31 @@ def load_typical_week_by_availability(
     }
 
     return typical_week_by_avail
+
+
+def typical_week_cube(typical_week_by_avail: dict, order: list) -> dict:
+    """
+    The typical weeks as one array, for per-frame stacking:
+        {
+            "availability": sorted availabilities,
+            "row": {availability: row in values},
+            "index": shared 168h DatetimeIndex,
+            "values": ndarray (n_avail, 168, len(order)), missing techs 0,
+        }
+    """
+    avails = sorted(typical_week_by_avail)
+    index = typical_week_by_avail[avails[0]].index
+
+    values = np.stack([
+        typical_week_by_avail[a]
+        .reindex(index=index, columns=order, fill_value=0.0)
+        .to_numpy(dtype=float)
+        for a in avails
+    ])
+
+    return {
+        "availability": avails,
+        "row": {a: i for i, a in enumerate(avails)},
+        "index": index,
+        "values": values,
+    }
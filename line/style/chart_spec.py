@@ -1,18 +1,20 @@
 # chart_spec.py
-import matplotlib.pyplot as plt
+from export import new_figure
+from fonts import font
 from line.style.styling import (
     BACKGROUND,
-    FONT_SEMI_BOLD,
-    FONT_REGULAR,
     DARK_GREY,
     large_font,
     medium_font,
     small_font,
 )
 
-def setup_lcoe_figure(title, subtitle):
+def setup_lcoe_figure(title, subtitle=None, headless=False):
+    """
+    headless: bare Agg figure for exports (see export.new_figure).
+    """
     DPI = 100
-    fig = plt.figure(figsize=(1920 / DPI, 1080 / DPI), dpi=DPI)
+    fig = new_figure(headless, figsize=(1920 / DPI, 1080 / DPI), dpi=DPI)
     fig.patch.set_facecolor(BACKGROUND)
 
     ax = fig.add_subplot(1, 1, 1)
@@ -30,7 +32,7 @@ def setup_lcoe_figure(title, subtitle):
         0.05,
         0.9,
         title,
-        fontproperties=FONT_SEMI_BOLD,
+        fontproperties=font("semi"),
         fontsize=large_font,
         ha="left",
     )
@@ -38,15 +40,15 @@ def setup_lcoe_figure(title, subtitle):
     fig.text(
         0.05,
         0.86,
-        f"Levelised cost of electricity ($/MWh) - {subtitle}",
-        fontproperties=FONT_REGULAR,
+        "Levelised cost of electricity ($/MWh)" + (f" - {subtitle}" if subtitle else ""),
+        fontproperties=font("regular"),
         fontsize=medium_font,
         color=DARK_GREY,
     )
 
     ax.set_xlabel(
         "Demand met/load factor",
-        fontproperties=FONT_REGULAR,
+        fontproperties=font("regular"),
         fontsize=small_font,
         color=DARK_GREY,
         labelpad=14,
@@ -19,4 +19,10 @@ NEGATIVE = ["Battery Charge", "Curtailment"]
 OTHER_LINE_ALPHA = 0.75
 LINE_WEIGHT = 3
 LABEL_OFFSET_PX = 18
-LABEL_HORZ_OFF_PX = 9
\ No newline at end of file
+LABEL_HORZ_OFF_PX = 9
+
+# Label layout (helpers.layout_lcoe_labels): curve labels try these
+# load factors, above then below the curve, until one clears the labels
+# already placed; boxes are padded by LABEL_PAD_PX
+LABEL_X_ANCHORS = (0.62, 0.5, 0.74, 0.38, 0.86)
+LABEL_PAD_PX = 4
\ No newline at end of file
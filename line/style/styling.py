@@ -1,27 +1,25 @@
-import matplotlib.font_manager as fm
 import matplotlib.cm as cm
 import matplotlib.colors as mcolors
 import numpy as np
 
+from fonts import font
+
 # ===============================================================
-# Fonts
+# Fonts (resolved on first access through fonts.font, not at import)
 # ===============================================================
-font_dir = r"C:\Users\barna\AppData\Local\Microsoft\Windows\Fonts"
-
-paths = {
-    "regular": fr"{font_dir}\Montserrat-Regular.ttf",
-    "medium": fr"{font_dir}\Montserrat-Medium.ttf",
-    "semi":    fr"{font_dir}\Montserrat-SemiBold.ttf",
-    "bold":    fr"{font_dir}\Montserrat-Bold.ttf",
+_FONTS = {
+    "FONT_REGULAR": "regular",
+    "FONT_MEDIUM": "medium",
+    "FONT_SEMI_BOLD": "semi",
+    "FONT_BOLD": "bold",
 }
 
-for p in paths.values():
-    fm.fontManager.addfont(p)
 
-FONT_REGULAR   = fm.FontProperties(fname=paths["regular"])
-FONT_MEDIUM    = fm.FontProperties(fname=paths["medium"])
-FONT_SEMI_BOLD = fm.FontProperties(fname=paths["semi"])
-FONT_BOLD      = fm.FontProperties(fname=paths["bold"])
+def __getattr__(name):
+    if name in _FONTS:
+        return font(_FONTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 small_font = 22
 medium_font = 24
@@ -1,3 +1,5 @@
+import os
+import time
 from collections import defaultdict
 
 from line.style.styling import DARK_GREY
@@ -24,6 +26,15 @@ def build_chart_name(country, tech_years):
 
     return "_".join(parts)
 
+def open_output(path):
+    """
+    Open a saved chart in the default viewer. No-op where os.startfile
+    does not exist (Linux / headless render boxes).
+    """
+    if hasattr(os, "startfile"):
+        time.sleep(0.3)
+        os.startfile(path)
+
 def mpl_text(s: str) -> str:
     """
     Escape characters that trigger Matplotlib mathtext.
@@ -1,10 +1,10 @@
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
-from matplotlib.animation import FuncAnimation
 
-plt.style.use('dark_background')
+from draft import DRAFT_DPI, draft_index, draft_encode, draft_path
+from export import export_frames, new_subplots
 
 
 class Series:
@@ -17,6 +17,8 @@ class Series:
         self.exp_func = None
 
     def fit_exponential(self, start_year, end_year):
+        from scipy.optimize import curve_fit
+
         mask = (self.data[:, 0] >= start_year) & (self.data[:, 0] <= end_year)
         x_data = self.data[mask][:, 0]
         y_data = self.data[mask][:, 1]
@@ -46,8 +48,17 @@ class AnimatedPlotter:
             'color': color or '#66c2ff'
         })
 
-    def animate_plot(self, font='Bahnschrift ', frames=60, duration_ms=2000):
-        fig, ax = plt.subplots(figsize=(20, 7.5))
+    def animate_plot(self, font='Bahnschrift ', frames=60, duration_ms=2000, draft=False,
+                     save_path=None, hold_ms=1000):
+        """
+        draft: low dpi, thinned projections, no antialiasing (see draft.py)
+        save_path: export headless on Agg (no window, no event loop) with
+                   the final log-scale frame held for hold_ms
+        """
+        plt.style.use('dark_background')
+
+        fig, ax = new_subplots(headless=save_path is not None, figsize=(20, 7.5),
+                               dpi=DRAFT_DPI if draft else None)
         ax.set_position([0.15, 0.15, 0.6, 0.7])
 
         # Store all plot elements for animation
@@ -80,14 +91,18 @@ class AnimatedPlotter:
 
             # Create line
             line, = ax.plot(x_real, y_real, 'o-', color=color,
-                            markerfacecolor=color, linewidth=2, markersize=6)
+                            markerfacecolor=color, linewidth=2, markersize=6,
+                            antialiased=not draft)
             lines.append((line, x_real, y_real))
 
             # Add projection if available
             if series.exp_func and series.params is not None:
                 x_proj = np.linspace(start_year, end_year, 100)
+                if draft:
+                    x_proj = x_proj[draft_index(len(x_proj))]
                 y_proj = series.exp_func(x_proj, *series.params)
-                proj_line, = ax.plot(x_proj, y_proj, '--', color=color, alpha=0.7)
+                proj_line, = ax.plot(x_proj, y_proj, '--', color=color, alpha=0.7,
+                                     antialiased=not draft)
                 projection_lines.append((proj_line, x_proj, y_proj))
 
             # Skip annotations for now
@@ -104,10 +119,10 @@ class AnimatedPlotter:
         ax.grid(axis='x', visible=False)
 
         # Title and subtitle
-        plt.text(0, 1.15, self.title, fontname=font, fontsize=20,
-                 ha='left', transform=ax.transAxes)
-        plt.text(0, 1.10, self.subtitle, fontname=font, fontsize=16,
-                 ha='left', transform=ax.transAxes)
+        ax.text(0, 1.15, self.title, fontname=font, fontsize=20,
+                ha='left', transform=ax.transAxes)
+        ax.text(0, 1.10, self.subtitle, fontname=font, fontsize=16,
+                ha='left', transform=ax.transAxes)
 
         # Set initial limits including projections
         all_y = np.concatenate([y for _, _, y in lines])
@@ -173,33 +188,40 @@ class AnimatedPlotter:
             ax.set_ylim(y_min, y_max)
             fig.canvas.draw_idle()
 
-        # Create and run animation
-        anim = FuncAnimation(fig, animate, frames=frames,
-                             interval=duration_ms / frames, blit=False, repeat=False)
-
-        # Finalize after animation completes
-        def on_animation_complete(event):
+        # Frame `frames` is the finalized log-scale state. Driving it from the
+        # frame sequence instead of a GUI timer works on every backend.
+        def step(frame):
+            if frame < frames:
+                return animate(frame)
             finalize_animation()
+            return []
+
+        if save_path is not None:
+            fps = frames * 1000 / duration_ms
+            hold = max(1, round(fps * hold_ms / 1000))
+            encode = dict(fps=fps, codec="libx264", pix_fmt="yuv420p")
+
+            if draft:
+                encode = draft_encode(encode)
+                save_path = draft_path(save_path)
+
+            return export_frames(fig, step, [*range(frames), *[frames] * hold],
+                                 save_path, **encode)
 
-        anim.event_source.stop()
-        anim = FuncAnimation(fig, animate, frames=frames,
+        # Create and run animation
+        from matplotlib.animation import FuncAnimation  # preview only
+        anim = FuncAnimation(fig, step, frames=frames + 1,
                              interval=duration_ms / frames, blit=False, repeat=False)
 
         #plt.subplots_adjust(top=0.8, left=0.125, right=0.9)
         #plt.tight_layout()
         plt.show()
 
-        # Auto-finalize after animation
-        fig.canvas.mpl_connect('draw_event', lambda evt:
-        plt.get_current_fig_manager().window.after(
-            duration_ms + 100, finalize_animation)
-        if hasattr(plt.get_current_fig_manager(), 'window') else None)
-
         return anim
 
 
 # === USAGE EXAMPLE ===
-if __name__ == "__main__":
+def main(save_path=None, draft=False):
     # Load data (replace with your actual path)
     data_path = r"C:\Users\barna\downloads\\"
     file_name = "solar5.csv"
@@ -225,5 +247,9 @@ if __name__ == "__main__":
     plotter.add_series(bloomberg_solar, start_year=2022, end_year=2030, color='#ff4444')
     # plotter.add_series(demand, color='#ff6b6b')
 
-    # Run animated plot
-    plotter.animate_plot()
\ No newline at end of file
+    # Run animated plot (pass an output path to render headless to video)
+    return plotter.animate_plot(draft=draft, save_path=save_path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -1,11 +1,12 @@
+import sys
 from data_prep import load_caiso, make_three_month_avg_stack
 from animation import animate_smooth_yearly_transition
 from plotting import COLOURS
 
 import pandas as pd
 
-if __name__ == "__main__":
 
+def main(save_path=None):
     df = load_caiso(
         r"C:\Users\barna\OneDrive\Documents\data\caiso\caiso_fuel_mix_may_range.csv"
     )
@@ -32,9 +33,14 @@ if __name__ == "__main__":
         2025: 2
     }
 
-    animate_smooth_yearly_transition(
+    return animate_smooth_yearly_transition(
         periods=periods,
         fps=fps,
         transition_seconds=0.2,
         pause_seconds=pause_seconds,
+        save_path=save_path,
     )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
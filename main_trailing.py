@@ -1,10 +1,17 @@
 from data_prep import load_caiso_folder
 from animation import animate_trailing_yearly_stack
 
-if __name__ == "__main__":
-    data_path = r"C:\Users\barna\OneDrive\Documents\data\caiso\raw_years"
-    df = load_caiso_folder(data_path)
+DATA_PATH = r"C:\Users\barna\OneDrive\Documents\data\caiso\raw_years"
+SAVE_PATH = r"C:\Users\barna\OneDrive\Documents\Solar_BESS\Good charts\video\solar_avg.mp4"
+
+
+def main(save_path=SAVE_PATH, draft=False):
+    df = load_caiso_folder(DATA_PATH)
 
     print(df.columns)
 
-    animate_trailing_yearly_stack(df, save_path=r"C:\Users\barna\OneDrive\Documents\Solar_BESS\Good charts\video\solar_avg.mp4", fps=100)
+    return animate_trailing_yearly_stack(df, save_path=save_path, fps=100, draft=draft)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,26 @@
 import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+import matplotlib.dates as mdates
+from matplotlib.collections import PolyCollection
+from matplotlib.ticker import MaxNLocator
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from draft import draft_index
+from fonts import font
 
 # ---------------------------------------------------------------
-# FONT + COLOUR PRESETS (LOADED ON IMPORT)
+# FONT + COLOUR PRESETS
 # ---------------------------------------------------------------
+# FONT_* resolve on first access through fonts.font (cached), not at import
+_FONTS = {"FONT_REGULAR": "regular", "FONT_MEDIUM": "medium", "FONT_BOLD": "bold"}
 
-font_dir = r"C:\Users\barna\AppData\Local\Microsoft\Windows\Fonts"
-
-regular_path = fr"{font_dir}\Montserrat-Regular.ttf"
-medium_path  = fr"{font_dir}\Montserrat-Medium.ttf"
-bold_path    = fr"{font_dir}\Montserrat-Bold.ttf"
 
-fm.fontManager.addfont(regular_path)
-fm.fontManager.addfont(medium_path)
-fm.fontManager.addfont(bold_path)
+def __getattr__(name):
+    if name in _FONTS:
+        return font(_FONTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-FONT_REGULAR = fm.FontProperties(fname=regular_path)
-FONT_MEDIUM  = fm.FontProperties(fname=medium_path)
-FONT_BOLD    = fm.FontProperties(fname=bold_path)
 
 COLOURS = {
     # Keep original hero colours
@@ -35,74 +36,421 @@ COLOURS = {
     "Gas": "#919191",
 }
 
+AXIS_LINE_COL = "#CCCCCC"
+TEXT_COL = "#555555"
+
 # ---------------------------------------------------------------
-# STACKED AREA CHART PLOT
+# X-AXIS SPEC (computed once per animation)
 # ---------------------------------------------------------------
-def plot_stack(ax, stack, order, title, ylim=None):
-    #ax.clear()
+def stack_xaxis(index, ticks=("06:00", "12:00", "18:00"), labels=("6 AM", "12 PM", "6 PM")):
+    """
+    Precomputed x-axis for a stack chart.
 
-    axis_line_col = "#CCCCCC"
-    text_col = "#555555"
+    Returns {"x", "xlim", "ticks", "labels"}: numeric x positions
+    (matplotlib date numbers) and the tick positions, found with one
+    vectorised time-of-day match instead of strftime on every timestamp.
+    """
+    index = pd.DatetimeIndex(index)
+    x = mdates.date2num(index)
 
-    stack_gw = stack / 1000.0
+    minutes = index.hour * 60 + index.minute
+    wanted = [int(t[:2]) * 60 + int(t[3:]) for t in ticks]
 
-    ax.stackplot(
-        stack_gw.index,
-        [stack_gw[col] for col in order],
-        colors=[COLOURS[c] for c in order],
-        alpha=0.95,
-    )
+    return {
+        "x": x,
+        "xlim": (x[0], x[-1]),
+        "ticks": x[np.isin(minutes, wanted)],
+        "labels": list(labels),
+    }
 
-    ax.text(-0.12, 1.06,
-            title, transform=ax.transAxes, ha="left", va="bottom",
-            fontproperties=FONT_MEDIUM, fontsize=18, color=text_col)
 
-    # y-axis formatting
-    if ylim is not None:
-        ax.set_ylim(ylim)
-    else:
-        total = stack_gw.sum(axis=1)
-        ymax = total.max()
-        ax.set_ylim(0, ymax * 1.05)
+def stack_values(stack, order, scale=1000.0):
+    """
+    (n_times, n_layers) GW array from a stack DataFrame in MW.
+    """
+    return stack[order].to_numpy(dtype=float) / scale
+
+
+# ---------------------------------------------------------------
+# STACKED AREA CHART PLOT
+# ---------------------------------------------------------------
+def stack_yticks(ax, ylim, ytick_step=None):
+    """
+    Fixed step from the y-limit pre-pass, else whatever the locator picks.
+    """
+    if ytick_step is None:
+        return ax.get_yticks()
+    return np.arange(ylim[0], ylim[1] + 1e-9, ytick_step)
+
+
+def style_stack_axes(ax, xaxis, ylim, ytick_step=None, *,
+                     spine_color=AXIS_LINE_COL, spine_width=None,
+                     tick_color=AXIS_LINE_COL, label_color=TEXT_COL,
+                     label_font="medium"):
+    """
+    Static chart chrome: limits, ticks, fonts, spines, grid, background.
+    Nothing here depends on the frame's data once ylim is fixed.
 
-    ticks = ax.get_yticks()
+    tick_color : tick marks (None: matplotlib default)
+    label_font : fonts.font name for tick labels at 13 pt (None: keep the
+                 default family and size)
+    """
+    ax.set_xlim(xaxis["xlim"])
+    ax.set_ylim(ylim)
+
+    ticks = stack_yticks(ax, ylim, ytick_step)
     ax.set_yticks(ticks)
     ax.set_yticklabels([f"{t:g} GW" for t in ticks])
 
     # x-axis: 6 AM, 12 PM, 6 PM
-    desired = ["06:00", "12:00", "18:00"]
-    xticks = [t for t in stack_gw.index if t.strftime("%H:%M") in desired]
-    ax.set_xticks(xticks)
-    ax.set_xticklabels(["6 AM", "12 PM", "6 PM"])
+    ax.set_xticks(xaxis["ticks"])
+    ax.set_xticklabels(xaxis["labels"])
 
-    ax.tick_params(axis="both", colors=axis_line_col)
+    if tick_color is not None:
+        ax.tick_params(axis="both", colors=tick_color)
 
     for spine in ["left", "bottom"]:
-        ax.spines[spine].set_color(axis_line_col)
+        ax.spines[spine].set_color(spine_color)
+        if spine_width is not None:
+            ax.spines[spine].set_linewidth(spine_width)
 
     ax.spines["right"].set_visible(False)
     ax.spines["top"].set_visible(False)
 
     # Tick font
     for label in ax.get_xticklabels() + ax.get_yticklabels():
-        label.set_fontproperties(FONT_MEDIUM)
-        label.set_fontsize(13)
-        label.set_color(text_col)
+        if label_font is not None:
+            label.set_fontproperties(font(label_font))
+            label.set_fontsize(13)
+        label.set_color(label_color)
 
     ax.grid(color="#E5E5E5", linewidth=0.8, alpha=0.25)
     ax.set_facecolor("#FAFAFA")
     ax.margins(x=0)
     ax.set_box_aspect(1)
 
+
+def draw_stack_title(ax, title, *, centered=False, font_name="medium", **text_kw):
+    """
+    Title text: left-aligned above the top-left corner, or centered=True
+    for a regular axes title (20 pt). font_name: fonts.font name (None:
+    the default family); text_kw override size, colour, weight, ...
+    """
+    # fontproperties first: applied later, it would reset the size
+    style = {"fontproperties": font(font_name)} if font_name is not None else {}
+    style.update({"fontsize": 20 if centered else 18, "color": TEXT_COL}, **text_kw)
+
+    if centered:
+        return ax.set_title(title, **style)
+
+    return ax.text(-0.12, 1.06,
+                   title, transform=ax.transAxes, ha="left", va="bottom",
+                   **style)
+
+
+def draw_stack_layers(ax, x, values, colors, alpha=0.95, antialiased=True):
+    """
+    One PolyCollection per layer from stack_verts (what stackplot draws,
+    without its per-layer fill_between calls). values in GW.
+    """
+    layers = []
+    for verts, color in zip(stack_verts(x, values), colors):
+        layer = PolyCollection([verts], facecolors=color, alpha=alpha,
+                               antialiased=antialiased)
+        ax.add_collection(layer, autolim=False)
+        layers.append(layer)
+    return layers
+
+
+def draft_stack(xaxis, values):
+    """
+    Thin a stack (or a whole stack_cube) along its time axis for draft
+    renders. Tick positions and x-limits are unchanged.
+    """
+    idx = draft_index(len(xaxis["x"]))
+    return {**xaxis, "x": xaxis["x"][idx]}, values[..., idx, :]
+
+
+def plot_stack(ax, stack, order, title, ylim=None, ytick_step=None, xaxis=None,
+               draft=False, colors=None, clear=False, chrome=None, title_style=None):
+    """
+    stack : DataFrame in MW (converted here), or an (n_times, n_layers)
+            ndarray already in GW with columns in `order`
+    xaxis : stack_xaxis() spec; required for ndarrays, built from the
+            index for DataFrames
+    draft : thinned data, no antialiasing (see draft.py)
+    colors : {layer: colour} (default COLOURS)
+    clear : ax.clear() first
+    chrome, title_style : keyword overrides for style_stack_axes /
+            draw_stack_title, for per-script looks
+    """
+    if clear:
+        ax.clear()
+
+    if isinstance(stack, pd.DataFrame):
+        xaxis = xaxis or stack_xaxis(stack.index)
+        stack = stack_values(stack, order)
+
+    if draft:
+        xaxis, stack = draft_stack(xaxis, stack)
+
+    colors = colors or COLOURS
+    draw_stack_layers(ax, xaxis["x"], stack, [colors[c] for c in order],
+                      antialiased=not draft)
+
+    draw_stack_title(ax, title, **(title_style or {}))
+
+    # y-axis formatting
+    if ylim is None:
+        ymax = stack.sum(axis=1).max()
+        ylim = (0, ymax * 1.05)
+
+    style_stack_axes(ax, xaxis, ylim, ytick_step, **(chrome or {}))
+
+
+# ---------------------------------------------------------------
+# Y-LIMIT PRE-PASS (whole animation at once)
+# ---------------------------------------------------------------
+def stack_cube(frames, order, scale=1000.0):
+    """
+    Stack frames (DataFrames, MW) → (n_frames, n_times, n_layers) GW array.
+
+    Convert once up front; plot_stack / StackBlitter take its slices as-is.
+    """
+    return np.stack([stack_values(f, order, scale) for f in frames])
+
+
+def stack_ylim_prepass(
+    frames,
+    order,
+    mode="fixed",
+    window=15,
+    headroom=1.05,
+    scale=1000.0,
+    nbins=6,
+):
+    """
+    Pick the y-range of every frame in one vectorised pass.
+
+    frames : list of stack DataFrames (MW) or a stack_cube array (GW)
+    mode   : "fixed" → one range for the whole animation (blittable)
+             "eased" → range follows the data smoothly, never clipping it
+    window : half-width in frames of the easing (mode="eased")
+
+    Returns (ylims, ytick_step): an (n_frames, 2) array in GW and a tick
+    step shared by every frame, so tick positions never jitter.
+    """
+    cube = frames if isinstance(frames, np.ndarray) else stack_cube(frames, order, scale)
+
+    # tallest stacked total per frame
+    peaks = cube.sum(axis=2).max(axis=1) * headroom
+
+    if mode == "fixed":
+        ymax = np.full(len(peaks), peaks.max())
+    elif mode == "eased":
+        # sliding max then a box mean of the same half-width: every value
+        # averaged covers the centre frame, so the result is >= its peak
+        w = min(window, len(peaks) - 1)
+        padded = np.pad(peaks, w, mode="edge")
+        envelope = sliding_window_view(padded, 2 * w + 1).max(axis=1)
+        padded = np.pad(envelope, w, mode="edge")
+        ymax = sliding_window_view(padded, 2 * w + 1).mean(axis=1)
+    else:
+        raise ValueError("mode must be 'fixed' or 'eased'")
+
+    ylims = np.column_stack([np.zeros_like(ymax), ymax])
+
+    ticks = MaxNLocator(nbins=nbins, steps=[1, 2, 2.5, 5, 10]).tick_values(0, ymax.max())
+    ytick_step = float(ticks[1] - ticks[0])
+
+    return ylims, ytick_step
+
+
+def resolve_stack_ylims(frames, order, ylim=None, ylim_mode=None):
+    """
+    Per-frame y-limits for a stack animation.
+
+    - ylim given      → that range on every frame
+    - ylim_mode given → stack_ylim_prepass ("fixed" or "eased")
+    - neither         → None per frame (each frame autoscales)
+
+    Returns (ylims, fixed_ylim, ytick_step); fixed_ylim is None unless
+    every frame shares one range (the precondition for blitting).
+    """
+    if ylim is not None:
+        return [ylim] * len(frames), ylim, None
+
+    if ylim_mode is None:
+        return [None] * len(frames), None, None
+
+    ylims, ytick_step = stack_ylim_prepass(frames, order, mode=ylim_mode)
+    ylims = [tuple(lim) for lim in ylims]
+    fixed = ylims[0] if ylim_mode == "fixed" else None
+    return ylims, fixed, ytick_step
+
+
+# ---------------------------------------------------------------
+# BLITTING (fixed y-limits only)
+# ---------------------------------------------------------------
+def stack_verts(x, values):
+    """
+    Polygon vertices for every layer of a stack in one numpy pass.
+
+    values : (n_times, n_layers) array
+    Returns (n_layers, 2 * n_times, 2) array: bottom edge left→right,
+    then top edge right→left (the winding fill_between uses).
+    """
+    values = np.asarray(values, dtype=float)
+    n, k = values.shape
+
+    top = np.cumsum(values, axis=1)
+    bottom = top - values
+
+    verts = np.empty((k, 2 * n, 2))
+    verts[:, :n, 0] = x
+    verts[:, n:, 0] = x[::-1]
+    verts[:, :n, 1] = bottom.T
+    verts[:, n:, 1] = top.T[:, ::-1]
+    return verts
+
+
+def play_blitted(fig, update, n_frames, fps, repeat=True):
+    """
+    Drive update(i) from a canvas timer. FuncAnimation falls back to a
+    full draw_idle() each frame, which would undo a blitter's cache.
+    Keep a reference to the returned timer while the window is open.
+    """
+    state = {"i": 0}
+
+    def step():
+        i = state["i"]
+        if i >= n_frames:
+            if not repeat:
+                return False
+            i = 0
+        update(i)
+        state["i"] = i + 1
+
+    timer = fig.canvas.new_timer(interval=1000 / fps)
+    timer.add_callback(step)
+    timer.start()
+    return timer
+
+
+class StackBlitter:
+    """
+    Opt-in blitting renderer for stack animations with fixed y-limits.
+
+    The chrome (background, grid, spines, tick labels, fonts) is styled
+    once, rasterised on the first draw and cached as a bitmap. Each frame
+    restores that bitmap and redraws only the stack layers and the title.
+
+    Axis lines and spines sit above the stack in a normal draw (zorder
+    1.5 / 2.5 vs 1), so they are kept out of the bitmap and re-drawn on top
+    of the layers; they are styled once and never re-laid-out.
+
+    xaxis  : stack_xaxis() spec shared by every frame
+    chrome : callable(ax, xaxis, ylim, ytick_step), styles the axes once
+    title  : callable(ax, text) -> Text, creates the title artist
+
+    For draft renders pass a draft_stack() xaxis and antialiased=False.
+    """
+
+    def __init__(self, ax, xaxis, order, colors, ylim,
+                 chrome=style_stack_axes, title=draw_stack_title,
+                 ytick_step=None, scale=1000.0, alpha=0.95, antialiased=True):
+        self.ax = ax
+        self.fig = ax.figure
+        self.order = list(order)
+        self.scale = scale
+        self._x = xaxis["x"]
+        self._background = None
+
+        chrome(ax, xaxis, ylim, ytick_step)
+
+        self.layers = draw_stack_layers(
+            ax,
+            self._x,
+            np.zeros((len(self._x), len(self.order))),
+            [colors[c] for c in self.order],
+            alpha=alpha,
+            antialiased=antialiased,
+        )
+        self.title = title(ax, "")
+
+        # drawn above the layers, in zorder, after the cached background
+        self._overlays = sorted(
+            [ax.xaxis, ax.yaxis, *ax.spines.values()],
+            key=lambda a: a.get_zorder(),
+        )
+
+        for artist in self.artists + self._overlays:
+            artist.set_animated(True)
+
+        self._cid = self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+
+    @property
+    def artists(self):
+        return [*self.layers, self.title]
+
+    def _on_draw(self, event):
+        canvas = self.fig.canvas
+        # savefig renders animated artists too, so its buffer is not chrome-only
+        if canvas.is_saving():
+            return
+        self._background = canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.layers:
+            self.fig.draw_artist(artist)
+        for artist in self._overlays:
+            self.fig.draw_artist(artist)
+        self.fig.draw_artist(self.title)
+
+    def update(self, stack, title):
+        """
+        Redraw one frame: stack_cube slice (GW) or DataFrame (MW).
+        """
+        if isinstance(stack, pd.DataFrame):
+            stack = stack_values(stack, self.order, self.scale)
+
+        for layer, verts in zip(self.layers, stack_verts(self._x, stack)):
+            layer.set_verts([verts])
+        self.title.set_text(title)
+
+        canvas = self.fig.canvas
+        if self._background is None:
+            # first frame: full draw caches the chrome via _on_draw
+            canvas.draw()
+        else:
+            canvas.restore_region(self._background)
+            self._draw_artists()
+
+        canvas.blit(self.fig.bbox)
+        return self.artists
+
+    def play(self, frames, titles, fps, repeat=True):
+        """
+        Interactive preview of (stack, title) frames. See play_blitted.
+        """
+        def update(i):
+            return self.update(frames[i], titles[i])
+
+        return play_blitted(self.fig, update, len(frames), fps, repeat=repeat)
+
+    def disconnect(self):
+        self.fig.canvas.mpl_disconnect(self._cid)
+
 # ---------------------------------------------------------------
 # SIMPLE LINE PLOT
 # ---------------------------------------------------------------
 def plot_line(ax, series, title):
     ax.clear()
     ax.plot(series.index, series.values, linewidth=2)
-    ax.set_title(title, fontproperties=FONT_BOLD)
-    ax.set_xlabel("Date", fontproperties=FONT_MEDIUM)
-    ax.set_ylabel(series.name, fontproperties=FONT_MEDIUM)
+    ax.set_title(title, fontproperties=font("bold"))
+    ax.set_xlabel("Date", fontproperties=font("medium"))
+    ax.set_ylabel(series.name, fontproperties=font("medium"))
     ax.grid(alpha=0.3)
 
 if __name__ == "__main__":
@@ -1,16 +1,15 @@
+import sys
+from functools import partial
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from matplotlib import font_manager
 
-# -------------------------------------------------------------
-# FONT SETUP (Montserrat)
-# -------------------------------------------------------------
-font_path = r"C:\Users\barna\AppData\Local\Microsoft\Windows\Fonts\Montserrat-VariableFont_wght.ttf"
-font_manager.fontManager.addfont(font_path)
-
-plt.rcParams['font.family'] = 'Montserrat'
+from plotting import (
+    StackBlitter, resolve_stack_ylims, stack_xaxis, stack_cube,
+    plot_stack, style_stack_axes, draw_stack_title,
+)
+from export import export_frames, new_subplots
+from fonts import use_font_family
 
 
 # =============================================================
@@ -173,53 +172,15 @@ def build_sequence_of_frames(periods, fps, transition_seconds, pause_seconds):
 # =============================================================
 # 4. PLOTTING
 # =============================================================
-def plot_stack(ax, stack, order, colors, title):
-
-    ax.clear()
-
-    # Convert MW → GW
-    stack_gw = stack / 1000.0
-
-    # Stackplot
-    ax.stackplot(
-        stack_gw.index,
-        [stack_gw[col] for col in order],
-        colors=[colors[c] for c in order],
-        alpha=0.95,
-    )
-
-    # TITLE
-    ax.set_title(title, fontsize=20, weight="bold", color="#333333")
-
-    # ---- Y-AXIS ----
-    total = stack_gw.sum(axis=1)
-    ymax = total.max()
-    ax.set_ylim(0, ymax * 1.05)
-
-    ticks = ax.get_yticks()
-    ax.set_yticks(ticks)
-    ax.set_yticklabels([f"{t:g} GW" for t in ticks], color="#777777")
-
-    # ---- X-AXIS ----
-    desired = ["06:00", "12:00", "18:00"]
-    tick_positions = [t for t in stack_gw.index if t.strftime("%H:%M") in desired]
-    ax.set_xticks(tick_positions)
-    ax.set_xticklabels(["6 AM", "12 PM", "6 PM"], color="#777777")
-
-    # SOFT STYLING
-    for spine in ["left", "bottom"]:
-        ax.spines[spine].set_color("#AAAAAA")
-        ax.spines[spine].set_linewidth(1)
-
-    ax.spines["right"].set_visible(False)
-    ax.spines["top"].set_visible(False)
-
-    ax.grid(color="#E5E5E5", linewidth=0.8, alpha=0.25)
-    ax.set_facecolor("#FAFAFA")
-    ax.margins(x=0)
-
-    # --- FIXED: SQUARE SHAPE ---
-    ax.set_box_aspect(1)
+# plotting.py's stack chart, with this script's look
+STACK_CHROME = {
+    "spine_color": "#AAAAAA",
+    "spine_width": 1,
+    "tick_color": None,
+    "label_color": "#777777",
+    "label_font": None,
+}
+STACK_TITLE = {"centered": True, "font_name": None, "weight": "bold", "color": "#333333"}
 
 
 # =============================================================
@@ -228,12 +189,22 @@ def plot_stack(ax, stack, order, colors, title):
 def animate_smooth_yearly_transition(df, colors,
                                      fps=30,
                                      transition_seconds=1.5,
-                                     pause_seconds=None):
-
+                                     pause_seconds=None,
+                                     ylim=None,
+                                     blit=False,
+                                     ylim_mode=None,
+                                     save_path=None):
+    """
+    save_path: render headless on Agg straight into ffmpeg and return the
+    path, with no window or event loop. Without it, preview with plt.show.
+    """
     if pause_seconds is None:
         pause_seconds = {}
 
-    fig, ax = plt.subplots(figsize=(8, 8))
+    # Montserrat (or the fallback) as the default family, before any text exists
+    use_font_family("variable")
+
+    fig, ax = new_subplots(headless=save_path is not None, figsize=(8, 8))
 
     # Build one stack per year automatically from the Time index
     periods = build_year_stacks(df)
@@ -242,9 +213,51 @@ def animate_smooth_yearly_transition(df, colors,
         periods, fps, transition_seconds, pause_seconds
     )
 
+    # GW arrays + shared x-axis once; frames are plain array slices from here
+    cube = stack_cube(frames, order)
+    xaxis = stack_xaxis(frames[0].index)
+
+    # y-range for every frame up front ("fixed" / "eased"), not per frame
+    ylims, ylim, ytick_step = resolve_stack_ylims(cube, order, ylim, ylim_mode)
+
+    # Blitting needs fixed y-limits: chrome is rasterised once and reused
+    if blit:
+        if ylim is None:
+            raise ValueError("blit=True requires a fixed ylim")
+
+        blitter = StackBlitter(
+            ax, xaxis, order, colors, ylim,
+            chrome=partial(style_stack_axes, **STACK_CHROME),
+            title=partial(draw_stack_title, **STACK_TITLE),
+            ytick_step=ytick_step,
+        )
+
+        if save_path is not None:
+            return export_frames(
+                fig,
+                lambda i: blitter.update(cube[i], titles[i]),
+                len(cube),
+                save_path,
+                fps=fps,
+                bitrate=8000,
+                redraw=False,
+            )
+
+        timer = blitter.play(cube, titles, fps, repeat=True)
+
+        plt.show()
+        return timer
+
     def update(i):
-        plot_stack(ax, frames[i], order, colors, titles[i])
+        plot_stack(ax, cube[i], order, titles[i],
+                   ylim=ylims[i], ytick_step=ytick_step, xaxis=xaxis,
+                   colors=colors, clear=True,
+                   chrome=STACK_CHROME, title_style=STACK_TITLE)
+
+    if save_path is not None:
+        return export_frames(fig, update, len(cube), save_path, fps=fps, bitrate=8000)
 
+    from matplotlib.animation import FuncAnimation  # preview only
     anim = FuncAnimation(
         fig,
         update,
@@ -261,8 +274,7 @@ def animate_smooth_yearly_transition(df, colors,
 # =============================================================
 # 6. MAIN
 # =============================================================
-if __name__ == "__main__":
-
+def main(save_path=None):
     # df should have:
     #   - a "Time" column with datetimes (one record day per year)
     #   - CAISO-style columns (Nuclear, Small/Large Hydro, Wind, Solar, Batteries, Imports, Natural Gas, etc.)
@@ -287,9 +299,10 @@ if __name__ == "__main__":
         "Nuclear": "#B3E5FC",
     }
 
-    animate_smooth_yearly_transition(
+    return animate_smooth_yearly_transition(
         df,
         colors,
+        save_path=save_path,
         fps=50,
         transition_seconds=0.25,
         pause_seconds={
@@ -302,4 +315,8 @@ if __name__ == "__main__":
             2024: 0.8,
             2025: 3
         },
-    )
\ No newline at end of file
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,180 @@
+import hashlib
+import inspect
+import os
+import shutil
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+# ---------------------------------------------------------------
+# CONTENT-ADDRESSED RENDER CACHE
+# ---------------------------------------------------------------
+# A rendered frame is a pure function of its data, its style and the
+# figure geometry. frame_key() hashes exactly those inputs; the cache
+# stores the finished RGBA buffer (zlib) or PNG under that hash, so a
+# re-export only draws frames whose inputs changed. The directory is
+# kept under max_bytes by evicting least recently used entries (mtime
+# is bumped on every hit).
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("RENDER_CACHE_DIR", Path.home() / ".cache" / "render_cache")
+)
+
+
+def _feed(h, part):
+    if isinstance(part, np.ndarray):
+        part = np.ascontiguousarray(part)
+        h.update(f"nd{part.dtype.str}{part.shape}".encode())
+        h.update(part.tobytes())
+    elif isinstance(part, (bytes, bytearray, memoryview)):
+        h.update(b"b")
+        h.update(bytes(part))
+    elif isinstance(part, dict):
+        h.update(b"{")
+        for k in sorted(part, key=repr):
+            _feed(h, k)
+            _feed(h, part[k])
+        h.update(b"}")
+    elif isinstance(part, (list, tuple)):
+        h.update(b"[")
+        for p in part:
+            _feed(h, p)
+        h.update(b"]")
+    else:
+        h.update(repr(part).encode())
+    h.update(b";")
+
+
+def frame_key(*parts):
+    """
+    Hex digest of arrays, dicts, sequences and scalars (repr), in order.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        _feed(h, part)
+    return h.hexdigest()
+
+
+def source_digest(*objects):
+    """
+    Hash of the source of modules / functions, so editing the styling
+    code invalidates frames rendered with the old version.
+    """
+    return frame_key(*(inspect.getsource(obj) for obj in objects))
+
+
+class RenderCache:
+    """
+    On-disk LRU store of rendered frames, keyed by frame_key().
+
+    Safe to share between processes: entries are written to a temp file
+    and renamed into place, and a concurrently evicted entry is just a
+    miss. Each process tracks its own size estimate, so the bound is
+    approximate while several exporters write at once.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=2 * 1024**3, level=1):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.level = level
+        self._total = None
+
+    def _path(self, key, suffix):
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def _read(self, path):
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def _write(self, path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        if self._total is None:
+            self._total = sum(p.stat().st_size for p in self._entries())
+        else:
+            self._total += len(data)
+
+        if self._total > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        if not self.root.exists():
+            return []
+        return [p for p in self.root.glob("*/*") if not p.name.endswith(".tmp")]
+
+    # ---- RGBA frame buffers ----
+    def get(self, key):
+        data = self._read(self._path(key, ".rgba.z"))
+        return None if data is None else zlib.decompress(data)
+
+    def put(self, key, buffer):
+        self._write(self._path(key, ".rgba.z"), zlib.compress(buffer, self.level))
+
+    # ---- encoded stills ----
+    def get_file(self, key, suffix=".png"):
+        path = self._path(key, suffix)
+        return path if self._read(path) is not None else None
+
+    def put_file(self, key, src, suffix=".png"):
+        self._write(self._path(key, suffix), Path(src).read_bytes())
+        return self._path(key, suffix)
+
+    def evict(self, max_bytes=None):
+        """
+        Delete least recently used entries until under max_bytes.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+
+        entries = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, p in entries:
+            if total <= max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+        self._total = total
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self._total = 0
+
+
+def cached_still(cache, key, save_path, draw, **savefig_kw):
+    """
+    Write the still for `key` to save_path, calling draw() -> fig and
+    savefig only on a cache miss. The key should cover everything
+    draw() depends on.
+    """
+    suffix = Path(save_path).suffix or ".png"
+
+    if cache is not None:
+        hit = cache.get_file(key, suffix)
+        if hit is not None:
+            shutil.copyfile(hit, save_path)
+            return save_path
+
+    fig = draw()
+    fig.savefig(save_path, **savefig_kw)
+
+    if cache is not None:
+        cache.put_file(key, save_path, suffix)
+
+    return save_path
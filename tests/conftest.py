@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+# Scripts import each other from the repo root (no package install)
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("MPLBACKEND", "Agg")
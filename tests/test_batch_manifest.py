@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import pytest
+
+from line import batch
+from line.structure import lcoe_data
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    csvs = {}
+    for name in ("LCOE_CSV", "COMPONENTS_CSV", "COMPONENTS_COMPLETE_CSV"):
+        path = tmp_path / f"{name.lower()}.csv"
+        path.write_text("Country,Tech\nSpain,Gas\n")
+        monkeypatch.setattr(lcoe_data, name, str(path))
+        csvs[name] = path
+
+    # the skip logic only: a renderer that writes its output
+    calls = []
+
+    def render(shot, output_path):
+        calls.append(shot["tag"])
+        output_path.write_text(shot["title"])
+
+    monkeypatch.setitem(batch.RENDERERS, "lcoe", render)
+    return tmp_path, csvs, calls
+
+
+def _shots(out_dir, **edits):
+    return [
+        {**batch.SHOT_DEFAULTS, "tag": tag, "title": edits.get(tag, tag),
+         "output": str(out_dir / f"{tag}.png")}
+        for tag in ("a", "b")
+    ]
+
+
+def _run(out_dir, shots, **kw):
+    status = batch.render_shots(shots, out_dir, workers=1, **kw)
+    return {Path(p).stem: s for p, s in status.items()}
+
+
+def test_second_run_skips(env):
+    out_dir, _, calls = env
+
+    assert _run(out_dir, _shots(out_dir)) == {"a": "rendered", "b": "rendered"}
+    assert _run(out_dir, _shots(out_dir)) == {"a": "skipped", "b": "skipped"}
+    assert calls == ["a", "b"]
+
+    assert _run(out_dir, _shots(out_dir), force=True) == {"a": "rendered", "b": "rendered"}
+
+
+def test_editing_a_shot_renders_only_that_shot(env):
+    out_dir, _, calls = env
+    _run(out_dir, _shots(out_dir))
+
+    assert _run(out_dir, _shots(out_dir, b="new title")) == {"a": "skipped", "b": "rendered"}
+    assert calls == ["a", "b", "b"]
+
+
+@pytest.mark.parametrize("name", ["LCOE_CSV", "COMPONENTS_CSV", "COMPONENTS_COMPLETE_CSV"])
+def test_changing_any_csv_renders_again(env, name):
+    out_dir, csvs, _ = env
+    _run(out_dir, _shots(out_dir))
+
+    csvs[name].write_text("Country,Tech\nSpain,Gas\nSpain,Coal\n")
+
+    assert _run(out_dir, _shots(out_dir)) == {"a": "rendered", "b": "rendered"}
+
+
+def test_missing_csv_then_created(env):
+    out_dir, csvs, _ = env
+    csvs["COMPONENTS_COMPLETE_CSV"].unlink()
+
+    _run(out_dir, _shots(out_dir))
+    assert _run(out_dir, _shots(out_dir)) == {"a": "skipped", "b": "skipped"}
+
+    csvs["COMPONENTS_COMPLETE_CSV"].write_text("Country,Tech\n")
+    assert _run(out_dir, _shots(out_dir)) == {"a": "rendered", "b": "rendered"}
+
+
+def test_changed_or_deleted_output_renders_again(env):
+    out_dir, _, _ = env
+    _run(out_dir, _shots(out_dir))
+
+    (out_dir / "a.png").write_text("edited elsewhere")
+    (out_dir / "b.png").unlink()
+
+    assert _run(out_dir, _shots(out_dir)) == {"a": "rendered", "b": "rendered"}
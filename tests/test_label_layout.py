@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from export import new_subplots
+from line.structure.helpers import _label_box, _overlaps, layout_lcoe_labels
+from line.structure.lcoe_data import _typed
+from line.style.config import LABEL_PAD_PX
+
+TECH_RENDER = {"Gas": "flat", "Solar+BESS": "curve"}
+SIZE = (80, 12)
+
+
+@pytest.fixture(scope="module")
+def df():
+    lfs = np.round(np.arange(0.1, 0.95, 0.05), 2)
+    rows = [
+        {"Tech": "Solar+BESS", "Year": 2030, "Scenario": "Base", "Availability": lf,
+         "LCOE": 40 + 120 * lf}
+        for lf in lfs
+    ] + [
+        # two flat lines a pixel or two apart: their labels collide
+        {"Tech": "Gas", "Year": 2030, "Scenario": "Base", "Availability": 0.7, "LCOE": 100.0},
+        {"Tech": "Gas", "Year": 2030, "Scenario": "Base", "Availability": 0.75, "LCOE": 101.0},
+    ]
+    return _typed(pd.DataFrame(rows))
+
+
+@pytest.fixture
+def ax():
+    fig, ax = new_subplots(headless=True, figsize=(6, 4), dpi=100)
+    fig.subplots_adjust(left=0.1, right=0.6)
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 200)
+    return ax
+
+
+def _label(lf, tech="Gas", **kw):
+    return {"tech": tech, "year": 2030, "lf": lf, **kw}
+
+
+def _boxes(ax, layout):
+    display = ax.transData.transform([l[:2] for l in layout])
+    return [
+        _label_box(px, py, *l[2:], *SIZE, LABEL_PAD_PX)
+        for (px, py), l in zip(display, layout)
+    ]
+
+
+def _any_overlap(boxes):
+    return any(
+        _overlaps(boxes[i], np.array(boxes[:i]))
+        for i in range(1, len(boxes))
+    )
+
+
+def test_overlapping_labels_are_separated(df, ax):
+    labels = [_label(0.7), _label(0.75), _label(None, tech="Solar+BESS")]
+
+    naive = layout_lcoe_labels(ax, labels, df, TECH_RENDER)
+    solved = layout_lcoe_labels(ax, labels, df, TECH_RENDER, sizes=[SIZE] * 3)
+
+    assert _any_overlap(_boxes(ax, naive))
+    assert not _any_overlap(_boxes(ax, solved))
+    # the first flat label keeps its default spot; only the second moves
+    assert solved[0] == pytest.approx(naive[0])
+    assert solved[1][1] != pytest.approx(naive[1][1])
+
+
+def test_pinned_labels_stay_put(df, ax):
+    # the pinned label is listed second but placed first, so the free
+    # label is the one that moves off it
+    labels = [_label(0.75), _label(0.7, label_anchor="end")]
+
+    naive = layout_lcoe_labels(ax, labels, df, TECH_RENDER)
+    solved = layout_lcoe_labels(ax, labels, df, TECH_RENDER, sizes=[SIZE] * 2)
+
+    assert _any_overlap(_boxes(ax, naive))
+    assert not _any_overlap(_boxes(ax, solved))
+    assert solved[1] == pytest.approx(naive[1])
+    assert solved[0][1] != pytest.approx(naive[0][1])
+
+
+def test_missing_curve_is_none(df, ax):
+    layout = layout_lcoe_labels(
+        ax, [_label(None, tech="Solar+BESS", scenario="High")], df, TECH_RENDER, sizes=[SIZE]
+    )
+    assert layout == [None]
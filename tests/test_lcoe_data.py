@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from line.structure import lcoe_data
+from line.structure.lcoe_data import load_table
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(lcoe_data, "DATA_CACHE_DIR", tmp_path / "cache")
+    load_table.cache_clear()
+    yield tmp_path / "cache"
+    load_table.cache_clear()
+
+
+def _csv(path, text, mtime_ns=1_700_000_000_000_000_000):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def _countries(path):
+    load_table.cache_clear()
+    return load_table(path)["Country"].tolist()
+
+
+def test_same_named_csvs_in_different_folders(tmp_path, cache_dir):
+    # same name, size and mtime: only the folder and content differ
+    a = _csv(tmp_path / "a" / "x.csv", "Country,Tech\nSpain,Gas\n")
+    b = _csv(tmp_path / "b" / "x.csv", "Country,Tech\nItaly,Oil\n")
+
+    assert _countries(a) == ["Spain"]
+    assert _countries(b) == ["Italy"]
+
+    # both stay cached: loading one does not evict the other
+    pickles = sorted(cache_dir.glob("*.pkl"))
+    assert len(pickles) == 2
+    assert _countries(a) == ["Spain"]
+    assert _countries(b) == ["Italy"]
+    assert sorted(cache_dir.glob("*.pkl")) == pickles
+
+
+def test_second_load_reads_the_pickle(tmp_path, cache_dir, monkeypatch):
+    path = _csv(tmp_path / "x.csv", "Country,Tech\nSpain,Gas\n")
+    _countries(path)
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("CSV parsed again")
+
+    monkeypatch.setattr(lcoe_data.pd, "read_csv", no_parse)
+    assert _countries(path) == ["Spain"]
+
+
+def test_changed_csv_replaces_its_pickle(tmp_path, cache_dir):
+    path = _csv(tmp_path / "x.csv", "Country,Tech\nSpain,Gas\n")
+    _countries(path)
+
+    _csv(tmp_path / "x.csv", "Country,Tech\nFrance,Nuclear\n", mtime_ns=1_800_000_000_000_000_000)
+
+    assert _countries(path) == ["France"]
+    assert len(list(cache_dir.glob("*.pkl"))) == 1
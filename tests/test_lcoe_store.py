@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from line.structure.lcoe_data import LcoeStore, _typed
+
+LFS = np.round(np.arange(0.1, 0.95, 0.05), 2)
+
+
+@pytest.fixture(scope="module")
+def df():
+    rng = np.random.default_rng(0)
+    rows = [
+        {"Country": "Spain", "Tech": tech, "Year": year, "Scenario": scenario,
+         "Availability": lf, "LCOE": rng.uniform(20, 200)}
+        for tech in ("Gas", "Solar+BESS")
+        for year in (2023, 2030)
+        for scenario in ("Base", "High")
+        for lf in LFS
+    ]
+    return _typed(pd.DataFrame(rows))
+
+
+def _old_fossil_lcoe(df, tech, year, lf, scenario):
+    # the per-call boolean scan fossil_lcoe replaced
+    mask = (df["Tech"] == tech) & (df["Year"] == year) & (df["Availability"] == lf)
+    if scenario is not None:
+        mask &= df["Scenario"] == scenario
+    subset = df[mask]
+    assert len(subset) == 1
+    return subset.iloc[0]["LCOE"]
+
+
+@pytest.mark.parametrize("scenario", ["Base", "High"])
+def test_fossil_lcoe_matches_the_pandas_filter(df, scenario):
+    store = LcoeStore(df)
+
+    for year in (2023, 2030):
+        for lf in LFS:
+            assert store.fossil_lcoe("Gas", year, lf, scenario) == _old_fossil_lcoe(
+                df, "Gas", year, lf, scenario
+            )
+
+
+def test_fossil_lcoe_without_scenario_matches_any_scenario(df):
+    # as the pandas filter did: the one row, whatever its scenario
+    for scenario in ("Base", "High"):
+        only = df[(df["Tech"] != "Gas") | (df["Scenario"] == scenario)]
+        store = LcoeStore(only)
+
+        for lf in LFS:
+            assert store.fossil_lcoe("Gas", 2030, lf) == _old_fossil_lcoe(
+                only, "Gas", 2030, lf, None
+            )
+
+    with pytest.raises(ValueError, match="Multiple LCOE rows"):
+        LcoeStore(df).fossil_lcoe("Gas", 2030, 0.7)
+
+
+def test_fossil_lcoe_named_scenario_only():
+    only = _typed(pd.DataFrame([
+        {"Tech": "Gas", "Year": 2030, "Scenario": "High", "Availability": 0.7, "LCOE": 100.0},
+    ]))
+    store = LcoeStore(only)
+
+    assert store.fossil_lcoe("Gas", 2030, 0.7) == 100.0
+    assert store.fossil_lcoe("Gas", 2030, 0.7, "High") == 100.0
+    with pytest.raises(ValueError, match="No LCOE found"):
+        store.fossil_lcoe("Gas", 2030, 0.7, "Base")
+
+
+def test_fossil_lcoe_quantizes_the_load_factor(df):
+    store = LcoeStore(df)
+
+    assert store.fossil_lcoe("Gas", 2030, 0.7000000001, "Base") == store.fossil_lcoe("Gas", 2030, 0.7, "Base")
+    assert store.fossil_lcoe("Gas", 2030, 0.1 * 7, "Base") == store.fossil_lcoe("Gas", 2030, 0.7, "Base")
+
+
+def test_fossil_lcoe_missing(df):
+    store = LcoeStore(df)
+
+    with pytest.raises(ValueError, match="No LCOE found"):
+        store.fossil_lcoe("Gas", 2023, 0.72, "Base")
+    with pytest.raises(ValueError, match="No LCOE found"):
+        store.fossil_lcoe("Coal", 2023, 0.7)
+    with pytest.raises(ValueError, match="Scenario=Low"):
+        store.fossil_lcoe("Gas", 2023, 0.7, "Low")
+
+
+def test_fossil_lcoe_duplicates(df):
+    store = LcoeStore(pd.concat([df, df[df["Availability"] == 0.5]]))
+
+    with pytest.raises(ValueError, match="Multiple LCOE rows"):
+        store.fossil_lcoe("Gas", 2023, 0.5, "Base")
+    # other load factors of the same curve are unaffected
+    store.fossil_lcoe("Gas", 2023, 0.55, "Base")
+
+
+def test_fossil_lcoe_interpolates_within_the_grid(df):
+    store = LcoeStore(df)
+    lo = store.fossil_lcoe("Gas", 2023, 0.7, "Base")
+    hi = store.fossil_lcoe("Gas", 2023, 0.75, "Base")
+
+    assert store.fossil_lcoe("Gas", 2023, 0.72, "Base", interpolate=True) == pytest.approx(
+        lo + (hi - lo) * 0.4
+    )
+    with pytest.raises(ValueError, match="No LCOE found"):
+        store.fossil_lcoe("Gas", 2023, 0.99, "Base", interpolate=True)
+    # no scenario, two curves: ambiguous
+    with pytest.raises(ValueError, match="Multiple LCOE rows"):
+        store.fossil_lcoe("Gas", 2023, 0.72, interpolate=True)
+
+
+def _old_envelope(df, tech, years, scenarios):
+    # the pivot_table shade envelope replaced by LcoeStore.envelope
+    mask = (df["Tech"] == tech) & df["Year"].isin(years)
+    mask &= df["Scenario"].isin(scenarios if scenarios is not None else ("Base", "", None))
+    pivot = (
+        df[mask]
+        .pivot_table(index="Availability", values="LCOE", aggfunc=["min", "max"])
+        .sort_index()
+    )
+    return pivot.index, pivot[("min", "LCOE")], pivot[("max", "LCOE")]
+
+
+@pytest.mark.parametrize("scenarios", [None, ["High"], ["Base", "High"]])
+def test_envelope_matches_the_pivot_table(df, scenarios):
+    df = df.copy()
+    df.loc[df.index[3], "LCOE"] = np.nan
+    store = LcoeStore(df)
+
+    x, lo, hi = store.envelope("Solar+BESS", [2023, 2030], scenarios)
+    old_x, old_lo, old_hi = _old_envelope(df, "Solar+BESS", [2023, 2030], scenarios)
+
+    np.testing.assert_array_equal(x, old_x)
+    np.testing.assert_array_equal(lo, old_lo)
+    np.testing.assert_array_equal(hi, old_hi)
+
+
+def test_envelope_missing(df):
+    assert LcoeStore(df).envelope("Coal", [2023]) is None
+
+
+@pytest.mark.parametrize("scenario", ["Base", "High"])
+def test_fossil_band_matches_min_max_of_the_filter(df, scenario):
+    store = LcoeStore(df)
+    lfs = [0.5, 0.6, 0.7, 0.8]
+    ys = [_old_fossil_lcoe(df, "Gas", 2030, lf, scenario) for lf in lfs]
+
+    assert store.fossil_band("Gas", 2030, lfs, scenario) == (min(ys), max(ys))
+    with pytest.raises(ValueError, match="No LCOE found"):
+        store.fossil_band("Gas", 2030, [0.5, 0.72], scenario)
@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+
+from render_cache import RenderCache, frame_key
+
+
+# -------------------------------------------------
+# frame_key
+# -------------------------------------------------
+def test_frame_key_is_deterministic():
+    parts = (np.arange(6.0).reshape(2, 3), {"b": 1, "a": [1, 2]}, "title", 3.5)
+    assert frame_key(*parts) == frame_key(*parts)
+
+
+def test_frame_key_ignores_dict_order():
+    assert frame_key({"a": 1, "b": 2}) == frame_key({"b": 2, "a": 1})
+
+
+def test_frame_key_sees_array_dtype_shape_and_values():
+    a = np.arange(6.0)
+    assert frame_key(a) != frame_key(a.astype(np.float32))
+    assert frame_key(a) != frame_key(a.reshape(2, 3))
+    assert frame_key(a) != frame_key(a + 1e-12)
+
+
+def test_frame_key_keeps_part_boundaries():
+    assert frame_key("ab", "c") != frame_key("a", "bc")
+    assert frame_key([1, 2], 3) != frame_key([1], [2, 3])
+
+
+def test_frame_key_non_contiguous_array_matches_copy():
+    a = np.arange(12.0).reshape(3, 4)
+    assert frame_key(a[:, ::2]) == frame_key(a[:, ::2].copy())
+
+
+# -------------------------------------------------
+# RenderCache
+# -------------------------------------------------
+def test_cache_round_trip(tmp_path):
+    cache = RenderCache(tmp_path)
+    buffer = bytes(range(256)) * 4
+
+    assert cache.get("k" * 40) is None
+    cache.put("k" * 40, buffer)
+    assert cache.get("k" * 40) == buffer
+
+
+def _age(cache, key, seconds):
+    path = cache._path(key, ".rgba.z")
+    t = path.stat().st_mtime - seconds
+    os.utime(path, (t, t))
+
+
+def test_evict_drops_least_recently_used(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=10**9, level=0)
+    keys = [f"{i:02d}" + "0" * 38 for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, os.urandom(1000))
+        _age(cache, key, 100 - i)   # keys[0] oldest
+
+    # a hit makes keys[0] the most recently used
+    assert cache.get(keys[0]) is not None
+
+    entry = cache._path(keys[0], ".rgba.z").stat().st_size
+    cache.evict(max_bytes=2 * entry)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+
+def test_put_keeps_cache_under_max_bytes(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=3500, level=0)
+    for i in range(10):
+        cache.put(f"{i:02d}" + "0" * 38, os.urandom(1000))
+
+    total = sum(p.stat().st_size for p in cache._entries())
+    assert total <= 3500
+    assert cache.get("09" + "0" * 38) is not None
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+import plotting
+from export import new_subplots
+
+
+def _frame(seed=0, n=96):
+    index = pd.date_range("2024-05-01", periods=n, freq="15min")
+    rng = np.random.default_rng(seed)
+    order = ["Nuclear", "Wind", "Solar", "Battery Discharge", "Gas"]
+    return pd.DataFrame(rng.uniform(0, 4000, (n, len(order))), index=index, columns=order), order
+
+
+def _render(draw):
+    fig, ax = new_subplots(headless=True, figsize=(3, 3), dpi=50)
+    draw(ax)
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba()).copy()
+
+
+def _chrome(ax, stack, order):
+    plotting.draw_stack_title(ax, "frame")
+    plotting.style_stack_axes(ax, plotting.stack_xaxis(stack.index), (0, 25), 5)
+
+
+def test_array_path_matches_stackplot():
+    stack, order = _frame()
+
+    def old(ax):
+        gw = stack / 1000.0
+        ax.stackplot(gw.index, [gw[c] for c in order],
+                     colors=[plotting.COLOURS[c] for c in order], alpha=0.95)
+        _chrome(ax, stack, order)
+
+    def new(ax):
+        xaxis = plotting.stack_xaxis(stack.index)
+        plotting.plot_stack(ax, plotting.stack_values(stack, order), order, "frame",
+                            ylim=(0, 25), ytick_step=5, xaxis=xaxis)
+
+    np.testing.assert_array_equal(_render(old), _render(new))
+
+
+def test_dataframe_and_array_paths_match():
+    stack, order = _frame(1)
+    xaxis = plotting.stack_xaxis(stack.index)
+
+    a = _render(lambda ax: plotting.plot_stack(ax, stack, order, "t", ylim=(0, 25)))
+    b = _render(lambda ax: plotting.plot_stack(
+        ax, plotting.stack_values(stack, order), order, "t", ylim=(0, 25), xaxis=xaxis))
+
+    np.testing.assert_array_equal(a, b)
+
+
+def test_stack_verts_tops_are_cumulative():
+    x = np.arange(4.0)
+    values = np.array([[1, 2], [2, 1], [0, 3], [1, 1]], dtype=float)
+    verts = plotting.stack_verts(x, values)
+
+    # bottom edge left → right, then the top edge right → left
+    n = len(x)
+    np.testing.assert_allclose(verts[0, :n, 1], 0)
+    np.testing.assert_allclose(verts[0, n:, 1][::-1], values[:, 0])
+    np.testing.assert_allclose(verts[1, :n, 1], values[:, 0])
+    np.testing.assert_allclose(verts[1, n:, 1][::-1], values.sum(axis=1))
+    np.testing.assert_allclose(verts[:, n:, 0], np.broadcast_to(x[::-1], (2, n)))
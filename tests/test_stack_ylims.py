@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from plotting import resolve_stack_ylims, stack_cube, stack_ylim_prepass
+
+ORDER = ["Solar", "Wind", "Gas"]
+
+
+def _cube(peaks, n_times=24):
+    # one frame per peak: the stacked total reaches peaks[i] once
+    rng = np.random.default_rng(0)
+    cube = rng.uniform(0, 0.1, (len(peaks), n_times, len(ORDER)))
+    for i, peak in enumerate(peaks):
+        cube[i, n_times // 2] = [peak / len(ORDER)] * len(ORDER)
+    return cube
+
+
+def test_fixed_uses_the_global_peak_with_headroom():
+    peaks = [3.0, 8.0, 5.0]
+    ylims, _ = stack_ylim_prepass(_cube(peaks), ORDER, mode="fixed", headroom=1.1)
+
+    assert ylims.shape == (3, 2)
+    assert np.all(ylims[:, 0] == 0)
+    np.testing.assert_allclose(ylims[:, 1], 8.0 * 1.1)
+
+
+def test_eased_never_clips_a_frame():
+    rng = np.random.default_rng(1)
+    peaks = rng.uniform(1, 20, 60)
+    cube = _cube(peaks)
+
+    ylims, _ = stack_ylim_prepass(cube, ORDER, mode="eased", window=5, headroom=1.0)
+
+    totals = cube.sum(axis=2).max(axis=1)
+    assert np.all(ylims[:, 1] >= totals - 1e-9)
+
+
+def test_eased_is_smoother_than_the_raw_peaks():
+    peaks = np.where(np.arange(40) % 2, 10.0, 2.0)
+    ylims, _ = stack_ylim_prepass(_cube(peaks), ORDER, mode="eased", window=3, headroom=1.0)
+
+    assert np.abs(np.diff(ylims[:, 1])).max() < np.abs(np.diff(peaks)).max()
+
+
+def test_eased_window_longer_than_the_animation():
+    ylims, _ = stack_ylim_prepass(_cube([1.0, 4.0, 2.0]), ORDER, mode="eased", window=50)
+    assert ylims.shape == (3, 2)
+
+
+def test_tick_step_is_shared_and_round():
+    _, step = stack_ylim_prepass(_cube([3.0, 17.0]), ORDER)
+    assert step in (1.0, 2.0, 2.5, 5.0, 10.0)
+
+
+def test_dataframe_frames_match_cube():
+    index = pd.date_range("2024-01-01", periods=24, freq="h")
+    cube = _cube([3.0, 8.0])
+    frames = [pd.DataFrame(c * 1000, index=index, columns=ORDER) for c in cube]
+
+    np.testing.assert_allclose(stack_cube(frames, ORDER), cube)
+    a = stack_ylim_prepass(frames, ORDER, mode="eased")
+    b = stack_ylim_prepass(cube, ORDER, mode="eased")
+    np.testing.assert_allclose(a[0], b[0])
+    assert a[1] == b[1]
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        stack_ylim_prepass(_cube([1.0]), ORDER, mode="bouncy")
+
+
+def test_resolve_keeps_an_explicit_ylim():
+    cube = _cube([3.0, 8.0])
+    ylims, ylim, _ = resolve_stack_ylims(cube, ORDER, ylim=(0, 12))
+    assert tuple(ylim) == (0, 12)
+    assert all(tuple(y) == (0, 12) for y in ylims)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from line.plots.double import blend_levels, week_at
+from line.structure.prep_stack import typical_week_cube
+
+ORDER = ["Solar", "Battery Discharge", "Battery Charge"]
+LEVELS = [0.5, 0.6, 0.8, 1.0]
+
+
+@pytest.fixture(scope="module")
+def week():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-06-05", periods=168, freq="h")
+    by_avail = {
+        # one tech missing at the lowest level: filled with zeros
+        a: pd.DataFrame(
+            rng.uniform(-1, 1, (168, 3)) * 10.0 ** rng.integers(-3, 4, (168, 3)),
+            index=index,
+            columns=ORDER,
+        )
+        .drop(columns=["Battery Charge"] if a == 0.5 else [])
+        for a in LEVELS
+    }
+    return typical_week_cube(by_avail, ORDER)
+
+
+@pytest.mark.parametrize("fn", ["blend", "week_at"])
+def test_levels_return_the_stored_row(week, fn):
+    for i, a in enumerate(LEVELS):
+        got = (
+            blend_levels(week["values"], week["availability"], a)
+            if fn == "blend"
+            else week_at(week, a)
+        )
+        np.testing.assert_array_equal(got, week["values"][i])
+
+
+def test_missing_techs_are_zero(week):
+    np.testing.assert_array_equal(week_at(week, 0.5)[:, 2], 0)
+
+
+def test_between_levels_blends_linearly(week):
+    values = week["values"]
+
+    np.testing.assert_allclose(week_at(week, 0.55), (values[0] + values[1]) / 2)
+    np.testing.assert_allclose(week_at(week, 0.65), 0.75 * values[1] + 0.25 * values[2])
+    np.testing.assert_allclose(week_at(week, 0.1 * 7), (values[1] + values[2]) / 2)
+
+
+def test_outside_the_grid_is_clamped(week):
+    np.testing.assert_array_equal(week_at(week, 0.2), week["values"][0])
+    np.testing.assert_array_equal(week_at(week, 1.2), week["values"][-1])
@@ -0,0 +1,72 @@
+import argparse
+import importlib
+
+# ---------------------------------------------------------------
+# COMMAND-LINE ENTRY POINT
+# ---------------------------------------------------------------
+#   python viz.py <chart> [-o OUTPUT] [--draft]
+#   python viz.py shots [--only TAG ...] [--workers N] [--force]
+#
+# Every chart module exposes main(output, ...). It is imported only
+# when its subcommand runs, so --help never loads pandas, matplotlib or
+# any data, and a still only pays for its own imports.
+
+# name: (module, help, accepts --draft)
+CHARTS = {
+    "smooth": ("api", "CAISO three-month average stack, year over year", False),
+    "records": ("records", "CAISO record-day stack, year over year", False),
+    "monthly": ("main_monthly", "CAISO three-month stack (shared animation path)", False),
+    "trailing": ("main_trailing", "CAISO trailing 365-day average stack video", True),
+    "growth": ("main", "solar growth with exponential projections", True),
+    "lcoe": ("line.plots.lcoe_lines", "LCOE vs load factor lines (still)", False),
+    "lcoe-areas": ("line.plots.lcoe_lines_areas", "LCOE lines with component areas (still)", False),
+    "lcoe-shade": ("line.plots.lcoe_lines_areas_shade", "LCOE lines with scenario / lf shading (still)", False),
+    "lcoe-zoom": ("line.animation.anim_lcoe", "LCOE breakdown y-zoom (video, shot 1.z)", False),
+    "capacity": ("line.stack", "Solar + BESS capacity build-out (still)", False),
+    "dashboard": ("line.plots.double", "three-panel dispatch / capacity / LCOE dashboard (still)", False),
+    "dashboard-anim": ("line.animation.animate_dash", "dashboard availability sweep (video)", True),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="viz", description="Render charts and animations.")
+    sub = parser.add_subparsers(dest="chart", required=True, metavar="chart")
+
+    for name, (module, help_text, draft) in CHARTS.items():
+        p = sub.add_parser(name, help=help_text, description=help_text)
+        p.add_argument("-o", "--output",
+                       help="output file (default: the script's own path; "
+                            "animations preview in a window when omitted)")
+        if draft:
+            p.add_argument("--draft", action="store_true",
+                           help="quick low-dpi MJPEG preview (see draft.py)")
+
+    p = sub.add_parser("shots", help="render the shot list (line/shot_list.py)",
+                       description="Render every shot, skipping unchanged ones.")
+    p.add_argument("--file", help="YAML / JSON shot list instead of line/shot_list.py")
+    p.add_argument("--only", nargs="+", metavar="TAG", help="render only these tags")
+    p.add_argument("--out-dir", help="output folder (default: line/batch.py OUTPUT_DIR)")
+    p.add_argument("--workers", type=int, help="process pool size (default: one per core)")
+    p.add_argument("--force", action="store_true", help="re-render unchanged shots too")
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.chart == "shots":
+        import line.batch as batch
+        return batch.main(args.file, args.out_dir or batch.OUTPUT_DIR,
+                          args.only, args.workers, args.force)
+
+    module, _, draft = CHARTS[args.chart]
+
+    call_args = [args.output] if args.output is not None else []
+    call_kw = {"draft": args.draft} if draft else {}
+
+    return importlib.import_module(module).main(*call_args, **call_kw)
+
+
+if __name__ == "__main__":
+    main()